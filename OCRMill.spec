@@ -70,6 +70,12 @@ a = Analysis(
         'parts_database',
         'config_manager',
         'updater',
+        'processor_engine',
+        'pdf_page_text',
+        'extraction_pool',
+        'folder_watcher',
+        'name_matcher',
+        'extraction_cache',
 
         # Templates
         'templates',
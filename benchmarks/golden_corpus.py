@@ -0,0 +1,421 @@
+"""
+Golden Corpus Benchmark for OCRMill
+Measures template and ProcessorEngine throughput on a fixed corpus and checks for regressions.
+
+The corpus is a set of synthetic invoices generated by this script (the same
+text and PDFs on every run), optionally followed by real PDFs from a folder.
+Two phases are measured:
+
+    templates  every registered template scores every page text with
+               get_confidence_score(), and runs extract_all() where it matches
+    engine     ProcessorEngine.process_pdf() end to end on every PDF
+               (extraction cache disabled, so each run really parses the PDF)
+
+For each phase the best of N runs gives pages/sec and items/sec; a separate
+run under tracemalloc gives the peak Python memory.
+
+The extracted items are digested into a golden record. It only depends on the
+corpus and the extraction code, so it is kept in the repository
+(golden_digests.json); every run exits non-zero if the golden file is missing
+or the output changed. After an intended extraction change, re-record it with
+--save-golden and commit the file.
+
+Throughput and memory are machine-specific. With --save-baseline they are
+written to golden_baseline.json (not committed); later runs on that machine
+exit non-zero if throughput dropped or memory grew by more than the tolerance.
+Without a performance baseline only the golden record is checked.
+
+The run also fails if any document yields no items (a template mis-selection)
+or if PyQt6 was imported, so processing stays usable on machines without a
+display.
+
+Usage:
+    python benchmarks/golden_corpus.py [--docs=N] [--repeat=N] [--corpus=FOLDER]
+                                       [--golden=FILE] [--save-golden]
+                                       [--baseline=FILE] [--save-baseline]
+                                       [--tolerance=0.25]
+"""
+
+import hashlib
+import json
+import random
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from config_manager import ConfigManager
+from parts_database import PartsDatabase
+from processor_engine import ProcessorEngine
+from templates import get_all_templates
+
+GOLDEN_FILE = Path(__file__).parent / "golden_digests.json"
+GOLDEN_VERSION = 1
+BASELINE_FILE = Path(__file__).parent / "golden_baseline.json"
+BASELINE_VERSION = 2
+
+SUPPLIERS = [
+    ("Northwind Castings Ltd", "IN"),
+    ("Brno Street Furniture s.r.o.", "CZ"),
+    ("Shaanxi Metal Works Co", "CN"),
+]
+PRODUCTS = [
+    "Steel bench frame", "Cast iron bollard", "Aluminum litter bin",
+    "Tree grate segment", "Bike rack hoop", "Planter liner", "Anchor bolt set",
+]
+
+
+def make_invoice_pages(doc_index: int, rng: random.Random):
+    """
+    Build the page texts of one synthetic invoice document.
+
+    Documents alternate between a plain invoice layout (read by the Standard
+    Invoice template) and an export invoice layout with HS codes, country of
+    origin and weights (read by the International Invoice template); some hold
+    two invoices. Neither layout says "commercial invoice", which is a supplier
+    keyword of the Hebei Shinyee template.
+
+    Returns:
+        List of page texts
+    """
+    supplier, country = SUPPLIERS[doc_index % len(SUPPLIERS)]
+    export_layout = doc_index % 2 == 1
+    invoice_count = 2 if doc_index % 5 == 4 else 1
+    pages = []
+    for invoice in range(invoice_count):
+        invoice_number = f"INV-{24000 + doc_index * 10 + invoice}"
+        po_number = f"PO-{8100 + doc_index}"
+        line_count = rng.randrange(8, 60)
+        lines_per_page = 30
+        for page_start in range(0, line_count, lines_per_page):
+            if export_layout:
+                # P.O. first: the template's P.O. pattern would otherwise match "exPORt"
+                lines = [supplier, f"P.O. No: {po_number}", "EXPORT INVOICE", f"Invoice No: {invoice_number}"]
+            else:
+                lines = [supplier, "INVOICE", f"Invoice No: {invoice_number}", f"P.O. No: {po_number}"]
+            lines += [f"Date: 2025-0{1 + doc_index % 9}-1{doc_index % 10}", ""]
+            if export_layout:
+                lines.append("Terms: FOB")
+                lines.append("Part No Description HS Code Qty Unit Price Total")
+            else:
+                lines.append("Part No Description Qty Unit Price Total")
+            for line in range(page_start, min(line_count, page_start + lines_per_page)):
+                part = f"{chr(65 + line % 26)}{chr(65 + doc_index % 26)}-{1000 + line * 7 + doc_index}"
+                product = PRODUCTS[(line + doc_index) % len(PRODUCTS)]
+                quantity = rng.randrange(1, 400)
+                unit_price = rng.uniform(2, 900)
+                amount = quantity * unit_price
+                if export_layout:
+                    lines.append(f"{part} {product} 7308.90.{9500 + line % 90} {quantity} "
+                                 f"{unit_price:,.2f} {amount:,.2f}")
+                else:
+                    lines.append(f"{part} {product} {quantity} ${unit_price:,.2f} ${amount:,.2f}")
+            if page_start + lines_per_page >= line_count:
+                lines.append("")
+                if export_layout:
+                    lines.append(f"Country of Origin: {country}")
+                    lines.append(f"Net Weight: {rng.uniform(100, 9000):.1f} KG")
+                lines.append(f"Total Amount: {rng.uniform(1000, 90000):,.2f}")
+            pages.append("\n".join(lines))
+    return pages
+
+
+def _pdf_string(text: str) -> str:
+    """Escape text for a PDF literal string (Latin-1 only)."""
+    text = text.encode('latin-1', 'replace').decode('latin-1')
+    return "(" + text.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)") + ")"
+
+
+def write_pdf(path: Path, pages):
+    """
+    Write a minimal text-only PDF with one Helvetica text block per page.
+
+    Args:
+        path: Output file
+        pages: Page texts; each line becomes one line of the page
+    """
+    objects = []  # object bodies, object number = index + 1
+    page_ids = []
+    font_id = 3
+    objects.append(None)  # 1: catalog, filled in below
+    objects.append(None)  # 2: page tree, filled in below
+    objects.append(b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>")
+    for text in pages:
+        ops = ["BT", "/F1 9 Tf", "11 TL", "36 806 Td"]
+        for line in text.split("\n"):
+            ops.append(f"{_pdf_string(line)} Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode('latin-1')
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        content_id = len(objects)
+        objects.append(("<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+                        f"/Resources << /Font << /F1 {font_id} 0 R >> >> "
+                        f"/Contents {content_id} 0 R >>").encode())
+        page_ids.append(len(objects))
+    kids = " ".join(f"{page_id} 0 R" for page_id in page_ids)
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{kids}] /Count {len(page_ids)} >>".encode()
+
+    data = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(data))
+        data += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(data)
+    data += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        data += b"%010d 00000 n \n" % offset
+    data += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    path.write_bytes(bytes(data))
+
+
+def build_corpus(folder: Path, docs: int, extra_folder: Path = None):
+    """
+    Generate the synthetic corpus (and copy extra PDFs) into a folder.
+
+    Returns:
+        (texts, pdfs): texts is a list of (document name, page texts) for every
+        document; pdfs is the sorted list of PDF paths
+    """
+    import pdfplumber
+
+    rng = random.Random(2024)
+    texts = []
+    for index in range(docs):
+        name = f"synthetic_{index:03d}.pdf"
+        pages = make_invoice_pages(index, rng)
+        write_pdf(folder / name, pages)
+        texts.append((name, pages))
+    if extra_folder:
+        for pdf in sorted(extra_folder.glob("*.pdf")):
+            name = f"corpus_{pdf.name}"
+            shutil.copy(pdf, folder / name)
+            with pdfplumber.open(pdf) as opened:
+                texts.append((name, [page.extract_text() or "" for page in opened.pages]))
+    return texts, sorted(folder.glob("*.pdf"))
+
+
+def digest(value) -> str:
+    """Short stable digest of JSON-serialisable extraction output."""
+    data = json.dumps(value, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(data).hexdigest()[:16]
+
+
+def run_templates(templates, texts):
+    """Score every page text with every template and extract where it matches."""
+    pages = items = 0
+    golden = {}
+    for name, template in templates.items():
+        results = {}
+        for doc_name, page_texts in texts:
+            for page_number, text in enumerate(page_texts, start=1):
+                pages += 1
+                score = template.get_confidence_score(text)
+                extracted = template.extract_all(text) if score > 0 else ("", "", [])
+                items += len(extracted[2])
+                results[f"{doc_name}#{page_number}"] = [round(score, 4), len(extracted[2]), digest(extracted)]
+        golden[name] = digest(results)
+    return pages, items, golden
+
+
+def run_engine(engine: ProcessorEngine, pdfs, page_counts):
+    """Run process_pdf end to end on every PDF."""
+    pages = items = 0
+    golden = {}
+    for pdf in pdfs:
+        extracted = engine.process_pdf(pdf) or []
+        pages += page_counts[pdf.name]
+        items += len(extracted)
+        golden[pdf.name] = [engine.last_template_used, len(extracted), digest(extracted)]
+    return pages, items, golden
+
+
+def measure(func, repeat: int):
+    """
+    Time a phase and measure its peak memory.
+
+    Returns:
+        Dict with seconds (best of repeat), pages/sec, items/sec, peak_kb, and the golden record
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        pages, items, golden = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    # Separate run for memory: tracemalloc slows allocation-heavy code down
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'seconds': round(best, 4),
+        'pages': pages,
+        'items': items,
+        'pages_per_sec': round(pages / best, 2) if best else 0.0,
+        'items_per_sec': round(items / best, 2) if best else 0.0,
+        'peak_kb': peak // 1024,
+        'golden': golden,
+    }
+
+
+def compare_golden(results: dict, golden: dict):
+    """
+    Compare the golden records of a run with the stored golden file.
+
+    Returns:
+        List of regression messages (empty if none)
+    """
+    problems = []
+    for phase, result in results.items():
+        expected = golden.get('golden', {}).get(phase)
+        if expected is None:
+            problems.append(f"{phase}: not in golden file")
+            continue
+        changed = sorted(key for key in set(expected) | set(result['golden'])
+                         if expected.get(key) != result['golden'].get(key))
+        if changed:
+            shown = ", ".join(changed[:5]) + (" ..." if len(changed) > 5 else "")
+            problems.append(f"{phase}: extraction output changed for {len(changed)} entries ({shown})")
+    return problems
+
+
+def compare_performance(results: dict, baseline: dict, tolerance: float):
+    """
+    Compare throughput and memory with a machine-local baseline.
+
+    Returns:
+        List of regression messages (empty if none)
+    """
+    problems = []
+    for phase, result in results.items():
+        base = baseline.get('phases', {}).get(phase)
+        if base is None:
+            problems.append(f"{phase}: not in baseline")
+            continue
+        for metric in ('pages_per_sec', 'items_per_sec'):
+            if base[metric] and result[metric] < base[metric] * (1 - tolerance):
+                problems.append(f"{phase}: {metric} {result[metric]:,.1f} < baseline {base[metric]:,.1f}")
+        if base['peak_kb'] and result['peak_kb'] > base['peak_kb'] * (1 + tolerance):
+            problems.append(f"{phase}: peak memory {result['peak_kb']:,} KB > baseline {base['peak_kb']:,} KB")
+    return problems
+
+
+def main():
+    docs = 12
+    repeat = 3
+    tolerance = 0.25
+    corpus = None
+    golden_file = GOLDEN_FILE
+    save_golden = False
+    baseline_file = BASELINE_FILE
+    save_baseline = False
+    for option in sys.argv[1:]:
+        if option.startswith('--docs='):
+            docs = max(1, int(option.split('=', 1)[1]))
+        elif option.startswith('--repeat='):
+            repeat = max(1, int(option.split('=', 1)[1]))
+        elif option.startswith('--tolerance='):
+            tolerance = float(option.split('=', 1)[1])
+        elif option.startswith('--corpus='):
+            corpus = Path(option.split('=', 1)[1])
+        elif option.startswith('--golden='):
+            golden_file = Path(option.split('=', 1)[1])
+        elif option == '--save-golden':
+            save_golden = True
+        elif option.startswith('--baseline='):
+            baseline_file = Path(option.split('=', 1)[1])
+        elif option == '--save-baseline':
+            save_baseline = True
+        else:
+            print(__doc__)
+            return 2
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        (tmp / "pdfs").mkdir()
+        texts, pdfs = build_corpus(tmp / "pdfs", docs, corpus)
+        page_counts = {name: len(page_texts) for name, page_texts in texts}
+
+        config = ConfigManager(tmp / "config.json")
+        config.extraction_cache_enabled = False
+        db = PartsDatabase(tmp / "benchmark.db")
+        engine = ProcessorEngine(config, db, log_callback=lambda message: None)
+        templates = {name: template.instance for name, template in get_all_templates().items()}
+
+        results = {
+            'templates': measure(lambda: run_templates(templates, texts), repeat),
+            'engine': measure(lambda: run_engine(engine, pdfs, page_counts), repeat),
+        }
+        db.close()
+
+    print(f"Corpus:     {len(pdfs)} PDFs, {sum(page_counts.values())} pages "
+          f"({docs} synthetic{f', {len(pdfs) - docs} from {corpus}' if corpus else ''})")
+    print(f"Templates:  {len(templates)}")
+    for phase, result in results.items():
+        print(f"{phase.capitalize() + ':':<11} {result['seconds']:.3f}s, "
+              f"{result['pages_per_sec']:,.1f} pages/s, {result['items_per_sec']:,.1f} items/s "
+              f"({result['items']:,} items), peak {result['peak_kb']:,} KB")
+
+    if 'PyQt6' in sys.modules:
+        print("FAIL: PyQt6 was imported during processing")
+        return 1
+
+    # A document without items means a wrong template won; never freeze that into the golden file
+    empty = sorted(name for name, (template, count, _) in results['engine']['golden'].items() if count == 0)
+    if empty:
+        for name in empty:
+            template = results['engine']['golden'][name][0]
+            print(f"FAIL: {name} yielded no items (template: {template or 'none'})")
+        return 1
+
+    corpus_key = {'docs': docs, 'corpus': sorted(pdf.name for pdf in pdfs)}
+    problems = []
+
+    if save_golden:
+        golden = {'version': GOLDEN_VERSION, 'corpus': corpus_key,
+                  'golden': {phase: result['golden'] for phase, result in results.items()}}
+        golden_file.write_text(json.dumps(golden, indent=2, sort_keys=True) + "\n", encoding='utf-8')
+        print(f"Golden record saved to {golden_file}")
+    elif not golden_file.exists():
+        problems.append(f"no golden file at {golden_file}; record one with --save-golden")
+    else:
+        golden = json.loads(golden_file.read_text(encoding='utf-8'))
+        if golden.get('version') != GOLDEN_VERSION or golden.get('corpus') != corpus_key:
+            problems.append(f"{golden_file.name} was recorded for a different corpus; "
+                            "pass --golden=FILE or re-record it with --save-golden")
+        else:
+            problems += compare_golden(results, golden)
+
+    if save_baseline:
+        phases = {phase: {key: value for key, value in result.items() if key != 'golden'}
+                  for phase, result in results.items()}
+        baseline = {'version': BASELINE_VERSION, 'corpus': corpus_key, 'phases': phases}
+        baseline_file.write_text(json.dumps(baseline, indent=2, sort_keys=True), encoding='utf-8')
+        print(f"Baseline saved to {baseline_file}")
+    elif not baseline_file.exists():
+        print(f"No performance baseline at {baseline_file}; run with --save-baseline to record one")
+    else:
+        baseline = json.loads(baseline_file.read_text(encoding='utf-8'))
+        if baseline.get('version') != BASELINE_VERSION or baseline.get('corpus') != corpus_key:
+            problems.append("performance baseline was recorded for a different corpus; "
+                            "re-record it with --save-baseline")
+        else:
+            problems += compare_performance(results, baseline, tolerance)
+
+    for problem in problems:
+        print(f"FAIL: {problem}")
+    if problems:
+        return 1
+    print(f"OK: no regressions (tolerance {tolerance:.0%})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,129 @@
+"""
+Section 232 Expansion Benchmark for OCRMill
+Compares the row-wise and column-wise derivative row expansion.
+
+Generates synthetic enriched invoice lines (as produced by
+Section232Exporter._enrich_with_materials), expands and exports them to CSV
+with both implementations, checks that rows and files are identical and
+prints timings.
+
+Usage:
+    python benchmarks/section232_expansion.py [rows] [--repeat=N]
+"""
+
+import csv
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from section232_exporter import Section232Exporter
+
+# Material mixes seen on real parts (steel, aluminum, non-steel ratios)
+MATERIAL_MIXES = [
+    (100.0, 0.0, 0.0),
+    (0.0, 100.0, 0.0),
+    (60.0, 40.0, 0.0),
+    (75.5, 0.0, 24.5),
+    (0.0, 0.0, 0.0),
+    (33.33, 33.33, 33.34),
+]
+QTY_UNITS = ['NO', 'NO', 'KG', 'PCS', 'X']
+
+
+def make_items(count: int, seed: int = 232):
+    """Build synthetic enriched line items."""
+    rng = random.Random(seed)
+    items = []
+    for i in range(count):
+        steel, aluminum, non_steel = rng.choice(MATERIAL_MIXES)
+        items.append({
+            'part_number': f"P{rng.randrange(count // 4 + 1):06d}",
+            'total_price': f"{rng.uniform(1, 5000):.2f}",
+            'net_weight': f"{rng.uniform(0, 800):.3f}" if rng.random() > 0.1 else '',
+            'quantity': str(rng.randrange(1, 500)),
+            'hts_code': '7308.90.9590',
+            'mid': 'CZMMCATA1234BRN',
+            'country_origin': rng.choice(['CZ', 'CN', 'IN', '']),
+            'project_number': f"US25A{i % 900:04d}",
+            'steel_pct': steel,
+            'aluminum_pct': aluminum,
+            'copper_pct': 0.0,
+            'wood_pct': 0.0,
+            'auto_pct': 0.0,
+            'non_steel_pct': non_steel,
+            'qty_unit': rng.choice(QTY_UNITS),
+        })
+    return items
+
+
+def best_time(func, repeat: int):
+    """Best wall time of repeat calls, and the last result."""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def export_csv_rowwise(exporter: Section232Exporter, items, output_path: Path) -> int:
+    """CSV export as done before the column-wise expansion (DictWriter over row dicts)."""
+    row_count = 0
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=exporter.EXPORT_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        for row in exporter._iter_expanded_rows_rowwise(items):
+            writer.writerow(row)
+            row_count += 1
+    return row_count
+
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    count = int(args[0]) if args else 100000
+    repeat = 3
+    for option in sys.argv[1:]:
+        if option.startswith('--repeat='):
+            repeat = max(1, int(option.split('=', 1)[1]))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        exporter = Section232Exporter(tmp, tmp, tmp / "unused.db", output_format='csv')
+        items = make_items(count)
+
+        # Expansion only
+        rowwise_time, rowwise_rows = best_time(
+            lambda: list(exporter._iter_expanded_rows_rowwise(items)), repeat)
+        columnar_time, chunks = best_time(
+            lambda: list(exporter._iter_expanded_chunks(items)), repeat)
+        identical = rowwise_rows == list(exporter._iter_expanded_rows(items))
+
+        # Expansion and CSV export
+        rowwise_csv = tmp / "rowwise.csv"
+        columnar_csv = tmp / "columnar.csv"
+        rowwise_export_time, _ = best_time(
+            lambda: export_csv_rowwise(exporter, items, rowwise_csv), repeat)
+        columnar_export_time, _ = best_time(
+            lambda: exporter._export_chunks(exporter._iter_expanded_chunks(items), columnar_csv), repeat)
+        identical_csv = rowwise_csv.read_bytes() == columnar_csv.read_bytes()
+
+    print(f"Items:                   {count:,}")
+    print(f"Derivative rows:         {len(rowwise_rows):,}")
+    print(f"Expansion, row-wise:     {rowwise_time:.3f}s")
+    print(f"Expansion, column-wise:  {columnar_time:.3f}s ({rowwise_time / columnar_time:.1f}x)")
+    print(f"CSV export, row-wise:    {rowwise_export_time:.3f}s")
+    print(f"CSV export, column-wise: {columnar_export_time:.3f}s "
+          f"({rowwise_export_time / columnar_export_time:.1f}x)")
+    print(f"Identical rows:          {'yes' if identical else 'NO'}")
+    print(f"Identical CSV:           {'yes' if identical_csv else 'NO'}")
+    return 0 if identical and identical_csv else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
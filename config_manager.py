@@ -29,9 +29,16 @@ DEFAULT_CONFIG = {
     "backup_folder": "",  # Backup folder path
     "enable_automatic_backups": False,  # Enable automatic database backups
     "poll_interval": 60,
+    "use_folder_events": True,  # Detect new PDFs via file system events (rescans still run every poll_interval)
+    "extraction_cache_enabled": True,  # Reuse page text / line items of previously processed PDFs
+    "extraction_cache_mb": 200,  # Size cap of the extraction cache
+    "processing_workers": 0,  # Extraction processes for folder monitoring (0 = CPU count - 1)
+    "streaming_page_threshold": 150,  # PDFs with at least this many pages are processed page by page (0 = never)
+    "streaming_detection_pages": 5,  # Pages read to pick the template for streamed PDFs
     "auto_start": False,
     "consolidate_multi_invoice": False,  # False = separate CSVs per invoice, True = one CSV per PDF
     "auto_cbp_export": False,  # Auto-run CBP export after invoice processing
+    "section232_output_format": "xlsx",  # "xlsx" (formatted), "csv" or "parquet"
     "check_updates_on_startup": True,  # Check for updates when application starts
     "cbp_export": {
         "input_folder": "output/Processed",
@@ -186,6 +193,66 @@ class ConfigManager:
     def poll_interval(self, value: int):
         self.config["poll_interval"] = value
         self.save()
+
+    @property
+    def use_folder_events(self) -> bool:
+        """Detect new PDFs through file system events instead of only polling."""
+        return self.config.get("use_folder_events", True)
+
+    @use_folder_events.setter
+    def use_folder_events(self, value: bool):
+        self.config["use_folder_events"] = value
+        self.save()
+
+    @property
+    def extraction_cache_enabled(self) -> bool:
+        """Serve re-processed PDFs from the on-disk extraction cache."""
+        return self.config.get("extraction_cache_enabled", True)
+
+    @extraction_cache_enabled.setter
+    def extraction_cache_enabled(self, value: bool):
+        self.config["extraction_cache_enabled"] = value
+        self.save()
+
+    @property
+    def extraction_cache_mb(self) -> int:
+        """Size cap of the extraction cache in megabytes."""
+        return self.config.get("extraction_cache_mb", 200)
+
+    @extraction_cache_mb.setter
+    def extraction_cache_mb(self, value: int):
+        self.config["extraction_cache_mb"] = int(value)
+        self.save()
+
+    @property
+    def processing_workers(self) -> int:
+        """Number of extraction processes used by folder monitoring (0 = automatic)."""
+        return self.config.get("processing_workers", 0)
+
+    @processing_workers.setter
+    def processing_workers(self, value: int):
+        self.config["processing_workers"] = int(value)
+        self.save()
+
+    @property
+    def streaming_page_threshold(self) -> int:
+        """Page count from which PDFs are streamed page by page (0 = never)."""
+        return self.config.get("streaming_page_threshold", 150)
+
+    @streaming_page_threshold.setter
+    def streaming_page_threshold(self, value: int):
+        self.config["streaming_page_threshold"] = int(value)
+        self.save()
+
+    @property
+    def streaming_detection_pages(self) -> int:
+        """Number of leading pages used to select the template of a streamed PDF."""
+        return self.config.get("streaming_detection_pages", 5)
+
+    @streaming_detection_pages.setter
+    def streaming_detection_pages(self, value: int):
+        self.config["streaming_detection_pages"] = int(value)
+        self.save()
     
     @property
     def auto_start(self) -> bool:
@@ -205,6 +272,16 @@ class ConfigManager:
         self.config["auto_cbp_export"] = value
         self.save()
 
+    @property
+    def section232_output_format(self) -> str:
+        """Section 232 export file format: 'xlsx', 'csv' or 'parquet'."""
+        return self.config.get("section232_output_format", "xlsx")
+
+    @section232_output_format.setter
+    def section232_output_format(self, value: str):
+        self.config["section232_output_format"] = value
+        self.save()
+
     @property
     def consolidate_multi_invoice(self) -> bool:
         return self.config.get("consolidate_multi_invoice", False)
@@ -1,12 +1,15 @@
 # Core module for OCRMill
 from .workers import (
     SignalLogHandler,
+    BaseProcessingWorker,
     ProcessingWorker,
+    ProcessingQueueWorker,
     SingleFileWorker,
     CBPExportWorker,
     UpdateCheckWorker,
     ImportWorker,
-    ExportWorker
+    ExportWorker,
+    PartsImportWorker
 )
 from .theme_manager import (
     ThemeManager,
@@ -16,12 +19,15 @@ from .theme_manager import (
 
 __all__ = [
     'SignalLogHandler',
+    'BaseProcessingWorker',
     'ProcessingWorker',
+    'ProcessingQueueWorker',
     'SingleFileWorker',
     'CBPExportWorker',
     'UpdateCheckWorker',
     'ImportWorker',
     'ExportWorker',
+    'PartsImportWorker',
     'ThemeManager',
     'get_theme_manager',
     'AVAILABLE_THEMES'
@@ -3,6 +3,9 @@ Worker threads for OCRMill background operations.
 Uses QThread with signals for thread-safe UI updates.
 """
 
+import queue
+import threading
+import time
 from datetime import datetime
 from pathlib import Path
 from PyQt6.QtCore import QThread, pyqtSignal, QObject
@@ -23,83 +26,153 @@ class SignalLogHandler(QObject):
         pass
 
 
-class ProcessingWorker(QThread):
-    """Background worker for monitoring and processing PDF files."""
+class BaseProcessingWorker(QThread):
+    """
+    Shared per-file pipeline for workers that process PDFs with a ProcessorEngine.
+
+    With one worker, extraction runs in this thread. With more, extraction and
+    template matching run in an extraction process pool. CSV output, parts
+    database updates and file moves always happen in this thread, one file at a time.
+    """
 
     # Signals for communicating with main thread
     log_message = pyqtSignal(str)
     files_processed = pyqtSignal(int)
     file_failed = pyqtSignal(str)  # Emitted when a file fails (filename)
+    file_finished = pyqtSignal(str, bool, list)  # filename, success, extracted items
     error_occurred = pyqtSignal(str)
     status_changed = pyqtSignal(str)
-
-    def __init__(self, engine, input_folder: Path, output_folder: Path, poll_interval: int):
+    progress = pyqtSignal(int, int)  # current, total (since the worker was last idle)
+
+    def __init__(self, engine, output_folder: Path, workers: int = 1, config_file: Path = None):
+        """
+        Args:
+            engine: ProcessorEngine used for saving, moving and (in serial mode) extraction
+            output_folder: Folder receiving CSV output
+            workers: Number of extraction processes (1 = process in this thread)
+            config_file: config.json read by the extraction processes
+        """
         super().__init__()
         self.engine = engine
-        self.input_folder = input_folder
         self.output_folder = output_folder
-        self.poll_interval = poll_interval
+        self.workers = max(1, workers)
+        self.config_file = config_file or engine.config.config_file
+        self._pool = None
+        self._pending = {}  # future -> pdf_path, for files submitted to the pool
         self._stop_requested = False
+        self._reset_batch()
 
-    def run(self):
-        """Main processing loop."""
-        self.status_changed.emit("Running")
-        self._log(f"Started monitoring {self.input_folder}")
-
-        while not self._stop_requested:
-            try:
-                # Process any PDFs in the input folder with failure tracking
-                count, failed_files = self._process_folder_with_tracking()
-                if count > 0:
-                    self.files_processed.emit(count)
-                    self._log(f"Processed {count} file(s)")
-
-                # Emit file_failed signal for each failed file
-                for filename in failed_files:
-                    self.file_failed.emit(filename)
-
-            except Exception as e:
-                self._log(f"Error during processing: {e}")
-                self.error_occurred.emit(str(e))
-
-            # Sleep in 1-second intervals for responsive stopping
-            for _ in range(self.poll_interval):
-                if self._stop_requested:
-                    break
-                self.msleep(1000)
-
-        self._log("Monitoring stopped")
-        self.status_changed.emit("Stopped")
-
-    def _process_folder_with_tracking(self):
-        """Process folder and track which files failed."""
-        self.input_folder.mkdir(exist_ok=True, parents=True)
-        self.output_folder.mkdir(exist_ok=True, parents=True)
-
-        pdf_files = list(self.input_folder.glob("*.pdf"))
-        if not pdf_files:
-            return 0, []
+    def _enqueue(self, pdf_path: Path):
+        """Start processing a PDF (the caller counts it in _batch_total)."""
+        if self.workers > 1:
+            from extraction_pool import create_extraction_pool, extract_pdf
 
-        self._log(f"Found {len(pdf_files)} PDF(s) to process")
-        processed_count = 0
-        failed_files = []
+            if self._pool is None:
+                self._pool = create_extraction_pool(self.config_file, self.workers)
+            self._pending[self._pool.submit(extract_pdf, str(pdf_path))] = pdf_path
+            return
 
-        for pdf_path in pdf_files:
+        try:
+            items = self.engine.process_pdf(pdf_path)
+            success = self._finish_file(pdf_path, items)
+            self.engine.record_stage_metrics(pdf_path.name)
+            self._record_result(pdf_path, success, items)
+        except Exception as e:
+            self._log(f"  Error processing {pdf_path.name}: {e}")
+            self._fail_file(pdf_path, f"Error: {str(e)[:50]}")
+            self._record_result(pdf_path, False)
+
+    def _collect_results(self):
+        """
+        Finish PDFs whose extraction has completed in the process pool.
+
+        Only extraction and template matching run in the child processes. CSV output,
+        parts database updates and file moves happen in this thread, one file at a time.
+        """
+        from concurrent.futures import wait, FIRST_COMPLETED
+        from concurrent.futures.process import BrokenProcessPool
+
+        done, _ = wait(list(self._pending), timeout=0.2, return_when=FIRST_COMPLETED)
+        for future in done:
+            pdf_path = self._pending.pop(future)
+            if future.cancelled():
+                continue
             try:
-                items = self.engine.process_pdf(pdf_path)
-                if items:
-                    self.engine.save_to_csv(items, self.output_folder, pdf_name=pdf_path.name)
-                    self.engine.move_to_processed(pdf_path)
-                    processed_count += 1
-                else:
-                    self.engine.move_to_failed(pdf_path, reason="No items extracted")
-                    failed_files.append(pdf_path.name)
+                result = future.result()
+                # Relay the child's log so output matches serial processing
+                for line in result['log']:
+                    self.engine.log(line)
+                self.engine.last_template_used = result['template']
+                self.engine.last_stage_timings = result['timings']
+                self.engine.last_template_timings = result.get('template_timings', {})
+                items = result['items']
+                success = self._finish_file(pdf_path, items)
+                self.engine.record_stage_metrics(pdf_path.name)
+                self._record_result(pdf_path, success, items)
+            except BrokenProcessPool as e:
+                # Leave the files in place; they are picked up again after a restart.
+                # Count them as failed so the batch completes and their jobs are released.
+                lost = [pdf_path] + list(self._pending.values())
+                self._log(f"Extraction process pool stopped unexpectedly: {e}")
+                self._log(f"  {len(lost)} file(s) left unprocessed")
+                self.error_occurred.emit(str(e))
+                self._shutdown_pool()
+                for lost_path in lost:
+                    self._record_result(lost_path, False)
+                return
             except Exception as e:
                 self._log(f"  Error processing {pdf_path.name}: {e}")
-                self.engine.move_to_failed(pdf_path, reason=f"Error: {str(e)[:50]}")
-                failed_files.append(pdf_path.name)
+                self._fail_file(pdf_path, f"Error: {str(e)[:50]}")
+                self._record_result(pdf_path, False)
+
+    def _record_result(self, pdf_path: Path, success: bool, items=None):
+        """Update batch counters and signals after a PDF has been handled."""
+        self._file_done(pdf_path)
+        self._batch_done += 1
+        if success:
+            self._batch_processed += 1
+        else:
+            self.file_failed.emit(pdf_path.name)
+        self.file_finished.emit(pdf_path.name, success, list(items or []) if success else [])
+        self.progress.emit(self._batch_done, self._batch_total)
+
+    def _file_done(self, pdf_path: Path):
+        """Hook called once a PDF has been handled (successfully or not)."""
+        pass
 
-        return processed_count, failed_files
+    def _finish_batch(self):
+        """Report files processed since the worker was last idle."""
+        if self._batch_processed > 0:
+            self.files_processed.emit(self._batch_processed)
+            self._log(f"Processed {self._batch_processed} file(s)")
+        self._reset_batch()
+
+    def _reset_batch(self):
+        """Clear the per-batch counters."""
+        self._batch_total = 0
+        self._batch_done = 0
+        self._batch_processed = 0
+
+    def _finish_file(self, pdf_path: Path, items) -> bool:
+        """Save extracted items and move the PDF. Returns True if items were saved."""
+        if items:
+            self.engine.save_to_csv(items, self.output_folder, pdf_name=pdf_path.name)
+            self.engine.move_to_processed(pdf_path)
+            return True
+        self._fail_file(pdf_path, "No items extracted")
+        return False
+
+    def _fail_file(self, pdf_path: Path, reason: str):
+        """Handle a PDF that could not be processed (moves it to the Failed folder)."""
+        self.engine.move_to_failed(pdf_path, reason=reason)
+
+    def _shutdown_pool(self):
+        """Shut down the extraction process pool, if one was started."""
+        # Unfinished files were not touched by the children and stay where they are
+        self._pending.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
 
     def request_stop(self):
         """Request the worker to stop gracefully."""
@@ -112,6 +185,313 @@ class ProcessingWorker(QThread):
         self.log_message.emit(f"[{timestamp}] {message}")
 
 
+class ProcessingWorker(BaseProcessingWorker):
+    """Background worker for monitoring and processing PDF files."""
+
+    def __init__(self, engine, input_folder: Path, output_folder: Path, poll_interval: int,
+                 workers: int = 1, config_file: Path = None, use_events: bool = True,
+                 settle_seconds: float = 2.0):
+        """
+        Args:
+            engine: ProcessorEngine used for saving, moving and (in serial mode) extraction
+            input_folder: Folder monitored for PDFs
+            output_folder: Folder receiving CSV output
+            poll_interval: Seconds between full folder rescans
+            workers: Number of extraction processes (1 = process in this thread)
+            config_file: config.json read by the extraction processes
+            use_events: Detect new files through file system events when available
+            settle_seconds: Seconds a PDF's size must stay unchanged before it is processed
+        """
+        super().__init__(engine, output_folder, workers=workers, config_file=config_file)
+        self.input_folder = input_folder
+        self.poll_interval = poll_interval
+        self.use_events = use_events
+        self.settle_seconds = settle_seconds
+        self._watcher = None
+
+    def run(self):
+        """Main processing loop: process each PDF as soon as it has finished arriving."""
+        from folder_watcher import FolderWatcher
+
+        self.status_changed.emit("Running")
+        self.output_folder.mkdir(exist_ok=True, parents=True)
+
+        self._watcher = FolderWatcher(
+            self.input_folder,
+            rescan_interval=self.poll_interval,
+            settle_seconds=self.settle_seconds,
+            use_events=self.use_events
+        )
+        self._watcher.start()
+
+        mode = "file events" if self._watcher.mode == "events" else f"polling every {self.poll_interval}s"
+        if self.workers > 1:
+            self._log(f"Started monitoring {self.input_folder} ({mode}, {self.workers} extraction processes)")
+        else:
+            self._log(f"Started monitoring {self.input_folder} ({mode})")
+
+        try:
+            while not self._stop_requested:
+                try:
+                    # Short waits while extractions are running so results are handled promptly
+                    timeout = 0.2 if self._pending else 1.0
+                    for pdf_path in self._watcher.wait_for_files(timeout=timeout):
+                        if self._stop_requested:
+                            break
+                        self._batch_total += 1
+                        self._enqueue(pdf_path)
+
+                    if self._pending:
+                        self._collect_results()
+
+                    if not self._pending and not self._watcher.has_pending():
+                        self._finish_batch()
+
+                except Exception as e:
+                    self._log(f"Error during processing: {e}")
+                    self.error_occurred.emit(str(e))
+        finally:
+            self._finish_batch()
+            self._watcher.stop()
+            self._shutdown_pool()
+
+        self._log("Monitoring stopped")
+        self.status_changed.emit("Stopped")
+
+    def _file_done(self, pdf_path: Path):
+        """Tell the folder watcher the PDF has been handled."""
+        self._watcher.done(pdf_path)
+
+
+class ProcessingQueueWorker(BaseProcessingWorker):
+    """
+    Job queue for PDFs processed on request ("Process Now", drag-and-drop).
+
+    Files are submitted from the GUI thread and processed in the background with
+    the same pipeline as folder monitoring. Results are reported per file through
+    file_finished, and cancel() drops every file that has not started yet.
+    The worker runs until request_stop() is called.
+    """
+
+    batch_finished = pyqtSignal(int, int)  # files processed, files cancelled
+
+    # Seconds the extraction process pool is kept after the queue runs empty
+    POOL_IDLE_SECONDS = 120
+
+    def __init__(self, engine, workers: int = 1, config_file: Path = None):
+        """
+        Args:
+            engine: ProcessorEngine dedicated to this worker (its log is relayed through log_message)
+            workers: Number of extraction processes (1 = process in this thread)
+            config_file: config.json read by the extraction processes
+        """
+        super().__init__(engine, None, workers=workers, config_file=config_file)
+        self.engine.log_callback = self._log
+        self._queue = queue.Queue()  # submitted PDFs, taken into _backlog by the worker thread
+        self._backlog = []  # PDFs counted in the batch but not started yet
+        self._jobs = {}  # pdf_path -> job options, for files queued or in progress
+        self._jobs_lock = threading.Lock()
+        self._cancel_requested = False
+        self._idle_since = time.monotonic()
+
+    def submit(self, pdf_paths, output_folder: Path, move_files: bool = True,
+               record_history: bool = False) -> int:
+        """
+        Queue PDFs for processing (safe to call from any thread).
+
+        Args:
+            pdf_paths: PDF files to process
+            output_folder: Folder receiving CSV output
+            move_files: Move each PDF to Processed/ or Failed/ next to it afterwards
+            record_history: Record each file in the processing history
+
+        Returns:
+            Number of files queued (files already queued are skipped)
+        """
+        count = 0
+        with self._jobs_lock:
+            for pdf_path in pdf_paths:
+                pdf_path = Path(pdf_path)
+                if pdf_path in self._jobs:
+                    continue
+                self._jobs[pdf_path] = {
+                    'output_folder': Path(output_folder),
+                    'move_files': move_files,
+                    'record_history': record_history,
+                    'started': None,
+                }
+                self._queue.put(pdf_path)
+                count += 1
+        return count
+
+    def cancel(self):
+        """Drop all files that have not started processing (the current file finishes)."""
+        self._cancel_requested = True
+        self._queue.put(None)  # Wake the worker
+
+    def is_busy(self) -> bool:
+        """True while files are queued or being processed."""
+        with self._jobs_lock:
+            return bool(self._jobs)
+
+    def request_stop(self):
+        """Request the worker to stop after the file in progress; queued files are dropped."""
+        self._stop_requested = True
+        self._queue.put(None)  # Wake the worker
+
+    def run(self):
+        """Process queued PDFs until stopped."""
+        try:
+            while not self._stop_requested:
+                try:
+                    if self._cancel_requested:
+                        self._cancel_queued()
+
+                    # Short waits while files are being processed so results are handled promptly
+                    timeout = 0.2 if self._pending or self._backlog else 1.0
+                    self._take_jobs(0 if self._backlog else timeout)
+                    if self._stop_requested or self._cancel_requested:
+                        continue
+
+                    # In pool mode every queued file is handed to the pool at once;
+                    # otherwise files are processed one by one so cancel() takes effect between files
+                    while self._backlog:
+                        self._start_job(self._backlog.pop(0))
+                        if self.workers == 1:
+                            break
+
+                    if self._pending:
+                        self._collect_results()
+
+                    if not self._pending and not self._backlog and self._queue.empty():
+                        self._finish_batch()
+                        if self._pool is not None and time.monotonic() - self._idle_since > self.POOL_IDLE_SECONDS:
+                            self._shutdown_pool()
+
+                except Exception as e:
+                    self._log(f"Error during processing: {e}")
+                    self.error_occurred.emit(str(e))
+        finally:
+            self._cancel_queued()
+            self._finish_batch()
+            self._shutdown_pool()
+
+    def _take_jobs(self, timeout: float):
+        """Move submitted PDFs to the backlog, waiting up to timeout for the first one."""
+        taken = []
+        try:
+            item = self._queue.get(timeout=timeout) if timeout else self._queue.get_nowait()
+            while True:
+                if item is not None:
+                    taken.append(item)
+                item = self._queue.get_nowait()
+        except queue.Empty:
+            pass
+        if taken:
+            self._backlog.extend(taken)
+            self._batch_total += len(taken)
+            self.progress.emit(self._batch_done, self._batch_total)
+
+    def _start_job(self, pdf_path: Path):
+        """Start processing a PDF from the backlog."""
+        job = self._jobs[pdf_path]
+        if not pdf_path.exists():
+            self._log(f"  File no longer exists: {pdf_path.name}")
+            self._record_result(pdf_path, False)
+            return
+        job['started'] = time.time()
+        try:
+            job['output_folder'].mkdir(exist_ok=True, parents=True)
+            self._enqueue(pdf_path)
+        except Exception as e:
+            # e.g. the extraction pool could not be started; the PDF is left where it is
+            self._log(f"  Could not start processing {pdf_path.name}: {e}")
+            self._record_result(pdf_path, False)
+
+    def _cancel_queued(self):
+        """Drop submitted and backlogged PDFs and extractions that have not started."""
+        self._cancel_requested = False
+        self._take_jobs(0)
+        cancelled = self._backlog
+        self._backlog = []
+
+        for future, pdf_path in list(self._pending.items()):
+            if future.cancel():
+                del self._pending[future]
+                cancelled.append(pdf_path)
+
+        if cancelled:
+            with self._jobs_lock:
+                for pdf_path in cancelled:
+                    self._jobs.pop(pdf_path, None)
+            self._batch_total -= len(cancelled)
+            self._batch_cancelled += len(cancelled)
+            self._log(f"Cancelled {len(cancelled)} queued file(s)")
+            self.progress.emit(self._batch_done, self._batch_total)
+
+    def _finish_file(self, pdf_path: Path, items) -> bool:
+        """Save extracted items and, if requested, move the PDF and record its history."""
+        job = self._jobs[pdf_path]
+        if not items:
+            self._fail_file(pdf_path, "No items extracted")
+            return False
+
+        self.engine.save_to_csv(items, job['output_folder'], pdf_name=pdf_path.name)
+        if job['move_files']:
+            self.engine.move_to_processed(pdf_path)
+        else:
+            self._log(f"  Extracted {len(items)} items")
+        self._record_history(pdf_path, job, 'SUCCESS', len(items))
+        return True
+
+    def _fail_file(self, pdf_path: Path, reason: str):
+        """Move the PDF to Failed/ (if requested) and record the failure."""
+        job = self._jobs[pdf_path]
+        if job['move_files']:
+            self.engine.move_to_failed(pdf_path, reason=reason)
+        else:
+            self._log(f"  {reason}: {pdf_path.name}")
+        status = 'PARTIAL' if reason == "No items extracted" else 'FAILED'
+        self._record_history(pdf_path, job, status, 0, reason)
+
+    def _record_history(self, pdf_path: Path, job: dict, status: str, items_extracted: int,
+                        error_message: str = None):
+        """Record a processed file in the processing history, if the job asked for it."""
+        if not job['record_history'] or self.engine.parts_db is None:
+            return
+        started = job['started'] or time.time()
+        try:
+            self.engine.parts_db.record_processing_history(
+                file_name=pdf_path.name,
+                template_used=self.engine.last_template_used,
+                items_extracted=items_extracted,
+                status=status,
+                processing_time_ms=int((time.time() - started) * 1000),
+                error_message=error_message[:500] if error_message else None
+            )
+        except Exception as e:
+            self._log(f"  Could not record processing history: {e}")
+
+    def _file_done(self, pdf_path: Path):
+        """Forget the job of a handled PDF."""
+        with self._jobs_lock:
+            self._jobs.pop(pdf_path, None)
+
+    def _finish_batch(self):
+        """Report the batch once the queue has run empty."""
+        if not self._batch_total and not self._batch_cancelled:
+            return
+        processed, cancelled = self._batch_processed, self._batch_cancelled
+        super()._finish_batch()
+        self._idle_since = time.monotonic()
+        self.batch_finished.emit(processed, cancelled)
+
+    def _reset_batch(self):
+        """Clear the per-batch counters."""
+        super()._reset_batch()
+        self._batch_cancelled = 0
+
+
 class SingleFileWorker(QThread):
     """Worker for processing a single PDF file."""
 
@@ -357,3 +737,93 @@ class ExportWorker(QThread):
         """Emit a log message with timestamp."""
         timestamp = datetime.now().strftime("%H:%M:%S")
         self.log_message.emit(f"[{timestamp}] {message}")
+
+
+class PartsQueryWorker(QThread):
+    """Worker for counting parts and loading the first page of a Parts tab query."""
+
+    query_done = pyqtSignal(int, int, list)  # generation, total count, first page rows
+    error = pyqtSignal(int, str)  # generation, error message
+
+    def __init__(self, db, generation: int, filter_type: str, search_term: str,
+                 sort_column: str = None, descending: bool = False, page_size: int = 500):
+        super().__init__()
+        self.db = db
+        self.generation = generation
+        self.filter_type = filter_type
+        self.search_term = search_term
+        self.sort_column = sort_column
+        self.descending = descending
+        self.page_size = page_size
+
+    def run(self):
+        """Run the count and first page queries."""
+        try:
+            total = self.db.count_parts(self.filter_type, self.search_term)
+            rows = self.db.get_parts_page(self.filter_type, self.search_term,
+                                          self.sort_column, self.descending,
+                                          limit=self.page_size, offset=0)
+            self.query_done.emit(self.generation, total, rows)
+        except Exception as e:
+            self.error.emit(self.generation, str(e))
+
+
+class PartsImportWorker(QThread):
+    """Worker for the mapped parts import: reads the file and bulk merges it into parts_master."""
+
+    progress = pyqtSignal(int, int)  # current, total
+    status_changed = pyqtSignal(str)
+    finished = pyqtSignal(bool, str, int, int, int)  # success, message, inserted, updated, skipped
+
+    def __init__(self, db, file_path: str, mapping: dict, custom_fields: list):
+        super().__init__()
+        self.db = db
+        self.file_path = file_path
+        self.mapping = mapping  # field key -> file column
+        self.custom_fields = custom_fields
+        self._cancelled = False
+        self._abandoned = False  # True once the database layer honoured the cancel
+
+    def run(self):
+        """Run the import."""
+        try:
+            import pandas as pd
+
+            self.status_changed.emit("Reading file...")
+            if self.file_path.lower().endswith(('.xlsx', '.xls')):
+                df = pd.read_excel(self.file_path, dtype=str, keep_default_na=False)
+            else:
+                df = pd.read_csv(self.file_path, dtype=str, keep_default_na=False)
+            df = df.fillna("").rename(columns=str.strip)
+
+            # Reverse mapping: file column -> field key
+            df = df.rename(columns={v: k for k, v in self.mapping.items()})
+            if len(df) == 0:
+                self.finished.emit(False, "The file contains no data rows.", 0, 0, 0)
+                return
+            if self._cancelled:
+                self.finished.emit(False, "Import cancelled.", 0, 0, 0)
+                return
+
+            self.status_changed.emit(f"Importing {len(df):,} rows...")
+            inserted, updated, skipped = self.db.import_mapped_parts(
+                df, self.custom_fields,
+                progress_callback=self.progress.emit,
+                is_cancelled=self._check_cancelled
+            )
+            if self._abandoned:
+                self.finished.emit(False, "Import cancelled. No parts were changed.", 0, 0, 0)
+            else:
+                self.finished.emit(True, f"Total rows: {len(df):,}", inserted, updated, skipped)
+
+        except Exception as e:
+            self.finished.emit(False, str(e), 0, 0, 0)
+
+    def cancel(self):
+        """Cancel the import (takes effect before the merge starts)."""
+        self._cancelled = True
+
+    def _check_cancelled(self) -> bool:
+        if self._cancelled:
+            self._abandoned = True
+        return self._cancelled
@@ -0,0 +1,168 @@
+"""
+Event Writer for OCRMill
+Buffers telemetry rows (usage statistics events, stage timings) and writes them
+to SQLite on a background thread.
+
+Tracking an event only puts a tuple on a bounded in-memory queue. A writer thread
+with its own SQLite connection inserts queued events in batches, one transaction
+per batch, when the batch is full or the oldest queued event has waited for the
+flush interval. Telemetry therefore never adds commit/fsync latency to PDF
+processing or the GUI thread, and never holds the connection processing uses.
+
+If the queue is full (the database is locked for a long time), new events are
+dropped and counted rather than blocking the caller. close() writes everything
+still queued; it is also registered with atexit as a last resort.
+"""
+
+import atexit
+import queue
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+INSERT_EVENT_SQL = """INSERT INTO usage_statistics (event_type, event_data, user_name, timestamp)
+                      VALUES (?, ?, ?, ?)"""
+
+INSERT_STAGE_METRIC_SQL = """INSERT INTO stage_metrics (recorded_at, file_name, stage, template_name, duration_ms)
+                               VALUES (?, ?, ?, ?, ?)"""
+
+# Queue marker telling the writer thread to write what it has and exit
+_STOP = object()
+
+
+class EventWriter:
+    """Batches telemetry inserts (usage_statistics by default) on a background thread."""
+
+    def __init__(self, db_path: Path, max_queue: int = 10000, batch_size: int = 200,
+                 flush_interval: float = 2.0, insert_sql: str = INSERT_EVENT_SQL,
+                 label: str = "usage event"):
+        """
+        Args:
+            db_path: SQLite database holding the target table
+            max_queue: Maximum number of events waiting to be written
+            batch_size: Number of queued events that triggers a write
+            flush_interval: Seconds the oldest queued event may wait before a write
+            insert_sql: Parameterized INSERT run for each queued row
+            label: Name of the queued rows in warnings, e.g. "stage metric"
+        """
+        self.db_path = Path(db_path)
+        self.insert_sql = insert_sql
+        self.label = label
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name="OCRMill-EventWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, event: Tuple) -> bool:
+        """
+        Queue one event without blocking.
+
+        Args:
+            event: Parameters for insert_sql, e.g. (event_type, event_data, user_name, timestamp)
+
+        Returns:
+            True if queued, False if the writer is closed or the queue is full
+        """
+        if self._closed:
+            return False
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self.dropped += 1
+            if self.dropped == 1:
+                print(f"Warning: {self.label.capitalize()} queue is full, dropping {self.label}s")
+            return False
+        return True
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until every event queued so far has been written.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if the queued events were written within the timeout
+        """
+        if self._closed or not self._thread.is_alive():
+            return False
+        done = threading.Event()
+        try:
+            self._queue.put(done, timeout=timeout)
+        except queue.Full:
+            return False
+        return done.wait(timeout)
+
+    def close(self, timeout: float = 10.0):
+        """Write all queued events and stop the writer thread."""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        atexit.unregister(self.close)
+        if self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=timeout)
+            except queue.Full:
+                print(f"Warning: {self.label.capitalize()} writer did not drain before shutdown")
+                return
+            self._thread.join(timeout)
+
+    def _run(self):
+        """Writer thread: collect events into batches and insert them."""
+        conn = None
+        batch: List[Tuple] = []
+        waiters: List[threading.Event] = []
+        deadline = 0.0
+        while True:
+            timeout = max(0.0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None  # Flush interval elapsed
+
+            stop = item is _STOP
+            if isinstance(item, threading.Event):
+                waiters.append(item)
+            elif item is not None and not stop:
+                batch.append(item)
+                if len(batch) == 1:
+                    deadline = time.monotonic() + self.flush_interval
+                if len(batch) < self.batch_size:
+                    continue
+
+            if batch:
+                conn = self._write(conn, batch)
+                batch = []
+            for waiter in waiters:
+                waiter.set()
+            waiters = []
+            if stop:
+                break
+
+        if conn is not None:
+            conn.close()
+
+    def _write(self, conn: Optional[sqlite3.Connection],
+               batch: List[Tuple]) -> Optional[sqlite3.Connection]:
+        """Insert a batch in one transaction; returns the (possibly new) connection."""
+        try:
+            if conn is None:
+                conn = sqlite3.connect(str(self.db_path), timeout=30)
+            with conn:
+                conn.executemany(self.insert_sql, batch)
+            self.written += len(batch)
+        except sqlite3.Error as e:
+            print(f"Warning: Could not write {len(batch)} {self.label}s: {e}")
+            if conn is not None:
+                conn.close()
+            conn = None
+        return conn
@@ -0,0 +1,203 @@
+"""
+Extraction Cache for OCRMill
+Content-addressed on-disk cache of PDF page text and extracted line items.
+
+Entries are keyed on the SHA-256 of the PDF bytes, so a PDF that is dropped
+again (or arrives both through the watch folder and drag-and-drop) is served
+without opening pdfplumber:
+
+    <sha256>.pages.json.gz            page texts (independent of templates)
+    <sha256>.<template key>.items.json.gz   line items for one template version
+
+Template selection still runs on the cached text, so configuration changes are
+respected. Templates whose extraction reads database tables (cache_items =
+False) only get cached page text, so edited mappings take effect at once. Line
+item entries are dropped when templates are refreshed; the cache is capped in
+size and evicts least recently used files first.
+"""
+
+import gzip
+import hashlib
+import inspect
+import json
+import os
+import sys
+import threading
+import weakref
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import templates
+from config_manager import APP_PATH
+
+# Default cache location (next to config.json)
+DEFAULT_CACHE_DIR = APP_PATH / "cache" / "extraction"
+
+PAGES_SUFFIX = ".pages.json.gz"
+ITEMS_SUFFIX = ".items.json.gz"
+
+# Caches in use, so a template refresh can clear all of them
+_active_caches = weakref.WeakSet()
+_active_caches_lock = threading.Lock()
+
+
+def file_digest(path: Path) -> str:
+    """SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def template_key(template) -> str:
+    """
+    Identify a template version: name, version and its source file's size/mtime.
+
+    The source file is included so an edited template is not served stale
+    results even if its version string was not bumped.
+    """
+    source = ""
+    try:
+        module = sys.modules.get(type(template).__module__)
+        source_file = getattr(module, '__file__', None) or inspect.getfile(type(template))
+        stat = os.stat(source_file)
+        source = f"{stat.st_size}:{stat.st_mtime_ns}"
+    except (TypeError, OSError):
+        pass
+    raw = f"{template.name}|{template.version}|{source}"
+    return hashlib.sha1(raw.encode('utf-8')).hexdigest()[:16]
+
+
+class ExtractionCache:
+    """LRU-capped cache of page texts and line items stored as gzip'd JSON files."""
+
+    def __init__(self, cache_dir: Path, max_bytes: int = 200 * 1024 * 1024):
+        """
+        Args:
+            cache_dir: Directory holding the cache files
+            max_bytes: Size cap; least recently used files are removed beyond it
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with _active_caches_lock:
+            _active_caches.add(self)
+
+    # ----- Page text -----
+
+    def get_page_texts(self, digest: str) -> Optional[List[str]]:
+        """Cached page texts for a PDF digest, or None."""
+        return self._read(self.cache_dir / f"{digest}{PAGES_SUFFIX}")
+
+    def put_page_texts(self, digest: str, page_texts: List[str]):
+        """Store the page texts of a PDF."""
+        self._write(self.cache_dir / f"{digest}{PAGES_SUFFIX}", page_texts)
+
+    # ----- Line items -----
+
+    def get_items(self, digest: str, template) -> Optional[List[Dict]]:
+        """Cached line items extracted from a PDF by a template version, or None."""
+        if not getattr(template, 'cache_items', True):
+            return None
+        return self._read(self.cache_dir / f"{digest}.{template_key(template)}{ITEMS_SUFFIX}")
+
+    def put_items(self, digest: str, template, items: List[Dict]):
+        """Store the line items extracted from a PDF by a template version."""
+        if not getattr(template, 'cache_items', True):
+            return
+        self._write(self.cache_dir / f"{digest}.{template_key(template)}{ITEMS_SUFFIX}", items)
+
+    def clear_items(self):
+        """Remove all cached line items (page texts stay valid)."""
+        self._remove(lambda name: name.endswith(ITEMS_SUFFIX))
+
+    def clear(self):
+        """Remove every cache entry."""
+        self._remove(lambda name: name.endswith(ITEMS_SUFFIX) or name.endswith(PAGES_SUFFIX))
+
+    # ----- Storage -----
+
+    def _read(self, path: Path):
+        try:
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                data = json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, EOFError):
+            # Corrupt or partially written entry
+            self._unlink(path)
+            return None
+        try:
+            # Mark as recently used for LRU eviction
+            os.utime(path)
+        except OSError:
+            pass
+        return data
+
+    def _write(self, path: Path, data):
+        try:
+            payload = json.dumps(data, ensure_ascii=False, separators=(',', ':'))
+        except (TypeError, ValueError):
+            # Values that do not round-trip through JSON are not cached
+            return
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            with gzip.open(tmp_path, 'wt', encoding='utf-8', compresslevel=6) as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Warning: Could not write extraction cache entry: {e}")
+            self._unlink(tmp_path)
+            return
+        self._evict()
+
+    def _evict(self):
+        """Remove least recently used files until the cache fits in max_bytes."""
+        try:
+            entries = [entry for entry in os.scandir(self.cache_dir)
+                       if entry.is_file() and entry.name.endswith('.json.gz')]
+        except OSError:
+            return
+        stats = []
+        for entry in entries:
+            try:
+                stat = entry.stat()
+            except OSError:
+                continue
+            stats.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in stats)
+        if total <= self.max_bytes:
+            return
+        for _, size, path in sorted(stats):
+            self._unlink(Path(path))
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def _remove(self, predicate):
+        try:
+            entries = list(os.scandir(self.cache_dir))
+        except OSError:
+            return
+        for entry in entries:
+            if entry.is_file() and predicate(entry.name):
+                self._unlink(Path(entry.path))
+
+    @staticmethod
+    def _unlink(path: Path):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _clear_cached_items():
+    """Template refresh listener: cached line items may come from old template code."""
+    with _active_caches_lock:
+        caches = list(_active_caches)
+    for cache in caches:
+        cache.clear_items()
+
+
+templates.add_refresh_listener(_clear_cached_items)
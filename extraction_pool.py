@@ -0,0 +1,107 @@
+"""
+Extraction Pool for OCRMill
+Runs PDF text extraction and template matching in worker processes.
+
+pdfplumber layout analysis is CPU bound, so a folder of PDFs is spread across a
+process pool. Child processes only extract line items; writing CSV files, updating
+the parts database and moving PDFs stay in the parent process, one file at a time.
+"""
+
+import os
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Optional
+
+# Per-process engine created by _init_worker (only set inside child processes)
+_worker_engine = None
+_worker_log = []
+
+
+def default_worker_count() -> int:
+    """Default number of extraction processes: one less than the CPU count."""
+    return max(1, (os.cpu_count() or 1) - 1)
+
+
+def resolve_worker_count(configured: int) -> int:
+    """
+    Resolve the configured worker count.
+
+    Args:
+        configured: Configured number of workers (0 or less means automatic)
+
+    Returns:
+        Number of worker processes to use (at least 1)
+    """
+    if configured and configured > 0:
+        return configured
+    return default_worker_count()
+
+
+def _init_worker(config_file: str, shared_templates_folder: str):
+    """Build a database-less ProcessorEngine once per child process."""
+    global _worker_engine
+
+    # Template loading may print; keep a caller's stdout for its own output
+    sys.stdout = sys.stderr
+
+    from config_manager import ConfigManager
+    from processor_engine import ProcessorEngine
+    import templates
+
+    if shared_templates_folder:
+        templates.set_shared_templates_folder(shared_templates_folder)
+
+    config = ConfigManager(Path(config_file))
+    _worker_engine = ProcessorEngine(config, None, log_callback=_worker_log.append)
+
+
+def extract_pdf(pdf_path: str) -> dict:
+    """
+    Extract line items from one PDF inside a worker process.
+
+    Args:
+        pdf_path: Path to the PDF file
+
+    Returns:
+        Dictionary with items, log lines, template name, stage timings and
+        per-template scoring timings
+    """
+    del _worker_log[:]
+    items = _worker_engine.process_pdf(Path(pdf_path))
+    return {
+        'items': items,
+        'log': list(_worker_log),
+        'template': _worker_engine.last_template_used,
+        'timings': dict(_worker_engine.last_stage_timings),
+        'template_timings': dict(_worker_engine.last_template_timings),
+    }
+
+
+def create_extraction_pool(config_file: Path, workers: int,
+                           shared_templates_folder: Optional[str] = None) -> ProcessPoolExecutor:
+    """
+    Create a process pool whose workers each hold their own ProcessorEngine.
+
+    Uses the spawn start method on every platform so children never inherit the
+    parent's Qt state or open SQLite connection.
+
+    Args:
+        config_file: Path to config.json read by the child processes
+        workers: Number of worker processes
+        shared_templates_folder: Shared templates folder configured in the parent
+
+    Returns:
+        ProcessPoolExecutor ready for extract_pdf submissions
+    """
+    if shared_templates_folder is None:
+        from templates import get_shared_templates_folder
+        shared_templates_folder = get_shared_templates_folder()
+
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(str(config_file), shared_templates_folder or ""),
+    )
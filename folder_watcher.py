@@ -0,0 +1,245 @@
+"""
+Folder Watcher for OCRMill
+Detects PDFs arriving in the input folder and reports them once fully written.
+
+File system events (watchdog, when installed) are used to notice new files
+immediately. A periodic rescan always runs as well, which is the only detection
+method when watchdog is unavailable or events are disabled - e.g. on network
+shares, where change notifications from other machines are unreliable.
+
+A file is only reported after its size and modification time have stopped
+changing for settle_seconds (and, for PDFs, once the %%EOF trailer is present),
+so half-copied PDFs are not picked up. Files that stay empty, unreadable or
+without a trailer are reported after settle_seconds * 10 anyway, so processing
+can move them to Failed.
+"""
+
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Try to import watchdog for file system event support
+try:
+    from watchdog.observers import Observer
+    from watchdog.events import FileSystemEventHandler
+    HAS_WATCHDOG = True
+except ImportError:
+    HAS_WATCHDOG = False
+
+
+if HAS_WATCHDOG:
+    class _FolderEventHandler(FileSystemEventHandler):
+        """Forward created/modified/moved events for matching files to the watcher."""
+
+        def __init__(self, watcher: "FolderWatcher"):
+            super().__init__()
+            self._watcher = watcher
+
+        def on_created(self, event):
+            if not event.is_directory:
+                self._watcher.notify(Path(event.src_path))
+
+        def on_modified(self, event):
+            if not event.is_directory:
+                self._watcher.notify(Path(event.src_path))
+
+        def on_moved(self, event):
+            if not event.is_directory:
+                self._watcher.notify(Path(event.dest_path))
+
+
+class FolderWatcher:
+    """
+    Watch a folder (non-recursively) for new files matching a suffix.
+
+    Usage:
+        watcher = FolderWatcher(input_folder)
+        watcher.start()
+        while running:
+            for pdf_path in watcher.wait_for_files(timeout=1.0):
+                process(pdf_path)
+        watcher.stop()
+    """
+
+    def __init__(self, folder: Path, suffix: str = ".pdf", rescan_interval: float = 60.0,
+                 settle_seconds: float = 2.0, use_events: bool = True):
+        """
+        Args:
+            folder: Folder to watch
+            suffix: File suffix to report (case-insensitive)
+            rescan_interval: Seconds between full folder rescans
+            settle_seconds: Seconds a file's size/mtime must stay unchanged before it is reported
+            use_events: Use file system events when watchdog is available
+        """
+        self.folder = Path(folder)
+        self.suffix = suffix.lower()
+        self.rescan_interval = max(1.0, float(rescan_interval))
+        self.settle_seconds = max(0.0, float(settle_seconds))
+        self.use_events = use_events and HAS_WATCHDOG
+
+        self._condition = threading.Condition()
+        # path -> (size, mtime_ns, time the signature was first seen)
+        self._candidates: Dict[Path, Tuple[int, int, float]] = {}
+        # Files already reported, so a rescan does not report them again while they are processed
+        self._reported = set()
+        self._observer = None
+        self._next_rescan = 0.0
+
+    @property
+    def mode(self) -> str:
+        """Detection mode in use: 'events' or 'polling'."""
+        return "events" if self._observer is not None else "polling"
+
+    def start(self):
+        """Start watching. Existing files are picked up by the initial scan."""
+        self.folder.mkdir(exist_ok=True, parents=True)
+        if self.use_events:
+            try:
+                observer = Observer()
+                observer.schedule(_FolderEventHandler(self), str(self.folder), recursive=False)
+                observer.start()
+                self._observer = observer
+            except Exception as e:
+                print(f"Warning: File system events unavailable for {self.folder}, polling instead: {e}")
+                self._observer = None
+        self._next_rescan = 0.0
+
+    def stop(self):
+        """Stop watching and wake up any waiting caller."""
+        if self._observer is not None:
+            try:
+                self._observer.stop()
+                self._observer.join(timeout=5)
+            except Exception:
+                pass
+            self._observer = None
+        with self._condition:
+            self._condition.notify_all()
+
+    def notify(self, path: Path):
+        """Register a possibly new or changed file (called from the event thread)."""
+        if path.suffix.lower() != self.suffix or path.parent != self.folder:
+            return
+        with self._condition:
+            if path in self._reported:
+                return
+            self._candidates.setdefault(path, (-1, -1, time.monotonic()))
+            self._condition.notify_all()
+
+    def done(self, path: Path):
+        """
+        Forget a reported file once it has been processed and moved away.
+
+        A file that is still present afterwards (e.g. a move failed) is not
+        reported again until it is removed or the watcher is restarted.
+        """
+        with self._condition:
+            if not path.exists():
+                self._reported.discard(path)
+
+    def has_pending(self) -> bool:
+        """True if files have been seen that are not yet reported (still settling)."""
+        with self._condition:
+            return bool(self._candidates)
+
+    def wait_for_files(self, timeout: float = 1.0) -> List[Path]:
+        """
+        Wait up to timeout seconds and return files that have finished being written.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            Settled file paths in arrival order (possibly empty)
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            now = time.monotonic()
+            if now >= self._next_rescan:
+                self._rescan()
+                self._next_rescan = now + self.rescan_interval
+
+            ready = self._collect_settled()
+            if ready:
+                return ready
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return []
+            with self._condition:
+                # Re-check settling candidates periodically; otherwise sleep until an event
+                wait = min(remaining, 0.5) if self._candidates else remaining
+                wait = min(wait, max(0.0, self._next_rescan - time.monotonic()))
+                self._condition.wait(wait)
+
+    def _rescan(self):
+        """List the folder and register any unreported matching files."""
+        try:
+            paths = [p for p in self.folder.iterdir()
+                     if p.suffix.lower() == self.suffix and p.is_file()]
+        except OSError:
+            return
+        now = time.monotonic()
+        with self._condition:
+            present = set(paths)
+            self._reported &= present
+            for path in paths:
+                if path not in self._reported:
+                    self._candidates.setdefault(path, (-1, -1, now))
+
+    def _collect_settled(self) -> List[Path]:
+        """Return candidates whose size and mtime have not changed for settle_seconds."""
+        now = time.monotonic()
+        ready = []
+        with self._condition:
+            for path, (size, mtime_ns, since) in list(self._candidates.items()):
+                signature = self._signature(path)
+                if signature is None:
+                    # Vanished (moved away or deleted) before it settled
+                    del self._candidates[path]
+                    continue
+                if signature != (size, mtime_ns):
+                    self._candidates[path] = (signature[0], signature[1], now)
+                    continue
+                if now - since < self.settle_seconds:
+                    continue
+                # A stalled copy can look settled; wait longer for PDFs without their trailer.
+                # Empty or unreadable files are reported once that longer wait is over too,
+                # so they are failed instead of keeping the watcher pending forever.
+                if now - since < self.settle_seconds * 10:
+                    if size <= 0 or not self._is_readable(path) or not self._looks_complete(path):
+                        continue
+                del self._candidates[path]
+                self._reported.add(path)
+                ready.append(path)
+        return ready
+
+    @staticmethod
+    def _signature(path: Path) -> Optional[Tuple[int, int]]:
+        """Current (size, mtime_ns) of a file, or None if it no longer exists."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    def _looks_complete(self, path: Path) -> bool:
+        """For PDFs, check that the end-of-file marker has been written."""
+        if self.suffix != ".pdf":
+            return True
+        try:
+            with open(path, 'rb') as f:
+                f.seek(max(0, path.stat().st_size - 1024))
+                return b"%%EOF" in f.read()
+        except OSError:
+            return False
+
+    @staticmethod
+    def _is_readable(path: Path) -> bool:
+        """True if the file can be opened (Windows keeps files locked while copying)."""
+        try:
+            with open(path, 'rb'):
+                return True
+        except OSError:
+            return False
@@ -0,0 +1,118 @@
+"""
+FTS Support for OCRMill
+Helpers for the SQLite FTS5 indexes behind the parts, HTS and MID searches.
+
+Indexes are external-content FTS5 tables: the text lives only in the source
+table and triggers keep the index in step with inserts, updates and deletes.
+Every helper degrades gracefully - if the SQLite build lacks FTS5 (or the
+requested tokenizer), callers fall back to plain SQL scans.
+
+Rows written with INSERT OR REPLACE only fire the delete trigger when
+recursive triggers are enabled, so callers should treat FTS results as
+candidates and re-check the search condition in the outer query.
+"""
+
+import sqlite3
+from typing import Sequence
+
+
+def fts5_available(conn: sqlite3.Connection, tokenizer: str = "unicode61") -> bool:
+    """
+    Check whether FTS5 with the given tokenizer can be used on a connection.
+
+    Args:
+        conn: Open SQLite connection
+        tokenizer: FTS5 tokenizer name (e.g. unicode61, trigram)
+
+    Returns:
+        True if a virtual table with that tokenizer can be created
+    """
+    try:
+        conn.execute(f"CREATE VIRTUAL TABLE IF NOT EXISTS temp.fts5_probe USING fts5(x, tokenize='{tokenizer}')")
+        conn.execute("DROP TABLE temp.fts5_probe")
+        return True
+    except sqlite3.Error:
+        return False
+
+
+def table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    """Check whether a table (or virtual table) exists in the main database."""
+    cursor = conn.execute("SELECT 1 FROM sqlite_master WHERE name = ? AND type = 'table'", (name,))
+    return cursor.fetchone() is not None
+
+
+def ensure_fts_index(conn: sqlite3.Connection, table: str, fts_table: str,
+                     columns: Sequence[str], tokenize: str = "unicode61") -> bool:
+    """
+    Create an external-content FTS5 index over a table, with sync triggers.
+
+    The index is built from the existing rows when it is first created;
+    afterwards the triggers keep it current. The source table must be a
+    rowid table.
+
+    Args:
+        conn: Open SQLite connection
+        table: Source table name
+        fts_table: Name of the FTS5 virtual table to create
+        columns: Source columns to index
+        tokenize: FTS5 tokenize option (e.g. "trigram", "unicode61 remove_diacritics 2")
+
+    Returns:
+        True if the index exists and can be queried, False if FTS5 is unavailable
+    """
+    if table_exists(conn, fts_table):
+        return True
+    if not fts5_available(conn, tokenize.split()[0]):
+        return False
+
+    column_list = ", ".join(columns)
+    new_values = ", ".join(f"new.{c}" for c in columns)
+    old_values = ", ".join(f"old.{c}" for c in columns)
+    try:
+        conn.execute(f"""
+            CREATE VIRTUAL TABLE {fts_table} USING fts5(
+                {column_list}, content='{table}', content_rowid='rowid', tokenize='{tokenize}'
+            )
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ai AFTER INSERT ON {table} BEGIN
+                INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.rowid, {new_values});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_ad AFTER DELETE ON {table} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {column_list})
+                VALUES ('delete', old.rowid, {old_values});
+            END
+        """)
+        conn.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS {fts_table}_au AFTER UPDATE ON {table} BEGIN
+                INSERT INTO {fts_table}({fts_table}, rowid, {column_list})
+                VALUES ('delete', old.rowid, {old_values});
+                INSERT INTO {fts_table}(rowid, {column_list}) VALUES (new.rowid, {new_values});
+            END
+        """)
+        conn.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+        conn.commit()
+    except sqlite3.Error as e:
+        print(f"Warning: Could not create search index {fts_table}: {e}")
+        conn.rollback()
+        return False
+    return True
+
+
+def quote_phrase(text: str) -> str:
+    """Quote text as a single FTS5 phrase (no operators are interpreted)."""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def prefix_query(text: str) -> str:
+    """
+    Build an FTS5 query matching every word of the text as a prefix.
+
+    "steel bolt" becomes '"steel"* AND "bolt"*'. Returns an empty string
+    when the text has no words.
+    """
+    words = [word for word in text.split() if word]
+    return " AND ".join(f"{quote_phrase(word)}*" for word in words)
+
@@ -0,0 +1,110 @@
+"""
+Name Matcher for OCRMill
+Cached, accent-insensitive manufacturer name lookup for MID assignment.
+
+Manufacturer names from invoices are matched against mid_table / manufacturers
+names: an exact (normalized) match wins, otherwise the name that contains or is
+contained in the search with the closest length. The index normalizes every
+name once and finds containment candidates through a trigram index instead of
+scanning the whole table for every line item.
+"""
+
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set
+
+
+def normalize_name(name: str) -> str:
+    """Lower-case a name and strip accents (é -> e)."""
+    return ''.join(
+        c for c in unicodedata.normalize('NFD', name)
+        if unicodedata.category(c) != 'Mn'
+    ).lower()
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class NameIndex:
+    """
+    Normalized name index over table rows.
+
+    Rows are kept in table order; when several rows score the same, the first
+    one wins, exactly like a linear scan followed by a stable sort.
+    """
+
+    def __init__(self, rows: Iterable[Dict], name_key: str, signature=None):
+        """
+        Args:
+            rows: Table rows (dicts) in table order
+            name_key: Key of the name column in each row
+            signature: Optional value identifying the table state the index was built from
+        """
+        self.signature = signature
+        self._rows: List[Dict] = []
+        # normalized name -> id of the first row with that name
+        self._first_row: Dict[str, int] = {}
+        # trigram -> normalized names containing it
+        self._trigram_names: Dict[str, Set[str]] = {}
+
+        for row in rows:
+            row_id = len(self._rows)
+            self._rows.append(row)
+            normalized = normalize_name(row.get(name_key) or '')
+            if normalized in self._first_row:
+                continue
+            self._first_row[normalized] = row_id
+            for gram in _trigrams(normalized):
+                self._trigram_names.setdefault(gram, set()).add(normalized)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def lookup(self, name: str) -> Optional[Dict]:
+        """
+        Find the row whose name best matches name.
+
+        Args:
+            name: Name to look up (e.g. manufacturer name from an invoice)
+
+        Returns:
+            Copy of the matching row, or None
+        """
+        if not name:
+            return None
+
+        search = normalize_name(name)
+
+        # Exact match - highest priority
+        row_id = self._first_row.get(search)
+        if row_id is not None:
+            return dict(self._rows[row_id])
+
+        # Names containing the search: every trigram of the search must be present
+        search_grams = _trigrams(search)
+        if search_grams:
+            postings = sorted((self._trigram_names.get(gram, set()) for gram in search_grams), key=len)
+            containing = set.intersection(*postings) if postings[0] else set()
+            containing = {n for n in containing if search in n}
+        else:
+            containing = {n for n in self._first_row if search in n}
+
+        # Names contained in the search: look up every substring of the search
+        contained = {search[i:j]
+                     for i in range(len(search))
+                     for j in range(i + 1, len(search) + 1)
+                     if search[i:j] in self._first_row}
+        if '' in self._first_row:
+            contained.add('')
+
+        best_id = None
+        best_key = None
+        for candidate in containing | contained:
+            longest = max(len(search), len(candidate))
+            score = min(len(search), len(candidate)) / longest if candidate else 0
+            key = (-score, self._first_row[candidate])
+            if best_key is None or key < best_key:
+                best_key = key
+                best_id = self._first_row[candidate]
+
+        return dict(self._rows[best_id]) if best_id is not None else None
@@ -53,6 +53,7 @@ Website: https://processlogiclabs.com
 
 import sys
 import traceback
+import multiprocessing
 import logging
 from datetime import datetime
 from pathlib import Path
@@ -328,4 +329,6 @@ def _show_main_window(splash, window):
 
 
 if __name__ == "__main__":
+    # Required for the extraction process pool in frozen (PyInstaller) builds
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+OCRMill Command Line for OCRMill
+Runs invoice processing and Section 232 export without the GUI.
+
+Nothing here imports PyQt6, so OCRMill can run on a server or as a service
+(e.g. under systemd). pandas and openpyxl are only imported by the code paths
+that need them, which keeps startup fast.
+
+Progress is written to stdout as JSON lines, one event object per line:
+
+    {"event": "start", "command": "process", "files": 12, "workers": 4}
+    {"event": "file", "file": "a.pdf", "status": "processed", "items": 31, "template": "...", "ms": 412, "done": 1, "total": 12}
+    {"event": "done", "command": "process", "processed": 11, "failed": 1, "seconds": 9.8}
+
+Log messages (and anything else printed by the modules used) go to stderr.
+
+Usage:
+    python ocrmill_cli.py process [PDF_OR_FOLDER ...] [--output DIR] [--workers N] [--no-move]
+    python ocrmill_cli.py watch [--input DIR] [--output DIR] [--workers N] [--poll SECONDS]
+    python ocrmill_cli.py export-232 [--input DIR] [--output DIR] [--format xlsx|csv|parquet] [--all]
+
+Common options: --config FILE, --database FILE, --quiet
+"""
+
+import argparse
+import json
+import signal
+import sys
+import time
+from pathlib import Path
+
+# JSON-lines progress stream; everything else printed goes to stderr
+_events = sys.stdout
+
+
+def emit(event: str, **fields):
+    """Write one progress event as a JSON line."""
+    _events.write(json.dumps({'event': event, **fields}, default=str) + "\n")
+    _events.flush()
+
+
+class HeadlessProcessor:
+    """
+    Per-file processing pipeline for the command line, without Qt.
+
+    Mirrors the GUI processing workers: with one worker, extraction runs in this
+    process; with more, extraction and template matching run in the extraction
+    process pool. CSV output, parts database updates, file moves and stage
+    metrics always happen in this process, one file at a time.
+    """
+
+    def __init__(self, engine, output_folder: Path, workers: int = 1, move_files: bool = True,
+                 on_file_done=None, total: int = 0):
+        """
+        Args:
+            engine: ProcessorEngine used for saving, moving and (in serial mode) extraction
+            output_folder: Folder receiving CSV output
+            workers: Number of extraction processes (1 = process in this process)
+            move_files: Move each PDF to Processed/ or Failed/ next to it afterwards
+            on_file_done: Optional callback(pdf_path) called once a PDF has been handled
+            total: Number of PDFs to be submitted, when known up front (otherwise
+                total counts PDFs as they are submitted)
+        """
+        self.engine = engine
+        self.output_folder = output_folder
+        self.workers = max(1, workers)
+        self.move_files = move_files
+        self.on_file_done = on_file_done
+        self.total = total
+        self.submitted = 0
+        self.done = 0
+        self.processed = 0
+        self.failed = 0
+        self._pool = None
+        self._pending = {}  # future -> (pdf_path, start time)
+
+    @property
+    def pending(self) -> int:
+        """Number of PDFs submitted to the extraction pool and not finished yet."""
+        return len(self._pending)
+
+    def submit(self, pdf_path: Path):
+        """Start processing a PDF (counted in total if it was not known up front)."""
+        self.submitted += 1
+        self.total = max(self.total, self.submitted)
+        started = time.perf_counter()
+        if self.workers > 1:
+            from extraction_pool import create_extraction_pool, extract_pdf
+
+            if self._pool is None:
+                self._pool = create_extraction_pool(self.engine.config.config_file, self.workers)
+            self._pending[self._pool.submit(extract_pdf, str(pdf_path))] = (pdf_path, started)
+            return
+
+        try:
+            items = self.engine.process_pdf(pdf_path)
+        except Exception as e:
+            self._fail(pdf_path, started, f"Error: {str(e)[:50]}")
+            return
+        self._finish(pdf_path, started, items)
+
+    def collect(self, timeout: float = 0.2):
+        """Finish PDFs whose extraction has completed in the process pool."""
+        if not self._pending:
+            return
+        from concurrent.futures import wait, FIRST_COMPLETED
+
+        done, _ = wait(list(self._pending), timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            pdf_path, started = self._pending.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                self.engine.last_template_used = None
+                self._fail(pdf_path, started, f"Error: {str(e)[:50]}")
+                continue
+            for line in result['log']:
+                self.engine.log(line)
+            self.engine.last_template_used = result['template']
+            self.engine.last_stage_timings = result['timings']
+            self.engine.last_template_timings = result.get('template_timings', {})
+            self._finish(pdf_path, started, result['items'])
+
+    def drain(self):
+        """Wait for every submitted PDF to finish."""
+        while self._pending:
+            self.collect(timeout=1.0)
+
+    def shutdown(self):
+        """Shut down the extraction process pool, if one was started."""
+        # Unfinished files were not touched by the children and stay where they are
+        self._pending.clear()
+        if self._pool is not None:
+            self._pool.shutdown(wait=True, cancel_futures=True)
+            self._pool = None
+
+    def _finish(self, pdf_path: Path, started: float, items):
+        """Save extracted items, move the PDF and report the file."""
+        if not items:
+            self._fail(pdf_path, started, "No items extracted")
+            return
+        try:
+            self.engine.save_to_csv(items, self.output_folder, pdf_name=pdf_path.name)
+            if self.move_files:
+                self.engine.move_to_processed(pdf_path)
+        except Exception as e:
+            self._fail(pdf_path, started, f"Error: {str(e)[:50]}")
+            return
+        self.engine.record_stage_metrics(pdf_path.name)
+        self._record_history(pdf_path, started, 'SUCCESS', len(items))
+        self.processed += 1
+        self._report(pdf_path, started, 'processed', items=len(items))
+
+    def _fail(self, pdf_path: Path, started: float, reason: str):
+        """Move a PDF that could not be processed to Failed/ and report it."""
+        self.engine.log(f"  {reason}: {pdf_path.name}")
+        if self.move_files:
+            try:
+                self.engine.move_to_failed(pdf_path, reason=reason)
+            except OSError as e:
+                self.engine.log(f"  Could not move {pdf_path.name} to Failed: {e}")
+        status = 'PARTIAL' if reason == "No items extracted" else 'FAILED'
+        self._record_history(pdf_path, started, status, 0, reason)
+        self.failed += 1
+        self._report(pdf_path, started, 'failed', items=0, reason=reason)
+
+    def _report(self, pdf_path: Path, started: float, status: str, **fields):
+        """Emit the event for a finished file."""
+        self.done += 1
+        emit('file', file=pdf_path.name, status=status,
+             template=self.engine.last_template_used,
+             ms=int((time.perf_counter() - started) * 1000),
+             done=self.done, total=self.total, **fields)
+        if self.on_file_done is not None:
+            self.on_file_done(pdf_path)
+
+    def _record_history(self, pdf_path: Path, started: float, status: str, items_extracted: int,
+                        error_message: str = None):
+        """Record a processed file in the processing history."""
+        if self.engine.parts_db is None:
+            return
+        try:
+            self.engine.parts_db.record_processing_history(
+                file_name=pdf_path.name,
+                template_used=self.engine.last_template_used,
+                items_extracted=items_extracted,
+                status=status,
+                processing_time_ms=int((time.perf_counter() - started) * 1000),
+                error_message=error_message[:500] if error_message else None
+            )
+        except Exception as e:
+            self.engine.log(f"  Could not record processing history: {e}")
+
+
+def _load_config(args):
+    """Load the configuration named on the command line (or the default config.json)."""
+    from config_manager import ConfigManager, CONFIG_FILE
+
+    return ConfigManager(Path(args.config) if args.config else CONFIG_FILE)
+
+
+def _open_database(args, config):
+    """Open the parts database named on the command line (or the configured one)."""
+    from parts_database import PartsDatabase
+
+    return PartsDatabase(Path(args.database) if args.database else config.database_path)
+
+
+def _create_engine(args, config, db):
+    """Create a ProcessorEngine logging to stderr (or nowhere with --quiet)."""
+    from processor_engine import ProcessorEngine
+
+    if args.quiet:
+        log_callback = lambda message: None
+    else:
+        log_callback = lambda message: print(message, file=sys.stderr, flush=True)
+    return ProcessorEngine(config, db, log_callback=log_callback)
+
+
+def _worker_count(args, config) -> int:
+    """Number of extraction processes from --workers or the configuration."""
+    from extraction_pool import resolve_worker_count
+
+    return resolve_worker_count(args.workers if args.workers is not None else config.processing_workers)
+
+
+def _collect_pdfs(paths):
+    """Expand files and folders (non-recursive) into a sorted list of PDFs."""
+    pdfs = []
+    for path in paths:
+        if path.is_dir():
+            pdfs.extend(sorted(p for p in path.iterdir() if p.is_file() and p.suffix.lower() == '.pdf'))
+        elif path.is_file():
+            pdfs.append(path)
+        else:
+            emit('error', message=f"Not found: {path}")
+    return pdfs
+
+
+def cmd_process(args) -> int:
+    """Process PDF files and folders once."""
+    config = _load_config(args)
+    inputs = [Path(path) for path in args.paths] or [Path(config.input_folder)]
+    output_folder = Path(args.output) if args.output else Path(config.output_folder)
+    output_folder.mkdir(parents=True, exist_ok=True)
+    pdfs = _collect_pdfs(inputs)
+    workers = min(_worker_count(args, config), max(1, len(pdfs)))
+
+    emit('start', command='process', files=len(pdfs), workers=workers, output=str(output_folder))
+    started = time.perf_counter()
+    db = _open_database(args, config)
+    processor = HeadlessProcessor(_create_engine(args, config, db), output_folder,
+                                  workers=workers, move_files=not args.no_move, total=len(pdfs))
+    try:
+        for pdf_path in pdfs:
+            processor.submit(pdf_path)
+            processor.collect(timeout=0)
+        processor.drain()
+    except KeyboardInterrupt:
+        emit('error', message="Interrupted")
+    finally:
+        processor.shutdown()
+        db.close()
+
+    emit('done', command='process', processed=processor.processed, failed=processor.failed,
+         seconds=round(time.perf_counter() - started, 3))
+    return 0 if processor.failed == 0 and processor.done == len(pdfs) else 1
+
+
+def cmd_watch(args) -> int:
+    """Watch the input folder and process PDFs as they arrive, until stopped."""
+    from folder_watcher import FolderWatcher
+
+    config = _load_config(args)
+    input_folder = Path(args.input) if args.input else Path(config.input_folder)
+    output_folder = Path(args.output) if args.output else Path(config.output_folder)
+    poll_interval = args.poll if args.poll is not None else config.poll_interval
+    input_folder.mkdir(parents=True, exist_ok=True)
+    output_folder.mkdir(parents=True, exist_ok=True)
+
+    stop = []
+
+    def request_stop(signum, frame):
+        stop.append(signum)
+
+    signal.signal(signal.SIGINT, request_stop)
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, request_stop)
+
+    watcher = FolderWatcher(input_folder, rescan_interval=poll_interval,
+                            use_events=config.use_folder_events)
+    db = _open_database(args, config)
+    processor = HeadlessProcessor(_create_engine(args, config, db), output_folder,
+                                  workers=_worker_count(args, config), on_file_done=watcher.done)
+    watcher.start()
+    emit('watching', folder=str(input_folder), output=str(output_folder), mode=watcher.mode,
+         workers=processor.workers)
+    try:
+        while not stop:
+            timeout = 0.2 if processor.pending else 1.0
+            for pdf_path in watcher.wait_for_files(timeout=timeout):
+                if stop:
+                    break
+                processor.submit(pdf_path)
+            processor.collect()
+    finally:
+        watcher.stop()
+        processor.shutdown()
+        db.close()
+
+    emit('stopped', processed=processor.processed, failed=processor.failed)
+    return 0
+
+
+def cmd_export_232(args) -> int:
+    """Run the Section 232 export over the processed CSV files."""
+    from extraction_pool import resolve_worker_count
+    from section232_exporter import Section232Exporter
+
+    config = _load_config(args)
+    input_folder = Path(args.input) if args.input else Path(config.output_folder) / "Processed"
+    output_folder = Path(args.output) if args.output else Path(config.output_folder) / "Section232_Export"
+    db_path = Path(args.database) if args.database else config.database_path
+    output_format = args.format or config.section232_output_format
+    workers = resolve_worker_count(args.workers if args.workers is not None else config.processing_workers)
+
+    emit('start', command='export-232', input=str(input_folder), output=str(output_folder),
+         format=output_format, workers=workers)
+    started = time.perf_counter()
+    try:
+        exporter = Section232Exporter(input_folder, output_folder, db_path, output_format=output_format,
+                                      incremental=not args.all, workers=workers)
+    except ValueError as e:
+        emit('error', message=str(e))
+        return 2
+
+    def on_file(csv_path, output_path, row_count):
+        emit('file', file=csv_path.name, output=output_path.name if output_path else None, rows=row_count)
+
+    count = exporter.process_all(on_file=on_file)
+    emit('done', command='export-232', exported=count, skipped=exporter.skipped_count,
+         seconds=round(time.perf_counter() - started, 3))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Build the command line parser."""
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument('--config', help="config.json to use (default: the application config)")
+    common.add_argument('--database', help="Parts database (default: the configured database)")
+    common.add_argument('--quiet', action='store_true', help="Do not write log messages to stderr")
+
+    parser = argparse.ArgumentParser(prog='ocrmill', description="OCRMill invoice processing without the GUI. "
+                                     "Progress is written to stdout as JSON lines.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    process = commands.add_parser('process', parents=[common], help="Process PDFs once")
+    process.add_argument('paths', nargs='*', help="PDF files or folders (default: the configured input folder)")
+    process.add_argument('--output', help="CSV output folder (default: the configured output folder)")
+    process.add_argument('--workers', type=int, help="Extraction processes (0 = CPU cores minus one)")
+    process.add_argument('--no-move', action='store_true', help="Leave PDFs in place instead of moving "
+                         "them to Processed/ or Failed/")
+    process.set_defaults(handler=cmd_process)
+
+    watch = commands.add_parser('watch', parents=[common], help="Watch the input folder and process new PDFs")
+    watch.add_argument('--input', help="Folder to watch (default: the configured input folder)")
+    watch.add_argument('--output', help="CSV output folder (default: the configured output folder)")
+    watch.add_argument('--workers', type=int, help="Extraction processes (0 = CPU cores minus one)")
+    watch.add_argument('--poll', type=int, help="Seconds between full folder rescans")
+    watch.set_defaults(handler=cmd_watch)
+
+    export = commands.add_parser('export-232', parents=[common], help="Export processed CSVs for Section 232")
+    export.add_argument('--input', help="Folder of processed CSVs (default: <output folder>/Processed)")
+    export.add_argument('--output', help="Export folder (default: <output folder>/Section232_Export)")
+    export.add_argument('--format', choices=['xlsx', 'csv', 'parquet'], help="Output format")
+    export.add_argument('--workers', type=int, help="Export processes (0 = CPU cores minus one)")
+    export.add_argument('--all', action='store_true', help="Re-export files that have not changed")
+    export.set_defaults(handler=cmd_export_232)
+
+    return parser
+
+
+def main(argv=None) -> int:
+    global _events
+
+    args = build_parser().parse_args(argv)
+    # Keep stdout for progress events only
+    _events = sys.stdout
+    sys.stdout = sys.stderr
+    try:
+        return args.handler(args)
+    finally:
+        sys.stdout = _events
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,7 +4,7 @@ Extracts human-readable descriptions from mmcité part numbers and improves HTS
 """
 
 import re
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Iterable, Tuple
 
 
 class PartDescriptionExtractor:
@@ -223,6 +223,24 @@ class PartDescriptionExtractor:
         # Only return if we have a reasonable match (at least 1 word overlap)
         return best_match if best_score > 0 else None
 
+    def match_with_hts_index(self, description: str, hts_index: 'HTSDescriptionIndex') -> Optional[str]:
+        """
+        Match description against a prebuilt HTS description index.
+
+        Returns the same code as match_with_hts_database would for the entries
+        the index was built from, without re-splitting every HTS description.
+
+        Args:
+            description: Product description
+            hts_index: HTSDescriptionIndex built from the hts_codes table
+
+        Returns:
+            Best matching HTS code, or None
+        """
+        if not description or hts_index is None:
+            return None
+        return hts_index.best_match(description)
+
     def enrich_part_data(self, part_number: str, existing_description: str = "") -> Dict[str, str]:
         """
         Enrich part data with extracted description and HTS code.
@@ -246,6 +264,61 @@ class PartDescriptionExtractor:
         }
 
 
+class HTSDescriptionIndex:
+    """
+    Inverted word index over HTS code descriptions.
+
+    Maps each upper-cased description word to the entries containing it, so a
+    lookup only touches entries that share at least one word with the part
+    description instead of scanning the whole HTS table.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[Optional[str], Optional[str]]], signature=None):
+        """
+        Args:
+            entries: (hts_code, description) pairs in table order
+            signature: Optional value identifying the table state the index was built from
+        """
+        self.signature = signature
+        self._codes: List[Optional[str]] = []
+        self._postings: Dict[str, List[int]] = {}
+
+        for hts_code, hts_desc in entries:
+            if not hts_desc:
+                continue
+            entry_id = len(self._codes)
+            self._codes.append(hts_code)
+            for word in set(hts_desc.upper().split()):
+                self._postings.setdefault(word, []).append(entry_id)
+
+    def __len__(self) -> int:
+        return len(self._codes)
+
+    def best_match(self, description: str) -> Optional[str]:
+        """
+        Find the HTS code whose description shares the most words with description.
+
+        Ties go to the entry that comes first in table order, matching
+        PartDescriptionExtractor.match_with_hts_database.
+
+        Args:
+            description: Product description
+
+        Returns:
+            Best matching HTS code, or None if no word overlaps
+        """
+        scores: Dict[int, int] = {}
+        for word in set(description.upper().split()):
+            for entry_id in self._postings.get(word, ()):
+                scores[entry_id] = scores.get(entry_id, 0) + 1
+
+        if not scores:
+            return None
+
+        best_id = min(scores, key=lambda entry_id: (-scores[entry_id], entry_id))
+        return self._codes[best_id]
+
+
 # Global instance for easy import
 extractor = PartDescriptionExtractor()
 
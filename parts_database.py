@@ -7,10 +7,20 @@ import sqlite3
 import json
 import threading
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
 from datetime import datetime
-import pandas as pd
-from part_description_extractor import PartDescriptionExtractor
+from part_description_extractor import PartDescriptionExtractor, HTSDescriptionIndex
+from name_matcher import NameIndex
+from event_writer import EventWriter, INSERT_EVENT_SQL, INSERT_STAGE_METRIC_SQL
+from fts_support import ensure_fts_index, quote_phrase, prefix_query
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+def _sql_upper(value):
+    """SQL function py_upper(): Unicode-aware upper() (SQLite's upper() is ASCII only)."""
+    return value.upper() if isinstance(value, str) else value
 
 
 class PartsDatabase:
@@ -30,12 +40,55 @@ class PartsDatabase:
         self.conn = None
         self._lock = threading.Lock()
         self.description_extractor = PartDescriptionExtractor()
+        self._hts_index = None  # HTSDescriptionIndex over hts_codes, built on first use
+        self._name_indexes = {}  # table name -> NameIndex for manufacturer name lookups
+        self._event_writer = None  # EventWriter for track_event, started on first event
+        self._metrics_writer = None  # EventWriter for record_stage_metrics, started on first PDF
+        self._mid_fts = False  # mid_table_fts trigram index available
+        self._parts_trigram = False  # parts_master_trigram index available (substring search)
+        self._parts_words = False  # parts_master_words index available (result ranking)
         self._initialize_database()
 
+    @staticmethod
+    def _rollup_key_sql(row: str) -> List[str]:
+        """
+        SQL expressions for the usage_daily_rollup key of a usage_statistics row.
+
+        Args:
+            row: Row reference in the SQL (NEW in the trigger, a table alias otherwise)
+
+        Returns:
+            Expressions for day, event_type, user_name and template_name
+        """
+        return [
+            f"COALESCE(DATE({row}.timestamp), '')",
+            f"COALESCE({row}.event_type, '')",
+            f"COALESCE({row}.user_name, '')",
+            f"CASE WHEN json_valid({row}.event_data) "
+            f"THEN COALESCE(CAST(json_extract({row}.event_data, '$.template_name') AS TEXT), '') "
+            f"ELSE '' END",
+        ]
+
+    def _rebuild_usage_rollup(self, cursor):
+        """Recompute usage_daily_rollup from the raw usage_statistics rows."""
+        day, event_type, user_name, template_name = self._rollup_key_sql('u')
+        cursor.execute("DELETE FROM usage_daily_rollup")
+        cursor.execute(f"""
+            INSERT INTO usage_daily_rollup
+                (day, event_type, user_name, template_name,
+                 event_count, first_timestamp, last_timestamp)
+            SELECT {day} AS r_day, {event_type} AS r_event_type,
+                   {user_name} AS r_user_name, {template_name} AS r_template_name,
+                   COUNT(*), MIN(u.timestamp), MAX(u.timestamp)
+            FROM usage_statistics u
+            GROUP BY r_day, r_event_type, r_user_name, r_template_name
+        """)
+
     def _initialize_database(self):
         """Create database tables if they don't exist."""
         self.conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
         self.conn.row_factory = sqlite3.Row
+        self.conn.create_function("py_upper", 1, _sql_upper, deterministic=True)
         cursor = self.conn.cursor()
 
         # Parts master table - TariffMill compatible schema
@@ -157,6 +210,7 @@ class PartsDatabase:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_manufacturers_mid ON manufacturers(mid)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_mid_table_manufacturer ON mid_table(manufacturer_name)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_mid_table_customer ON mid_table(customer_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_parts_master_last_updated ON parts_master(last_updated)")
 
         # App config table for licensing and settings
         cursor.execute("""
@@ -198,6 +252,44 @@ class PartsDatabase:
             )
         """)
 
+        # Daily usage rollups - one row per day/event type/user/template, kept
+        # current by a trigger so dashboards never scan or parse raw events.
+        # Retention cleanup only prunes usage_statistics, so rollups keep
+        # the full history.
+        cursor.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'usage_daily_rollup'"
+        )
+        rollup_exists = cursor.fetchone() is not None
+        rollup_key = ", ".join(self._rollup_key_sql('NEW'))
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS usage_daily_rollup (
+                day TEXT NOT NULL,
+                event_type TEXT NOT NULL,
+                user_name TEXT NOT NULL DEFAULT '',
+                template_name TEXT NOT NULL DEFAULT '',
+                event_count INTEGER NOT NULL DEFAULT 0,
+                first_timestamp TEXT,
+                last_timestamp TEXT,
+                PRIMARY KEY (day, event_type, user_name, template_name)
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_usage_statistics_rollup
+            AFTER INSERT ON usage_statistics
+            BEGIN
+                INSERT OR IGNORE INTO usage_daily_rollup
+                    (day, event_type, user_name, template_name, first_timestamp)
+                VALUES ({rollup_key}, NEW.timestamp);
+                UPDATE usage_daily_rollup
+                SET event_count = event_count + 1,
+                    first_timestamp = MIN(first_timestamp, NEW.timestamp),
+                    last_timestamp = MAX(COALESCE(last_timestamp, ''), NEW.timestamp)
+                WHERE (day, event_type, user_name, template_name) = ({rollup_key});
+            END
+        """)
+        if not rollup_exists:
+            self._rebuild_usage_rollup(cursor)
+
         # Export audit log table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS export_audit_log (
@@ -242,6 +334,18 @@ class PartsDatabase:
             )
         """)
 
+        # Per-stage processing timings (one row per stage, or per template scored, per PDF)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS stage_metrics (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                recorded_at TEXT NOT NULL,
+                file_name TEXT,
+                stage TEXT NOT NULL,
+                template_name TEXT,
+                duration_ms REAL NOT NULL
+            )
+        """)
+
         # File number divisions table for managing file number patterns per division
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS file_number_divisions (
@@ -264,9 +368,23 @@ class PartsDatabase:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_audit_log_file_number ON export_audit_log(file_number)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_processing_history_date ON processing_history(process_date)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_processing_history_user ON processing_history(user_name)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_stage_metrics_recorded ON stage_metrics(recorded_at)")
 
         self.conn.commit()
 
+        # Let INSERT OR REPLACE fire delete triggers so search indexes drop replaced rows
+        self.conn.execute("PRAGMA recursive_triggers = ON")
+
+        # Trigram index for MID substring search (search_mids falls back to LIKE without FTS5)
+        self._mid_fts = ensure_fts_index(self.conn, 'mid_table', 'mid_table_fts',
+                                         ('manufacturer_name', 'mid', 'customer_id'), tokenize='trigram')
+
+        # Parts search: the trigram index finds substring matches, the word index ranks them
+        self._parts_trigram = ensure_fts_index(self.conn, 'parts_master', 'parts_master_trigram',
+                                               ('part_number', 'description'), tokenize='trigram')
+        self._parts_words = ensure_fts_index(self.conn, 'parts_master', 'parts_master_words',
+                                             ('part_number', 'description'), tokenize='unicode61')
+
     def add_part_occurrence(self, part_data: Dict) -> bool:
         """
         Add a new part occurrence from invoice processing.
@@ -289,169 +407,170 @@ class PartsDatabase:
         Returns:
             bool: True if successful
         """
-        with self._lock:
-            cursor = self.conn.cursor()
+        return self.add_part_occurrences_bulk([part_data]) == 1
 
-            part_number = part_data.get('part_number')
-            if not part_number:
-                return False
+    def add_part_occurrences_bulk(self, items: List[Dict]) -> int:
+        """
+        Add the part occurrences of a whole invoice in a single transaction.
 
-            # Extract description if not provided
-            if not part_data.get('description'):
-                part_data['description'] = self.description_extractor.extract_description(part_number)
-
-            # Check for FSC certification in description
-            description = part_data.get('description', '')
-            if 'FSC 100%' in description or 'FSC100%' in description.replace(' ', ''):
-                part_data['fsc_certified'] = 'FSC 100%'
-                part_data['fsc_certificate_code'] = 'PBN-COC-065387'
-            elif 'FSC' in description.upper():
-                # Generic FSC mention without 100%
-                part_data['fsc_certified'] = 'FSC'
-
-            # Try to find HTS code if not provided
-            if not part_data.get('hts_code'):
-                # First try from description
-                hts_code = self.description_extractor.find_hts_from_description(part_data['description'])
-
-                # If not found, check database for existing HTS codes
-                if not hts_code:
-                    cursor = self.conn.cursor()
-                    cursor.execute("SELECT * FROM hts_codes")
-                    hts_database = [dict(row) for row in cursor.fetchall()]
-                    hts_code = self.description_extractor.match_with_hts_database(
-                        part_data['description'], hts_database
-                    )
-
-                if hts_code:
-                    part_data['hts_code'] = hts_code
-
-            # Calculate unit price if not provided
-            unit_price = part_data.get('unit_price')
-            if not unit_price and part_data.get('total_price') and part_data.get('quantity'):
-                try:
-                    unit_price = float(part_data['total_price']) / float(part_data['quantity'])
-                except (ValueError, ZeroDivisionError):
-                    unit_price = None
-
-            # Insert occurrence
-            cursor.execute("""
-                INSERT INTO part_occurrences (
-                    part_number, invoice_number, project_number, quantity, total_price, unit_price,
-                    steel_ratio, steel_kg, steel_value,
-                    aluminum_ratio, aluminum_kg, aluminum_value,
-                    net_weight, ncm_code, hts_code, processed_date, source_file
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                part_number,
-                part_data.get('invoice_number'),
-                part_data.get('project_number'),
-                part_data.get('quantity'),
-                part_data.get('total_price'),
-                unit_price,
-                part_data.get('steel_ratio'),
-                part_data.get('steel_kg'),
-                part_data.get('steel_value'),
-                part_data.get('aluminum_ratio'),
-                part_data.get('aluminum_kg'),
-                part_data.get('aluminum_value'),
-                part_data.get('net_weight'),
-                part_data.get('ncm_code'),
-                part_data.get('hts_code'),
-                datetime.now().isoformat(),
-                part_data.get('source_file')
-            ))
+        Each dict is enriched in place exactly like add_part_occurrence does
+        (description, FSC certification, HTS code), all occurrences are inserted
+        with executemany and parts_master is upserted in one pass. Parts that
+        appear more than once are applied in order, so the result matches adding
+        the items one by one.
 
-            # Update or create part master record
-            self._update_part_master(part_number, part_data)
+        Args:
+            items: List of part_data dictionaries (see add_part_occurrence)
 
-            self.conn.commit()
-            return True
+        Returns:
+            int: Number of occurrences added (items without a part number are skipped)
+        """
+        with self._lock:
+            cursor = self.conn.cursor()
+            hts_index = None
+            occurrence_rows = []
+            master_rows = []
 
-    def _update_part_master(self, part_number: str, part_data: Dict):
-        """Update the parts master table with latest occurrence data."""
-        cursor = self.conn.cursor()
+            for part_data in items:
+                part_number = part_data.get('part_number')
+                if not part_number:
+                    continue
 
-        # Check if part exists
-        cursor.execute("SELECT part_number FROM parts_master WHERE part_number = ?", (part_number,))
-        exists = cursor.fetchone() is not None
+                # Extract description if not provided
+                if not part_data.get('description'):
+                    part_data['description'] = self.description_extractor.extract_description(part_number)
+
+                # Check for FSC certification in description
+                description = part_data.get('description', '')
+                if 'FSC 100%' in description or 'FSC100%' in description.replace(' ', ''):
+                    part_data['fsc_certified'] = 'FSC 100%'
+                    part_data['fsc_certificate_code'] = 'PBN-COC-065387'
+                elif 'FSC' in description.upper():
+                    # Generic FSC mention without 100%
+                    part_data['fsc_certified'] = 'FSC'
+
+                # Try to find HTS code if not provided
+                if not part_data.get('hts_code'):
+                    # First try from description
+                    hts_code = self.description_extractor.find_hts_from_description(part_data['description'])
+
+                    # If not found, check database for existing HTS codes
+                    if not hts_code:
+                        if hts_index is None:
+                            hts_index = self._get_hts_index()
+                        hts_code = self.description_extractor.match_with_hts_index(
+                            part_data['description'], hts_index
+                        )
+
+                    if hts_code:
+                        part_data['hts_code'] = hts_code
+
+                # Calculate unit price if not provided
+                unit_price = part_data.get('unit_price')
+                if not unit_price and part_data.get('total_price') and part_data.get('quantity'):
+                    try:
+                        unit_price = float(part_data['total_price']) / float(part_data['quantity'])
+                    except (ValueError, ZeroDivisionError):
+                        unit_price = None
+
+                now = datetime.now().isoformat()
+                occurrence_rows.append((
+                    part_number,
+                    part_data.get('invoice_number'),
+                    part_data.get('project_number'),
+                    part_data.get('quantity'),
+                    part_data.get('total_price'),
+                    unit_price,
+                    part_data.get('steel_ratio'),
+                    part_data.get('steel_kg'),
+                    part_data.get('steel_value'),
+                    part_data.get('aluminum_ratio'),
+                    part_data.get('aluminum_kg'),
+                    part_data.get('aluminum_value'),
+                    part_data.get('net_weight'),
+                    part_data.get('ncm_code'),
+                    part_data.get('hts_code'),
+                    now,
+                    part_data.get('source_file')
+                ))
+                master_rows.append((
+                    part_number,
+                    part_data.get('description'),
+                    part_data.get('hts_code'),
+                    part_data.get('steel_ratio'),
+                    part_data.get('aluminum_ratio'),
+                    part_data.get('mid'),
+                    part_data.get('country_origin'),
+                    part_data.get('client_code'),
+                    part_data.get('fsc_certified'),
+                    part_data.get('fsc_certificate_code'),
+                    now
+                ))
 
-        # Get latest material percentages from most recent occurrence
-        cursor.execute("""
-            SELECT
-                steel_ratio,
-                aluminum_ratio,
-                processed_date
-            FROM part_occurrences
-            WHERE part_number = ?
-            ORDER BY processed_date DESC
-            LIMIT 1
-        """, (part_number,))
+            if not occurrence_rows:
+                return 0
+
+            try:
+                cursor.executemany("""
+                    INSERT INTO part_occurrences (
+                        part_number, invoice_number, project_number, quantity, total_price, unit_price,
+                        steel_ratio, steel_kg, steel_value,
+                        aluminum_ratio, aluminum_kg, aluminum_value,
+                        net_weight, ncm_code, hts_code, processed_date, source_file
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, occurrence_rows)
+
+                # New parts are inserted as-is. Existing parts only take fields that
+                # are provided (not NULL and not blank); material ratios follow the
+                # latest occurrence. HTS_CODE is NEVER updated from PDF - database is
+                # master source of truth.
+                cursor.executemany("""
+                    INSERT INTO parts_master (
+                        part_number, description, hts_code, steel_ratio, aluminum_ratio,
+                        mid, country_origin, client_code, fsc_certified, fsc_certificate_code, last_updated
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT(part_number) DO UPDATE SET
+                        description = COALESCE(NULLIF(TRIM(excluded.description), ''), description),
+                        steel_ratio = COALESCE(excluded.steel_ratio, steel_ratio),
+                        aluminum_ratio = COALESCE(excluded.aluminum_ratio, aluminum_ratio),
+                        mid = COALESCE(NULLIF(TRIM(excluded.mid), ''), mid),
+                        country_origin = COALESCE(NULLIF(TRIM(excluded.country_origin), ''), country_origin),
+                        client_code = COALESCE(NULLIF(TRIM(excluded.client_code), ''), client_code),
+                        fsc_certified = COALESCE(NULLIF(TRIM(excluded.fsc_certified), ''), fsc_certified),
+                        fsc_certificate_code = COALESCE(NULLIF(TRIM(excluded.fsc_certificate_code), ''), fsc_certificate_code),
+                        last_updated = excluded.last_updated
+                """, master_rows)
+
+                self.conn.commit()
+            except Exception:
+                self.conn.rollback()
+                raise
+
+            return len(occurrence_rows)
+
+    def _get_hts_index(self) -> HTSDescriptionIndex:
+        """
+        Get the cached HTS description index, rebuilding it if hts_codes changed.
 
-        latest = cursor.fetchone()
-
-        if exists:
-            # Update existing part with latest occurrence data
-            # Only update fields if new data is provided (not NULL and not empty string)
-            # HTS_CODE is NEVER updated from PDF - database is master source of truth
-            def clean_value(value):
-                """Return value if non-empty, otherwise None to prevent overwriting."""
-                if value is None:
-                    return None
-                str_val = str(value).strip()
-                return str_val if str_val else None
-
-            new_mid = clean_value(part_data.get('mid'))
-            new_country = clean_value(part_data.get('country_origin'))
-            new_client = clean_value(part_data.get('client_code'))
-            new_fsc_cert = clean_value(part_data.get('fsc_certified'))
-            new_fsc_code = clean_value(part_data.get('fsc_certificate_code'))
-            new_description = clean_value(part_data.get('description'))
+        The index is dropped by invalidate_hts_index() whenever this instance
+        rewrites the table; the row count / last_updated signature also catches
+        changes made through another connection (e.g. a shared database).
+        """
+        cursor = self.conn.cursor()
+        cursor.execute("SELECT COUNT(*), MAX(last_updated) FROM hts_codes")
+        signature = tuple(cursor.fetchone())
+
+        if self._hts_index is None or self._hts_index.signature != signature:
+            cursor.execute("SELECT hts_code, description FROM hts_codes ORDER BY rowid")
+            self._hts_index = HTSDescriptionIndex(
+                ((row['hts_code'], row['description']) for row in cursor.fetchall()),
+                signature=signature
+            )
+        return self._hts_index
 
-            cursor.execute("""
-                UPDATE parts_master SET
-                    description = COALESCE(?, description),
-                    steel_ratio = COALESCE(?, steel_ratio),
-                    aluminum_ratio = COALESCE(?, aluminum_ratio),
-                    mid = COALESCE(?, mid),
-                    country_origin = COALESCE(?, country_origin),
-                    client_code = COALESCE(?, client_code),
-                    fsc_certified = COALESCE(?, fsc_certified),
-                    fsc_certificate_code = COALESCE(?, fsc_certificate_code),
-                    last_updated = ?
-                WHERE part_number = ?
-            """, (
-                new_description,
-                latest['steel_ratio'] if latest else part_data.get('steel_ratio'),
-                latest['aluminum_ratio'] if latest else part_data.get('aluminum_ratio'),
-                new_mid,
-                new_country,
-                new_client,
-                new_fsc_cert,
-                new_fsc_code,
-                datetime.now().isoformat(),
-                part_number
-            ))
-        else:
-            # Insert new part
-            cursor.execute("""
-                INSERT INTO parts_master (
-                    part_number, description, hts_code, steel_ratio, aluminum_ratio,
-                    mid, country_origin, client_code, fsc_certified, fsc_certificate_code, last_updated
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                part_number,
-                part_data.get('description'),
-                part_data.get('hts_code'),
-                latest['steel_ratio'] if latest else part_data.get('steel_ratio'),
-                latest['aluminum_ratio'] if latest else part_data.get('aluminum_ratio'),
-                part_data.get('mid'),
-                part_data.get('country_origin'),
-                part_data.get('client_code'),
-                part_data.get('fsc_certified'),
-                part_data.get('fsc_certificate_code'),
-                datetime.now().isoformat()
-            ))
+    def invalidate_hts_index(self):
+        """Drop the cached HTS description index (call after changing hts_codes)."""
+        self._hts_index = None
 
     def load_hts_mapping(self, xlsx_path: Path):
         """
@@ -460,6 +579,8 @@ class PartsDatabase:
         Args:
             xlsx_path: Path to mmcite_hts.xlsx file
         """
+        import pandas as pd
+
         try:
             df = pd.read_excel(xlsx_path)
             cursor = self.conn.cursor()
@@ -495,6 +616,8 @@ class PartsDatabase:
         except Exception as e:
             print(f"Error loading HTS mapping: {e}")
             return False
+        finally:
+            self.invalidate_hts_index()
 
     def import_parts_list(self, file_path: Path, update_existing: bool = True) -> Tuple[int, int, List[str]]:
         """
@@ -509,6 +632,8 @@ class PartsDatabase:
         Returns:
             Tuple of (imported_count, updated_count, error_messages)
         """
+        import pandas as pd
+
         # Column name mappings - maps various possible names to our standard fields
         COLUMN_MAPPINGS = {
             'part_number': ['part_number', 'part number', 'partnumber', 'part_no', 'part no', 'partno', 'sku', 'item', 'item_number', 'product_code'],
@@ -533,6 +658,7 @@ class PartsDatabase:
 
         try:
             # Read file based on extension
+            file_path = Path(file_path)
             file_ext = file_path.suffix.lower()
             if file_ext == '.csv':
                 df = pd.read_csv(file_path)
@@ -562,112 +688,217 @@ class PartsDatabase:
                              ", ".join(COLUMN_MAPPINGS['part_number']))
                 return imported, updated, errors
 
-            cursor = self.conn.cursor()
-
-            for idx, row in df.iterrows():
-                try:
-                    part_number = str(row.get('part_number', '')).strip()
-                    if not part_number or part_number == 'nan':
-                        continue
-
-                    # Check if part exists
-                    cursor.execute("SELECT part_number FROM parts_master WHERE part_number = ?", (part_number,))
-                    exists = cursor.fetchone() is not None
-
-                    # Prepare data - support both old and new column formats
-                    hts_code = str(row.get('hts_code', '')) if pd.notna(row.get('hts_code')) else None
-                    country_origin = str(row.get('country_origin', '')) if pd.notna(row.get('country_origin')) else None
-                    steel_ratio = float(row.get('steel_ratio')) if pd.notna(row.get('steel_ratio')) else None
-                    aluminum_ratio = float(row.get('aluminum_ratio')) if pd.notna(row.get('aluminum_ratio')) else None
-                    copper_pct = float(row.get('copper_pct')) if pd.notna(row.get('copper_pct')) else None
-                    wood_pct = float(row.get('wood_pct')) if pd.notna(row.get('wood_pct')) else None
-                    auto_pct = float(row.get('auto_pct')) if pd.notna(row.get('auto_pct')) else None
-                    non_steel_ratio = float(row.get('non_steel_ratio')) if pd.notna(row.get('non_steel_ratio')) else None
-                    qty_unit = str(row.get('qty_unit', 'NO')) if pd.notna(row.get('qty_unit')) else 'NO'
-                    sec301 = str(row.get('sec301_exclusion_tariff', '')) if pd.notna(row.get('sec301_exclusion_tariff')) else None
-                    mid = str(row.get('mid', '')) if pd.notna(row.get('mid')) else None
-                    client_code = str(row.get('client_code', '')) if pd.notna(row.get('client_code')) else None
-                    description = str(row.get('description', '')) if pd.notna(row.get('description')) else None
-
-                    if exists and update_existing:
-                        # Update existing part - only update non-null values
-                        updates = []
-                        params = []
-
-                        if hts_code and hts_code != 'nan':
-                            updates.append("hts_code = ?")
-                            params.append(hts_code)
-                        if country_origin and country_origin != 'nan':
-                            updates.append("country_origin = ?")
-                            params.append(country_origin)
-                        if steel_ratio is not None:
-                            updates.append("steel_ratio = ?")
-                            params.append(steel_ratio)
-                        if aluminum_ratio is not None:
-                            updates.append("aluminum_ratio = ?")
-                            params.append(aluminum_ratio)
-                        if non_steel_ratio is not None:
-                            updates.append("non_steel_ratio = ?")
-                            params.append(non_steel_ratio)
-                        # Note: copper_pct, wood_pct, auto_pct not in TariffMill schema - ignored if present in CSV
-                        if qty_unit and qty_unit != 'nan':
-                            updates.append("qty_unit = ?")
-                            params.append(qty_unit)
-                        if sec301 and sec301 != 'nan':
-                            updates.append("sec301_exclusion_tariff = ?")
-                            params.append(sec301)
-                        if mid and mid != 'nan':
-                            updates.append("mid = ?")
-                            params.append(mid)
-                        if client_code and client_code != 'nan':
-                            updates.append("client_code = ?")
-                            params.append(client_code)
-                        if description and description != 'nan':
-                            updates.append("description = COALESCE(description, ?)")
-                            params.append(description)
-
-                        updates.append("last_updated = ?")
-                        params.append(datetime.now().isoformat())
-
-                        if updates:
-                            params.append(part_number)
-                            cursor.execute(f"UPDATE parts_master SET {', '.join(updates)} WHERE part_number = ?", params)
-                            updated += 1
-
-                    elif not exists:
-                        # Insert new part (TariffMill schema - no copper/wood/auto columns)
-                        cursor.execute("""
-                            INSERT INTO parts_master (part_number, description, hts_code, country_origin,
-                                             steel_ratio, aluminum_ratio, non_steel_ratio,
-                                             qty_unit, sec301_exclusion_tariff, mid, client_code, last_updated)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """, (
-                            part_number,
-                            description if description and description != 'nan' else None,
-                            hts_code if hts_code and hts_code != 'nan' else None,
-                            country_origin if country_origin and country_origin != 'nan' else None,
-                            steel_ratio,
-                            aluminum_ratio,
-                            non_steel_ratio,
-                            qty_unit,
-                            sec301 if sec301 and sec301 != 'nan' else None,
-                            mid if mid and mid != 'nan' else None,
-                            client_code if client_code and client_code != 'nan' else None,
-                            datetime.now().isoformat()
-                        ))
-                        imported += 1
-
-                except Exception as e:
-                    errors.append(f"Row {idx + 1}: {str(e)}")
-                    continue
-
-            self.conn.commit()
+            # Prepare data - support both old and new column formats
+            # (copper_pct, wood_pct, auto_pct are not in the TariffMill schema - ignored if present)
+            parts = pd.DataFrame({'part_number': self._text_column(df['part_number'])})
+            for column in ('hts_code', 'country_origin', 'qty_unit', 'sec301_exclusion_tariff',
+                           'mid', 'client_code', 'description'):
+                parts[column] = self._text_column(df.get(column), len(df))
+            for column in ('steel_ratio', 'aluminum_ratio', 'non_steel_ratio'):
+                parts[column] = None
+                if column in df.columns:
+                    values = pd.to_numeric(df[column], errors='coerce')
+                    invalid = values.isna() & df[column].notna()
+                    for idx in invalid[invalid].index[:20]:
+                        errors.append(f"Row {idx + 1}: invalid {column} value '{df.at[idx, column]}'")
+                    parts[column] = values.astype(object).where(values.notna(), None)
+
+            imported, updated, _ = self.bulk_import_parts(
+                parts,
+                update_existing=update_existing,
+                keep_existing=('description',),
+                insert_defaults={'qty_unit': 'NO'}
+            )
 
         except Exception as e:
             errors.append(f"File error: {str(e)}")
 
         return imported, updated, errors
 
+    def import_mapped_parts(self, df: "pd.DataFrame", custom_fields: List[str] = None,
+                            progress_callback=None, is_cancelled=None) -> Tuple[int, int, int]:
+        """
+        Import a parts sheet whose columns were mapped in the Parts tab import panel.
+
+        Values are normalized column-wise: text is stripped (empty means "keep the
+        current value"), country codes are upper-cased to two letters, ratio
+        columns given as 0-1 fractions are converted to percentages and a
+        quantity unit of NO does not overwrite an existing unit.
+
+        Args:
+            df: DataFrame of strings with columns renamed to parts_master fields
+            custom_fields: Additional parts_master columns mapped by the user
+            progress_callback: Optional callable(current, total) for coarse progress
+            is_cancelled: Optional callable returning True to abandon the import
+
+        Returns:
+            Tuple of (inserted_count, updated_count, skipped_count)
+        """
+        import pandas as pd
+
+        parts = pd.DataFrame({'part_number': self._text_column(df.get('part_number'), len(df))})
+        for column in ('hts_code', 'description', 'mid', 'client_code', 'sec301_exclusion_tariff'):
+            if column in df.columns:
+                parts[column] = self._text_column(df[column])
+        if 'country_origin' in df.columns:
+            parts['country_origin'] = self._text_column(df['country_origin'].astype(str).str.strip().str.upper().str[:2])
+        if 'qty_unit' in df.columns:
+            qty_unit = self._text_column(df['qty_unit'])
+            parts['qty_unit'] = qty_unit.where(qty_unit != 'NO', None)
+        for column in ('steel_ratio', 'aluminum_ratio', 'non_steel_ratio'):
+            if column in df.columns:
+                pct = pd.to_numeric(df[column].astype(str).str.strip(), errors='coerce')
+                # Convert ratio (0-1) to percentage if needed
+                pct = pct.where(~((pct > 0) & (pct <= 1.0)), pct * 100.0).clip(lower=0.0)
+                parts[column] = pct.astype(object).where(pct.notna(), None)
+
+        known_columns = set(self.get_parts_columns())
+        for field_name in custom_fields or []:
+            if field_name in df.columns and field_name in known_columns and field_name not in parts.columns:
+                parts[field_name] = self._text_column(df[field_name])
+
+        return self.bulk_import_parts(
+            parts,
+            insert_defaults={'steel_ratio': 0, 'aluminum_ratio': 0, 'non_steel_ratio': 0,
+                             'qty_unit': 'NO'},
+            progress_callback=progress_callback,
+            is_cancelled=is_cancelled
+        )
+
+    @staticmethod
+    def _text_column(values, length: int = 0) -> "pd.Series":
+        """Strip a column to text; missing, NaN and empty values become None."""
+        import pandas as pd
+
+        if values is None:
+            return pd.Series([None] * length, dtype=object)
+        text = values.astype(str).str.strip()
+        text = text.where(values.notna() & (text != '') & (text.str.lower() != 'nan'), None)
+        return text.astype(object)
+
+    def bulk_import_parts(self, parts: "pd.DataFrame", update_existing: bool = True,
+                          keep_existing: Tuple[str, ...] = (), insert_defaults: Dict = None,
+                          progress_callback=None, is_cancelled=None) -> Tuple[int, int, int]:
+        """
+        Merge normalized part rows into parts_master in one transaction.
+
+        Rows are staged into a temporary table and merged with a single
+        INSERT ... ON CONFLICT DO UPDATE. A None value never overwrites existing
+        data (COALESCE), columns in keep_existing are only filled when currently
+        empty, and insert_defaults apply to newly inserted parts only. When a
+        part number appears more than once, the last non-empty value of each
+        column wins. The import runs on its own connection, so the GUI connection
+        is never inside the import transaction; cancelling leaves the table unchanged.
+
+        Args:
+            parts: DataFrame with a part_number column plus parts_master columns (None = no value)
+            update_existing: If False, parts already in the table are left untouched
+            keep_existing: Columns whose existing non-empty value is kept
+            insert_defaults: Column -> value used for new parts when no value is given
+            progress_callback: Optional callable(current, total) for coarse progress
+            is_cancelled: Optional callable returning True to abandon the import
+
+        Returns:
+            Tuple of (inserted_count, updated_count, skipped_count)
+        """
+        insert_defaults = insert_defaults or {}
+        total = len(parts)
+        report = progress_callback or (lambda current, total: None)
+        cancelled = is_cancelled or (lambda: False)
+
+        parts = parts[parts['part_number'].notna()]
+        skipped = total - len(parts)
+        if parts.empty:
+            report(total, total)
+            return 0, 0, skipped
+        columns = [c for c in parts.columns if c != 'part_number']
+        if len(parts) != parts['part_number'].nunique():
+            parts = parts.groupby('part_number', sort=False).last().reset_index()
+            parts = parts.astype(object).where(parts.notna(), None)
+
+        if str(self.db_path) == ':memory:':
+            conn = self.conn
+        else:
+            conn = sqlite3.connect(str(self.db_path), timeout=30)
+        try:
+            stage_columns = ", ".join(f'"{c}"' for c in columns)
+            conn.execute("DROP TABLE IF EXISTS temp.parts_import_stage")
+            conn.execute(f"""
+                CREATE TEMP TABLE parts_import_stage (
+                    part_number TEXT PRIMARY KEY,
+                    {''.join(f'"{c}", ' for c in columns)}existing INTEGER DEFAULT 0
+                )
+            """)
+            insert_stage = (f"INSERT INTO temp.parts_import_stage (part_number{', ' if columns else ''}{stage_columns}) "
+                            f"VALUES ({', '.join('?' * (len(columns) + 1))})")
+
+            # Stage rows in chunks so progress can be reported and cancelled
+            chunk_size = 20000
+            rows = parts[['part_number'] + columns].itertuples(index=False, name=None)
+            staged = 0
+            while staged < len(parts):
+                if cancelled():
+                    conn.rollback()
+                    return 0, 0, skipped
+                chunk = [row for _, row in zip(range(chunk_size), rows)]
+                conn.executemany(insert_stage, chunk)
+                staged += len(chunk)
+                report(skipped + staged, total + 1)
+
+            conn.execute("""
+                UPDATE temp.parts_import_stage SET existing = 1
+                WHERE part_number IN (SELECT part_number FROM main.parts_master)
+            """)
+            if not update_existing:
+                conn.execute("DELETE FROM temp.parts_import_stage WHERE existing = 1")
+            existing = conn.execute(
+                "SELECT COUNT(*) FROM temp.parts_import_stage WHERE existing = 1").fetchone()[0]
+            merging = conn.execute("SELECT COUNT(*) FROM temp.parts_import_stage").fetchone()[0]
+            if cancelled():
+                conn.rollback()
+                return 0, 0, skipped
+
+            select_values = ["part_number"]
+            updates = []
+            for column in columns:
+                if column in insert_defaults:
+                    select_values.append(
+                        f'CASE WHEN existing THEN "{column}" ELSE COALESCE("{column}", ?) END')
+                else:
+                    select_values.append(f'"{column}"')
+                if column in keep_existing:
+                    updates.append(f'"{column}" = COALESCE(parts_master."{column}", excluded."{column}")')
+                else:
+                    updates.append(f'"{column}" = COALESCE(excluded."{column}", parts_master."{column}")')
+            # New parts get defaults for columns the file did not provide at all
+            default_only = [c for c in insert_defaults if c not in columns]
+            select_values.extend("CASE WHEN existing THEN NULL ELSE ? END" for _ in default_only)
+            updates.extend(f'"{c}" = parts_master."{c}"' for c in default_only)
+            select_values.append("?")
+            updates.append("last_updated = excluded.last_updated")
+
+            insert_columns = ["part_number"] + columns + default_only + ["last_updated"]
+            params = [insert_defaults[c] for c in columns if c in insert_defaults]
+            params += [insert_defaults[c] for c in default_only]
+            params.append(datetime.now().isoformat())
+            conn.execute(f"""
+                INSERT INTO main.parts_master ({', '.join(f'"{c}"' for c in insert_columns)})
+                SELECT {', '.join(select_values)}
+                FROM temp.parts_import_stage WHERE true
+                ON CONFLICT(part_number) DO UPDATE SET {', '.join(updates)}
+            """, params)
+            conn.execute("DROP TABLE temp.parts_import_stage")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            if conn is not self.conn:
+                conn.close()
+
+        report(total + 1, total + 1)
+        return merging - existing, existing, skipped
+
     def find_hts_code(self, part_number: str, description: str = "") -> Optional[str]:
         """
         Find HTS code for a part using fuzzy matching on description keywords.
@@ -774,6 +1005,8 @@ class PartsDatabase:
             output_path: Path for output CSV file
             include_history: If True, export part_occurrences; if False, export parts summary
         """
+        import pandas as pd
+
         cursor = self.conn.cursor()
 
         if include_history:
@@ -843,13 +1076,126 @@ class PartsDatabase:
         }
 
     def search_parts(self, search_term: str) -> List[Dict]:
-        """Search parts by part number or description."""
+        """Search parts by part number or description, best matches first."""
+        where_sql, params = self._parts_filter_clause("all", search_term)
+        join_sql, join_params, order_sql, order_params = self._parts_search_ranking(search_term)
         cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT * FROM parts_master
-            WHERE part_number LIKE ? OR description LIKE ?
-            ORDER BY part_number
-        """, (f'%{search_term}%', f'%{search_term}%'))
+        cursor.execute(f"SELECT parts_master.* FROM parts_master {join_sql} {where_sql} {order_sql}",
+                       join_params + params + order_params)
+        return [dict(row) for row in cursor.fetchall()]
+
+    def _parts_search_ranking(self, search_term: str):
+        """
+        Build the relevance ordering for a parts search.
+
+        An exact part number comes first, then part numbers starting with the
+        term, then the best full-text (bm25) word matches, then part number.
+
+        Returns:
+            Tuple of (join_sql, join_params, order_sql, order_params)
+        """
+        join_sql = ""
+        join_params = []
+        score_sql = ""
+        words = prefix_query(search_term) if self._parts_words else ""
+        if words:
+            join_sql = ("LEFT JOIN (SELECT rowid AS word_rowid, bm25(parts_master_words, 10.0, 1.0) AS score "
+                        "FROM parts_master_words WHERE parts_master_words MATCH ?) AS words "
+                        "ON words.word_rowid = parts_master.rowid")
+            join_params = [words]
+            score_sql = "COALESCE(words.score, 0), "
+        order_sql = (f"ORDER BY (part_number = ? COLLATE NOCASE) DESC, (part_number LIKE ?) DESC, "
+                     f"{score_sql}part_number")
+        return join_sql, join_params, order_sql, [search_term, f'{search_term}%']
+
+    def _parts_filter_clause(self, filter_type: str = "all", search_term: str = ""):
+        """
+        Build the WHERE clause shared by count_parts and get_parts_page.
+
+        Args:
+            filter_type: "all", "with_hts" or "no_hts"
+            search_term: Substring of the part number or description (optional)
+
+        Returns:
+            Tuple of (where_sql, params); where_sql is empty when nothing is filtered
+        """
+        conditions = []
+        params = []
+        if search_term:
+            # Trigram candidates (terms of 3+ characters without LIKE wildcards),
+            # always confirmed by the LIKE test so results match a plain scan
+            if self._parts_trigram and len(search_term) >= 3 and not any(c in search_term for c in '%_'):
+                conditions.append("parts_master.rowid IN "
+                                  "(SELECT rowid FROM parts_master_trigram WHERE parts_master_trigram MATCH ?)")
+                params.append(quote_phrase(search_term))
+            conditions.append("(part_number LIKE ? OR description LIKE ?)")
+            params.extend([f'%{search_term}%', f'%{search_term}%'])
+        if filter_type == "with_hts":
+            conditions.append("(hts_code IS NOT NULL AND hts_code <> '')")
+        elif filter_type == "no_hts":
+            conditions.append("(hts_code IS NULL OR hts_code = '')")
+        where_sql = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        return where_sql, params
+
+    def get_parts_columns(self) -> List[str]:
+        """Column names of the parts_master table."""
+        cursor = self.conn.cursor()
+        cursor.execute("PRAGMA table_info(parts_master)")
+        return [row[1] for row in cursor.fetchall()]
+
+    def count_parts(self, filter_type: str = "all", search_term: str = "") -> int:
+        """
+        Count parts matching a filter and search term.
+
+        Args:
+            filter_type: "all", "with_hts" or "no_hts"
+            search_term: Substring of the part number or description (optional)
+
+        Returns:
+            Number of matching parts_master rows
+        """
+        where_sql, params = self._parts_filter_clause(filter_type, search_term)
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT COUNT(*) FROM parts_master {where_sql}", params)
+        return cursor.fetchone()[0]
+
+    def get_parts_page(self, filter_type: str = "all", search_term: str = "",
+                       sort_column: str = None, descending: bool = False,
+                       limit: int = 500, offset: int = 0) -> List[Dict]:
+        """
+        Get one page of parts matching a filter and search term.
+
+        Without a sort column the order matches get_all_parts (most recently
+        updated first) or search_parts (best matches first) respectively.
+
+        Args:
+            filter_type: "all", "with_hts" or "no_hts"
+            search_term: Substring of the part number or description (optional)
+            sort_column: parts_master column to sort by (optional)
+            descending: Sort descending instead of ascending
+            limit: Maximum number of rows to return
+            offset: Number of matching rows to skip
+
+        Returns:
+            List of part dicts
+        """
+        where_sql, params = self._parts_filter_clause(filter_type, search_term)
+        join_sql, join_params, order_params = "", [], []
+
+        if sort_column:
+            if sort_column not in self.get_parts_columns():
+                raise ValueError(f"Unknown parts column: {sort_column}")
+            direction = "DESC" if descending else "ASC"
+            # part_number keeps the order of equal values stable between pages
+            order_sql = f"ORDER BY {sort_column} {direction}, part_number {direction}"
+        elif search_term:
+            join_sql, join_params, order_sql, order_params = self._parts_search_ranking(search_term)
+        else:
+            order_sql = "ORDER BY last_updated DESC, part_number"
+
+        cursor = self.conn.cursor()
+        cursor.execute(f"SELECT parts_master.* FROM parts_master {join_sql} {where_sql} {order_sql} LIMIT ? OFFSET ?",
+                       join_params + params + order_params + [limit, offset])
         return [dict(row) for row in cursor.fetchall()]
 
     def update_part_description(self, part_number: str, description: str):
@@ -1140,6 +1486,7 @@ class PartsDatabase:
             VALUES (?, ?, ?, ?, ?, ?)
         """, (company_name, country, mid if mid else None, notes, now, now))
         self.conn.commit()
+        self.invalidate_name_index('manufacturers')
         return cursor.lastrowid
 
     def update_manufacturer(self, id: int, company_name: str, country: str = "", mid: str = "", notes: str = ""):
@@ -1151,12 +1498,14 @@ class PartsDatabase:
             WHERE id = ?
         """, (company_name, country, mid if mid else None, notes, datetime.now().isoformat(), id))
         self.conn.commit()
+        self.invalidate_name_index('manufacturers')
 
     def delete_manufacturer(self, id: int):
         """Delete a manufacturer by ID."""
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM manufacturers WHERE id = ?", (id,))
         self.conn.commit()
+        self.invalidate_name_index('manufacturers')
 
     def get_all_manufacturers(self) -> List[Dict]:
         """Get all manufacturers."""
@@ -1264,6 +1613,7 @@ class PartsDatabase:
                 imported += 1
 
         self.conn.commit()
+        self.invalidate_name_index('manufacturers')
         return (imported, updated)
 
     def get_manufacturer_by_name(self, company_name: str) -> Optional[Dict]:
@@ -1274,41 +1624,35 @@ class PartsDatabase:
         """
         if not company_name:
             return None
+        return self._get_name_index('manufacturers').lookup(company_name)
 
-        # Normalize accented characters (é -> e, etc.)
-        import unicodedata
-        def normalize(s):
-            return ''.join(
-                c for c in unicodedata.normalize('NFD', s)
-                if unicodedata.category(c) != 'Mn'
-            ).lower()
-
-        normalized_search = normalize(company_name)
-
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM manufacturers")
-
-        candidates = []
-        for row in cursor.fetchall():
-            db_name = row['company_name'] or ''
-            normalized_db = normalize(db_name)
-
-            # Exact match - highest priority
-            if normalized_db == normalized_search:
-                return dict(row)
-
-            # Check if either contains the other
-            if normalized_search in normalized_db or normalized_db in normalized_search:
-                # Score by how close the lengths are (prefer closer matches)
-                score = min(len(normalized_search), len(normalized_db)) / max(len(normalized_search), len(normalized_db))
-                candidates.append((score, row))
-
-        # Return best scoring candidate
-        if candidates:
-            candidates.sort(key=lambda x: x[0], reverse=True)
-            return dict(candidates[0][1])
+    def _get_name_index(self, table: str) -> NameIndex:
+        """
+        Get the cached name index for manufacturers or mid_table.
 
-        return None
+        The index is dropped by invalidate_name_index() whenever this instance
+        changes the table; the row count / modified_date signature also catches
+        changes made through another connection (e.g. a shared database).
+        """
+        name_key = 'company_name' if table == 'manufacturers' else 'manufacturer_name'
+        with self._lock:
+            cursor = self.conn.cursor()
+            cursor.execute(f"SELECT COUNT(*), MAX(modified_date) FROM {table}")
+            signature = tuple(cursor.fetchone())
+
+            index = self._name_indexes.get(table)
+            if index is None or index.signature != signature:
+                cursor.execute(f"SELECT * FROM {table} ORDER BY rowid")
+                index = NameIndex((dict(row) for row in cursor.fetchall()), name_key, signature=signature)
+                self._name_indexes[table] = index
+            return index
+
+    def invalidate_name_index(self, table: str = None):
+        """Drop the cached name index for a table (or all tables) after it changed."""
+        if table is None:
+            self._name_indexes.clear()
+        else:
+            self._name_indexes.pop(table, None)
 
     # ========== MID Table Methods (TariffMill-compatible) ==========
 
@@ -1339,39 +1683,7 @@ class PartsDatabase:
         """
         if not manufacturer_name:
             return None
-
-        import unicodedata
-        def normalize(s):
-            return ''.join(
-                c for c in unicodedata.normalize('NFD', s)
-                if unicodedata.category(c) != 'Mn'
-            ).lower()
-
-        normalized_search = normalize(manufacturer_name)
-
-        cursor = self.conn.cursor()
-        cursor.execute("SELECT * FROM mid_table")
-
-        candidates = []
-        for row in cursor.fetchall():
-            db_name = row['manufacturer_name'] or ''
-            normalized_db = normalize(db_name)
-
-            # Exact match - highest priority
-            if normalized_db == normalized_search:
-                return dict(row)
-
-            # Check if either contains the other
-            if normalized_search in normalized_db or normalized_db in normalized_search:
-                score = min(len(normalized_search), len(normalized_db)) / max(len(normalized_search), len(normalized_db)) if normalized_db else 0
-                candidates.append((score, row))
-
-        # Return best scoring candidate
-        if candidates:
-            candidates.sort(key=lambda x: x[0], reverse=True)
-            return dict(candidates[0][1])
-
-        return None
+        return self._get_name_index('mid_table').lookup(manufacturer_name)
 
     def add_mid(self, mid: str, manufacturer_name: str = "", customer_id: str = "",
                 related_parties: str = "N") -> bool:
@@ -1387,6 +1699,7 @@ class PartsDatabase:
                 VALUES (?, ?, ?, ?, ?, ?)
             """, (mid, manufacturer_name, customer_id, related_parties, now, now))
             self.conn.commit()
+            self.invalidate_name_index('mid_table')
             return True
         except Exception:
             return False
@@ -1402,6 +1715,7 @@ class PartsDatabase:
                 WHERE mid = ?
             """, (manufacturer_name, customer_id, related_parties, datetime.now().isoformat(), mid))
             self.conn.commit()
+            self.invalidate_name_index('mid_table')
             return cursor.rowcount > 0
         except Exception:
             return False
@@ -1412,6 +1726,7 @@ class PartsDatabase:
             cursor = self.conn.cursor()
             cursor.execute("DELETE FROM mid_table WHERE mid = ?", (mid,))
             self.conn.commit()
+            self.invalidate_name_index('mid_table')
             return cursor.rowcount > 0
         except Exception:
             return False
@@ -1421,6 +1736,7 @@ class PartsDatabase:
         cursor = self.conn.cursor()
         cursor.execute("DELETE FROM mid_table")
         self.conn.commit()
+        self.invalidate_name_index('mid_table')
         return cursor.rowcount
 
     def save_mids_batch(self, mids: List[Dict]) -> int:
@@ -1429,63 +1745,77 @@ class PartsDatabase:
         Each dict should have: mid, manufacturer_name, customer_id, related_parties
         Returns the number of records saved.
         """
-        cursor = self.conn.cursor()
-        cursor.execute("DELETE FROM mid_table")
-
-        saved = 0
         now = datetime.now().isoformat()
+        rows = []
         for entry in mids:
             mid = entry.get('mid', '').strip()
             if not mid:
                 continue
-            cursor.execute("""
-                INSERT OR REPLACE INTO mid_table
-                (mid, manufacturer_name, customer_id, related_parties, created_date, modified_date)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (
+            rows.append((
                 mid,
                 entry.get('manufacturer_name', '').strip(),
                 entry.get('customer_id', '').strip(),
                 entry.get('related_parties', 'N').strip().upper(),
                 now, now
             ))
-            saved += 1
+
+        cursor = self.conn.cursor()
+        cursor.execute("DELETE FROM mid_table")
+        cursor.executemany("""
+            INSERT OR REPLACE INTO mid_table
+            (mid, manufacturer_name, customer_id, related_parties, created_date, modified_date)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
 
         self.conn.commit()
-        return saved
+        self.invalidate_name_index('mid_table')
+        return len(rows)
 
     def search_mids(self, customer_filter: str = "", mid_filter: str = "",
-                    manufacturer_filter: str = "") -> List[Dict]:
-        """Search MIDs with optional filters for customer ID, MID, and manufacturer."""
-        cursor = self.conn.cursor()
-        cursor.execute("""
-            SELECT manufacturer_name, mid, customer_id, related_parties
-            FROM mid_table
-            ORDER BY manufacturer_name, mid
-        """)
+                    manufacturer_filter: str = "", limit: int = None) -> List[Dict]:
+        """
+        Search MIDs with optional filters for customer ID, MID, and manufacturer.
 
-        results = []
-        customer_filter = customer_filter.upper()
-        mid_filter = mid_filter.upper()
-        manufacturer_filter = manufacturer_filter.upper()
+        Each filter is a case-insensitive substring match; all given filters must
+        match. Filters of three or more characters are answered from the
+        mid_table_fts trigram index, shorter ones by a table scan.
 
-        for row in cursor.fetchall():
-            row_dict = dict(row)
-            manufacturer = (row_dict.get('manufacturer_name') or '').upper()
-            mid = (row_dict.get('mid') or '').upper()
-            customer_id = (row_dict.get('customer_id') or '').upper()
+        Args:
+            customer_filter: Substring of the customer ID
+            mid_filter: Substring of the MID
+            manufacturer_filter: Substring of the manufacturer name
+            limit: Maximum number of results (None for all)
 
-            # Apply filters
-            if customer_filter and customer_filter not in customer_id:
-                continue
-            if mid_filter and mid_filter not in mid:
-                continue
-            if manufacturer_filter and manufacturer_filter not in manufacturer:
-                continue
+        Returns:
+            Matching MID entries ordered by manufacturer name and MID
+        """
+        filters = [('customer_id', customer_filter or ''), ('mid', mid_filter or ''),
+                   ('manufacturer_name', manufacturer_filter or '')]
+        conditions = []
+        params = []
 
-            results.append(row_dict)
+        # Trigram candidates; the conditions below re-check every row with
+        # Python's upper() so non-ASCII text matches like it always has
+        fts_terms = [f"{column} : {quote_phrase(term)}" for column, term in filters if len(term) >= 3]
+        if self._mid_fts and fts_terms:
+            conditions.append("rowid IN (SELECT rowid FROM mid_table_fts WHERE mid_table_fts MATCH ?)")
+            params.append(" AND ".join(fts_terms))
+        for column, term in filters:
+            if term:
+                conditions.append(f"instr(py_upper(COALESCE({column}, '')), ?) > 0")
+                params.append(term.upper())
+
+        query = "SELECT manufacturer_name, mid, customer_id, related_parties FROM mid_table"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY manufacturer_name, mid"
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
 
-        return results
+        cursor = self.conn.cursor()
+        cursor.execute(query, params)
+        return [dict(row) for row in cursor.fetchall()]
 
     def import_mids_from_file(self, file_path: str, append_mode: bool = True) -> Tuple[int, int]:
         """
@@ -1530,45 +1860,46 @@ class PartsDatabase:
         if 'mid' not in df.columns:
             raise ValueError("File must contain a 'MID' column.")
 
-        # Get existing MIDs if in append mode
-        existing_mids = set()
-        if append_mode:
-            for entry in self.get_all_mids():
-                existing_mids.add(entry.get('mid', '').strip().upper())
-        else:
-            self.clear_all_mids()
+        def text_column(name: str, default: str = '') -> pd.Series:
+            if name not in df.columns:
+                return pd.Series(default, index=df.index, dtype=object)
+            return df[name].astype(str).str.strip()
+
+        related_parties = text_column('related_parties', 'N').str.upper()
+        entries = pd.DataFrame({
+            'mid': text_column('mid'),
+            'manufacturer_name': text_column('manufacturer_name'),
+            'customer_id': text_column('customer_id'),
+            'related_parties': related_parties.where(related_parties.isin(['Y', 'N']), 'N'),
+        })
+        entries = entries[entries['mid'] != '']
 
-        imported = 0
-        skipped = 0
-        now = datetime.now().isoformat()
         cursor = self.conn.cursor()
 
-        for _, row in df.iterrows():
-            mid = str(row.get('mid', '')).strip()
-            if not mid:
-                continue
-
-            # Skip duplicates in append mode
-            if mid.upper() in existing_mids:
-                skipped += 1
-                continue
+        # Skip MIDs already in the table (append mode) and repeats within the file
+        existing_mids = set()
+        if append_mode:
+            cursor.execute("SELECT mid FROM mid_table")
+            existing_mids = {(row[0] or '').strip().upper() for row in cursor.fetchall()}
+        mid_keys = entries['mid'].str.upper()
+        keep = ~mid_keys.duplicated() & ~mid_keys.isin(existing_mids)
+        skipped = int((~keep).sum())
+        entries = entries[keep]
 
-            manufacturer_name = str(row.get('manufacturer_name', '')).strip()
-            customer_id = str(row.get('customer_id', '')).strip()
-            related_parties = str(row.get('related_parties', 'N')).strip().upper()
-            if related_parties not in ('Y', 'N'):
-                related_parties = 'N'
+        now = datetime.now().isoformat()
+        entries = entries.assign(created_date=now, modified_date=now)
 
-            cursor.execute("""
-                INSERT OR REPLACE INTO mid_table
-                (mid, manufacturer_name, customer_id, related_parties, created_date, modified_date)
-                VALUES (?, ?, ?, ?, ?, ?)
-            """, (mid, manufacturer_name, customer_id, related_parties, now, now))
-            imported += 1
-            existing_mids.add(mid.upper())
+        if not append_mode:
+            cursor.execute("DELETE FROM mid_table")
+        cursor.executemany("""
+            INSERT OR REPLACE INTO mid_table
+            (mid, manufacturer_name, customer_id, related_parties, created_date, modified_date)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, entries.itertuples(index=False, name=None))
 
         self.conn.commit()
-        return (imported, skipped)
+        self.invalidate_name_index('mid_table')
+        return (len(entries), skipped)
 
     def export_mids_to_excel(self, file_path: str) -> int:
         """
@@ -1739,18 +2070,45 @@ class PartsDatabase:
     # ========== Usage Statistics Methods ==========
 
     def track_event(self, event_type: str, event_data: str, user_name: str = None) -> None:
-        """Track a usage event."""
+        """
+        Track a usage event.
+
+        The event is queued for the background EventWriter and written in a batch
+        later; call flush_events() before reading usage_statistics directly.
+        """
         from datetime import datetime
-        self.conn.execute(
-            """INSERT INTO usage_statistics (event_type, event_data, user_name, timestamp)
-               VALUES (?, ?, ?, ?)""",
-            (event_type, event_data, user_name, datetime.now().isoformat())
-        )
-        self.conn.commit()
+        event = (event_type, event_data, user_name, datetime.now().isoformat())
+        if str(self.db_path) == ':memory:':
+            # A second connection would open a different in-memory database
+            self.conn.execute(INSERT_EVENT_SQL, event)
+            self.conn.commit()
+            return
+        with self._lock:
+            if self._event_writer is None:
+                self._event_writer = EventWriter(self.db_path)
+            writer = self._event_writer
+        writer.submit(event)
+
+    def flush_events(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until all tracked events and stage metrics have been written.
+
+        Args:
+            timeout: Maximum seconds to wait
+
+        Returns:
+            True if no events are left pending
+        """
+        flushed = True
+        for writer in (self._event_writer, self._metrics_writer):
+            if writer is not None:
+                flushed = writer.flush(timeout) and flushed
+        return flushed
 
     def get_usage_statistics(self, event_type: str = None, days: int = 30) -> List[Dict]:
         """Get usage statistics with optional filtering."""
         from datetime import datetime, timedelta
+        self.flush_events()
         cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
 
         query = "SELECT * FROM usage_statistics WHERE timestamp >= ?"
@@ -1765,19 +2123,92 @@ class PartsDatabase:
         return [dict(row) for row in cursor.fetchall()]
 
     def get_event_counts(self, days: int = 30) -> Dict[str, int]:
-        """Get counts by event type for the specified period."""
+        """Get counts by event type for the specified period (whole days, from the daily rollups)."""
         from datetime import datetime, timedelta
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
+        self.flush_events()
+        cutoff_day = (datetime.now() - timedelta(days=days)).date().isoformat()
 
         cursor = self.conn.execute(
-            """SELECT event_type, COUNT(*) as count
-               FROM usage_statistics
-               WHERE timestamp >= ?
+            """SELECT event_type, SUM(event_count) as count
+               FROM usage_daily_rollup
+               WHERE day >= ?
                GROUP BY event_type""",
-            (cutoff_date,)
+            (cutoff_day,)
         )
         return {row['event_type']: row['count'] for row in cursor.fetchall()}
 
+    # ========== Stage Metrics Methods ==========
+
+    def record_stage_metrics(self, file_name: str, spans: List[Tuple[str, Optional[str], float]]) -> None:
+        """
+        Record the processing stage timings of one PDF.
+
+        Like track_event, the rows are queued for a background EventWriter so
+        timing a PDF never adds a commit to the processing path; call
+        flush_events() before reading stage_metrics directly.
+
+        Args:
+            file_name: Name of the processed PDF
+            spans: (stage, template name, seconds) tuples
+        """
+        from datetime import datetime
+        if not spans:
+            return
+        now = datetime.now().isoformat()
+        rows = [(now, file_name, stage, template_name, seconds * 1000.0)
+                for stage, template_name, seconds in spans]
+        if str(self.db_path) == ':memory:':
+            # A second connection would open a different in-memory database
+            self.conn.executemany(INSERT_STAGE_METRIC_SQL, rows)
+            self.conn.commit()
+            return
+        with self._lock:
+            if self._metrics_writer is None:
+                self._metrics_writer = EventWriter(self.db_path, insert_sql=INSERT_STAGE_METRIC_SQL,
+                                                   label="stage metric")
+            writer = self._metrics_writer
+        for row in rows:
+            writer.submit(row)
+
+    def get_stage_percentiles(self, days: int = 30, by_template: bool = False) -> List[Dict]:
+        """
+        Median and 95th percentile duration of each processing stage.
+
+        Percentiles use the nearest-rank method and are computed in SQLite
+        with window functions, so only one row per group is returned.
+
+        Args:
+            days: Only include PDFs processed in the last N days
+            by_template: Group by (stage, template name) instead of stage
+
+        Returns:
+            List of dicts with stage, template_name (None unless by_template),
+            samples, p50_ms, p95_ms and total_ms
+        """
+        from datetime import datetime, timedelta
+        self.flush_events()
+        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        group = "stage, template_name" if by_template else "stage"
+        template_sql = "template_name" if by_template else "NULL"
+        cursor = self.conn.execute(
+            f"""WITH ranked AS (
+                    SELECT stage, {template_sql} AS template_name, duration_ms,
+                           ROW_NUMBER() OVER (PARTITION BY {group} ORDER BY duration_ms) AS rank,
+                           COUNT(*) OVER (PARTITION BY {group}) AS samples
+                    FROM stage_metrics
+                    WHERE recorded_at >= ?
+                )
+                SELECT stage, template_name, samples,
+                       MAX(CASE WHEN rank = (samples * 50 + 99) / 100 THEN duration_ms END) AS p50_ms,
+                       MAX(CASE WHEN rank = (samples * 95 + 99) / 100 THEN duration_ms END) AS p95_ms,
+                       SUM(duration_ms) AS total_ms
+                FROM ranked
+                GROUP BY stage, template_name
+                ORDER BY total_ms DESC""",
+            (cutoff,)
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
     # ========== Export Audit Log Methods ==========
 
     def log_export_event(self, event_type: str, file_number: str, user_name: str,
@@ -1816,7 +2247,13 @@ class PartsDatabase:
         return [dict(row) for row in cursor.fetchall()]
 
     def close(self):
-        """Close database connection."""
+        """Write pending usage events and stage metrics and close the database connection."""
+        if self._event_writer is not None:
+            self._event_writer.close()
+            self._event_writer = None
+        if self._metrics_writer is not None:
+            self._metrics_writer.close()
+            self._metrics_writer = None
         if self.conn:
             self.conn.close()
 
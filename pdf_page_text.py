@@ -0,0 +1,87 @@
+"""
+PDF Page Text Cache for OCRMill
+Extracts the text of each PDF page once and shares it across processing stages.
+
+pdfplumber layout analysis is the most expensive part of processing a PDF, so the
+template scoring, Bill of Lading scan and multi-invoice splitting stages all read
+page text from a single PDFPageText object instead of calling extract_text() again.
+"""
+
+import time
+from typing import Iterator, List, Optional
+
+
+class PDFPageText:
+    """
+    Lazily extracted, cached page text for one open pdfplumber document.
+
+    Each page's text is extracted on first access and kept for the lifetime of
+    the object. Pages without text are cached as an empty string.
+    """
+
+    def __init__(self, pdf):
+        """
+        Args:
+            pdf: An open pdfplumber PDF object (None when built by from_texts)
+        """
+        self._pages = pdf.pages if pdf is not None else []
+        self._texts: List[Optional[str]] = [None] * len(self._pages)
+        self._full_text: Optional[str] = None
+
+        # Extraction statistics (used for stage timing logs)
+        self.pages_extracted = 0
+        self.extraction_seconds = 0.0
+
+    @classmethod
+    def from_texts(cls, texts: List[str]) -> "PDFPageText":
+        """Create an instance from already extracted page texts (e.g. from a cache)."""
+        page_text = cls(None)
+        page_text._texts = [text or "" for text in texts]
+        return page_text
+
+    def __len__(self) -> int:
+        return len(self._texts)
+
+    def page_text(self, index: int) -> str:
+        """Get the text of a single page, extracting it on first access."""
+        text = self._texts[index]
+        if text is None:
+            start = time.perf_counter()
+            text = self._pages[index].extract_text() or ""
+            self.extraction_seconds += time.perf_counter() - start
+            self.pages_extracted += 1
+            self._texts[index] = text
+        return text
+
+    def iter_pages(self) -> Iterator[str]:
+        """Iterate over the text of every page in document order."""
+        for index in range(len(self._texts)):
+            yield self.page_text(index)
+
+    def stream_pages(self) -> Iterator[str]:
+        """
+        Iterate over page texts without keeping them.
+
+        Each page's text is dropped and its pdfplumber layout cache released
+        once the next page is requested, so memory stays flat for very large
+        documents. Pages already extracted (e.g. for template detection) are
+        served from the cache before being dropped.
+        """
+        self._full_text = None
+        for index in range(len(self._texts)):
+            text = self.page_text(index)
+            self._texts[index] = None
+            yield text
+            if index < len(self._pages):
+                self._pages[index].close()
+
+    def texts(self) -> List[str]:
+        """Text of every page in document order."""
+        return list(self.iter_pages())
+
+    @property
+    def full_text(self) -> str:
+        """Text of all non-empty pages, each followed by a newline."""
+        if self._full_text is None:
+            self._full_text = "".join(text + "\n" for text in self.iter_pages() if text)
+        return self._full_text
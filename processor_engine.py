@@ -0,0 +1,692 @@
+"""
+Processor Engine for OCRMill
+Template-based PDF invoice extraction, CSV output and parts database updates.
+
+Kept free of any Qt imports so it can run in worker processes and headless tools.
+"""
+
+import re
+import csv
+import time
+import hashlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+import pdfplumber
+
+from config_manager import ConfigManager
+from parts_database import PartsDatabase
+from templates import get_all_templates, LazyTemplate
+from templates.bill_of_lading import BillOfLadingTemplate
+from pdf_page_text import PDFPageText
+from extraction_cache import ExtractionCache, DEFAULT_CACHE_DIR, file_digest
+
+
+class ProcessorEngine:
+    """Core processing engine using templates."""
+
+    # Number of supplier fingerprints remembered by get_best_template
+    TEMPLATE_CACHE_SIZE = 256
+
+    def __init__(self, config: ConfigManager, db: PartsDatabase, log_callback=None):
+        self.config = config
+        self.log_callback = log_callback or print
+        self.templates = {}
+        self.parts_db = db
+        self.last_stage_timings = {}  # stage name -> seconds, for the last processed PDF
+        self.last_template_used = None  # template name used for the last processed PDF
+        self.last_template_timings = {}  # template name -> seconds spent scoring it, for the last processed PDF
+        self.result_cache = self._create_result_cache()
+        self._load_templates()
+
+    def _load_templates(self):
+        """Load all available templates."""
+        self.templates = get_all_templates()
+        self._template_cache = OrderedDict()  # supplier fingerprint -> last winning template name
+
+    def _create_result_cache(self):
+        """Create the on-disk extraction cache if it is enabled in the config."""
+        if not self.config.extraction_cache_enabled:
+            return None
+        try:
+            return ExtractionCache(DEFAULT_CACHE_DIR, max_bytes=self.config.extraction_cache_mb * 1024 * 1024)
+        except OSError as e:
+            self.log(f"Extraction cache disabled: {e}")
+            return None
+
+    def log(self, message: str):
+        """Log a message."""
+        self.log_callback(message)
+
+    @contextmanager
+    def _timed_stage(self, stage: str):
+        """Accumulate the wall time of a processing stage into last_stage_timings."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.last_stage_timings[stage] = self.last_stage_timings.get(stage, 0.0) + elapsed
+
+    def _log_stage_timings(self, page_text: PDFPageText):
+        """Log per-stage timings for the last processed PDF."""
+        stages = ", ".join(f"{stage} {seconds * 1000:.0f}ms"
+                           for stage, seconds in self.last_stage_timings.items())
+        self.log(f"  Timings: {stages} ({page_text.pages_extracted}/{len(page_text)} pages extracted once, "
+                 f"{page_text.extraction_seconds * 1000:.0f}ms in extract_text)")
+
+    def stage_spans(self):
+        """
+        Timing spans for the last processed PDF.
+
+        Returns:
+            List of (stage, template_name, seconds). Stage spans carry the template
+            used for the PDF; each template scored gets a "template_score" span.
+        """
+        spans = [(stage, self.last_template_used, seconds)
+                 for stage, seconds in self.last_stage_timings.items()]
+        spans.extend(("template_score", name, seconds)
+                     for name, seconds in self.last_template_timings.items())
+        return spans
+
+    def record_stage_metrics(self, file_name: str):
+        """Persist the timing spans of the last processed PDF to the stage_metrics table."""
+        spans = self.stage_spans()
+        if self.parts_db is None or not spans:
+            return
+        try:
+            self.parts_db.record_stage_metrics(file_name, spans)
+        except Exception as e:
+            self.log(f"  Could not record stage timings: {e}")
+
+    def get_best_template(self, text: str):
+        """
+        Find the best template for the given text.
+
+        Selection is staged so expensive get_confidence_score() calls are avoided
+        without changing the result: templates whose fingerprint keywords are
+        missing are skipped, and the rest are scored highest possible score first,
+        starting with the template that last won for the same supplier fingerprint.
+        Templates that cannot beat the best score found so far are not scored.
+        As before, the highest score wins and ties go to the earlier template.
+        Templates are only instantiated when they are scored.
+        """
+        best_template = None
+        best_score = 0.0
+        best_order = None
+        best_name = None
+
+        self.log(f"  Evaluating {len(self.templates)} templates...")
+
+        text_lower = text.lower()
+        fingerprint = self._supplier_fingerprint(text_lower)
+        cached_name = self._template_cache.get(fingerprint)
+
+        candidates = []
+        for order, (name, template) in enumerate(self.templates.items()):
+            if not self.config.get_template_enabled(name):
+                self.log(f"    - {name}: Disabled in config")
+                continue
+            if not template.enabled:
+                self.log(f"    - {name}: Disabled in template")
+                continue
+            if not template.matches_fingerprint(text_lower):
+                self.log(f"    - {name}: Skipped (no fingerprint keywords)")
+                continue
+            candidates.append((order, name, template))
+
+        candidates.sort(key=lambda c: (c[1] != cached_name, -c[2].max_confidence_score, c[0]))
+
+        for order, name, template in candidates:
+            max_score = template.max_confidence_score
+            if max_score < best_score or (max_score == best_score and (best_order is None or order > best_order)):
+                self.log(f"    - {name}: Skipped (max score {max_score:.2f} cannot beat {best_score:.2f})")
+                continue
+
+            start = time.perf_counter()
+            score = template.get_confidence_score(text)
+            elapsed = time.perf_counter() - start
+            self.last_template_timings[template.name] = self.last_template_timings.get(template.name, 0.0) + elapsed
+            self.log(f"    - {name}: Confidence score {score:.2f}")
+
+            if score > best_score or (score == best_score and score > 0 and order < best_order):
+                best_score = score
+                best_template = template
+                best_order = order
+                best_name = name
+
+        if isinstance(best_template, LazyTemplate):
+            best_template = best_template.instance
+
+        if best_template:
+            self.log(f"  Selected template: {best_template.name} (score: {best_score:.2f})")
+            self._template_cache[fingerprint] = best_name
+            self._template_cache.move_to_end(fingerprint)
+            while len(self._template_cache) > self.TEMPLATE_CACHE_SIZE:
+                self._template_cache.popitem(last=False)
+        else:
+            self.log(f"  No matching template found")
+
+        return best_template
+
+    @staticmethod
+    def _supplier_fingerprint(text_lower: str) -> str:
+        """
+        Identify the supplier layout of a document from its first lines.
+
+        Digits are dropped so invoice numbers and dates do not change the
+        fingerprint between invoices from the same supplier.
+        """
+        lines = [line.strip() for line in text_lower.splitlines() if line.strip()]
+        header = "\n".join(lines[:10])
+        header = re.sub(r'\s+', ' ', re.sub(r'\d+', '', header))
+        return hashlib.sha1(header.encode('utf-8')).hexdigest()
+
+    def process_pdf(self, pdf_path: Path):
+        """
+        Process a single PDF file, handling multiple invoices per PDF.
+
+        Args:
+            pdf_path: PDF to process
+
+        Returns:
+            List of line item dicts for all invoices in the document
+        """
+        self.log(f"Processing: {pdf_path.name}")
+        self.last_stage_timings = {}
+        self.last_template_used = None
+        self.last_template_timings = {}
+
+        try:
+            digest = None
+            if self.result_cache is not None:
+                with self._timed_stage("cache_lookup"):
+                    digest = file_digest(pdf_path)
+                    cached_texts = self.result_cache.get_page_texts(digest)
+                if cached_texts is not None:
+                    # Same PDF content seen before: skip pdfplumber entirely
+                    self.log(f"  Using cached page text ({len(cached_texts)} pages)")
+                    return self._process_page_text(pdf_path, PDFPageText.from_texts(cached_texts), digest)
+
+            with self._timed_stage("open"):
+                pdf = pdfplumber.open(pdf_path)
+
+            with pdf:
+                # Each page's text is extracted once and shared by every stage below
+                page_text = PDFPageText(pdf)
+                threshold = self.config.streaming_page_threshold
+                if threshold and len(page_text) >= threshold:
+                    return self._process_streaming(pdf_path, page_text, digest)
+                items = self._process_page_text(pdf_path, page_text, digest)
+                if digest is not None:
+                    self.result_cache.put_page_texts(digest, page_text.texts())
+                return items
+
+        except Exception as e:
+            self.log(f"  Error processing {pdf_path.name}: {e}")
+            return []
+
+    def _process_page_text(self, pdf_path: Path, page_text: PDFPageText, digest: str = None):
+        """
+        Select a template for the page text and extract its line items.
+
+        Args:
+            pdf_path: Path of the PDF (for logging)
+            page_text: Page text of the PDF
+            digest: SHA-256 of the PDF when the result cache is enabled
+
+        Returns:
+            List of line item dicts for all invoices in the document
+        """
+        # First pass: extract all text to detect template
+        with self._timed_stage("text_extraction"):
+            full_text = page_text.full_text
+
+        if not full_text.strip():
+            self.log(f"  No text extracted from {pdf_path.name}")
+            return []
+
+        # Scan for Bill of Lading and extract gross weight
+        bol_weight = None
+        bol_template = BillOfLadingTemplate()
+
+        with self._timed_stage("bol_scan"):
+            for text in page_text.iter_pages():
+                if text and bol_template.can_process(text):
+                    self.log(f"  Found Bill of Lading on a page")
+                    bol_weight = bol_template.extract_gross_weight(text)
+                    if bol_weight:
+                        self.log(f"  Extracted BOL gross weight: {bol_weight} kg")
+                        break
+
+        # Find the best template
+        with self._timed_stage("template_scoring"):
+            template = self.get_best_template(full_text)
+        if not template:
+            self.log(f"  No matching template for {pdf_path.name}")
+            return []
+
+        self.log(f"  Using template: {template.name}")
+        self.last_template_used = template.name
+
+        # Check if packing list only
+        if template.is_packing_list(full_text):
+            self.log(f"  Skipping packing list: {pdf_path.name}")
+            return []
+
+        all_items = None
+        if digest is not None:
+            all_items = self.result_cache.get_items(digest, template)
+            if all_items is not None:
+                self.log(f"  Using cached extraction result")
+
+        if all_items is None:
+            # Second pass: process page-by-page to handle multiple invoices
+            with self._timed_stage("extraction"):
+                all_items = self._extract_invoices(template, page_text.iter_pages(), bol_weight)
+            if digest is not None:
+                self.result_cache.put_items(digest, template, all_items)
+
+        # Count unique invoices
+        unique_invoices = set(item.get('invoice_number', 'UNKNOWN') for item in all_items)
+        grand_total = sum(float(item.get('total_price', 0) or 0) for item in all_items)
+        self.log(f"  Found {len(unique_invoices)} invoice(s), {len(all_items)} total items, Grand Total: ${grand_total:,.2f}")
+        self._log_stage_timings(page_text)
+
+        return all_items
+
+    def _process_streaming(self, pdf_path: Path, page_text: PDFPageText, digest: str = None):
+        """
+        Process a very large PDF page by page.
+
+        The template is selected from the first streaming_detection_pages pages
+        only, and each invoice's text is released as soon as the next invoice
+        starts, so page text in memory tracks the size of one invoice rather than
+        the whole document. The items are still returned together: a Bill of
+        Lading later in the packet applies to invoices read before it, and the
+        consolidated CSV needs every invoice. Page texts of streamed PDFs are
+        not stored in the result cache.
+
+        Args:
+            pdf_path: Path of the PDF (for logging)
+            page_text: Page text of the open PDF
+            digest: SHA-256 of the PDF when the result cache is enabled
+
+        Returns:
+            List of line item dicts for all invoices in the document
+        """
+        detection_pages = max(1, self.config.streaming_detection_pages)
+        self.log(f"  Streaming {len(page_text)} pages (template detected from first {detection_pages})")
+
+        with self._timed_stage("text_extraction"):
+            head_text = "".join(text + "\n"
+                                for text in (page_text.page_text(i)
+                                             for i in range(min(detection_pages, len(page_text))))
+                                if text)
+
+        if not head_text.strip():
+            self.log(f"  No text extracted from first pages of {pdf_path.name}")
+            return []
+
+        # The Bill of Lading may come after the invoices in a packet; its weight is
+        # applied to later invoices as they stream and to earlier ones at the end
+        bol_template = BillOfLadingTemplate()
+        bol_state = {'weight': None}
+
+        def scan_bol(text):
+            if bol_state['weight'] is None and text and bol_template.can_process(text):
+                self.log(f"  Found Bill of Lading on a page")
+                bol_state['weight'] = bol_template.extract_gross_weight(text)
+                if bol_state['weight']:
+                    self.log(f"  Extracted BOL gross weight: {bol_state['weight']} kg")
+
+        with self._timed_stage("bol_scan"):
+            for i in range(min(detection_pages, len(page_text))):
+                scan_bol(page_text.page_text(i))
+
+        with self._timed_stage("template_scoring"):
+            template = self.get_best_template(head_text)
+        if not template:
+            self.log(f"  No matching template for {pdf_path.name}")
+            return []
+
+        self.log(f"  Using template: {template.name}")
+        self.last_template_used = template.name
+
+        if template.is_packing_list(head_text):
+            self.log(f"  Skipping packing list: {pdf_path.name}")
+            return []
+
+        if digest is not None:
+            all_items = self.result_cache.get_items(digest, template)
+            if all_items is not None:
+                self.log(f"  Using cached extraction result")
+                self._log_stage_timings(page_text)
+                return all_items
+
+        def scanned_pages():
+            for text in page_text.stream_pages():
+                scan_bol(text)
+                yield text
+
+        all_items = []
+        invoice_count = 0
+        with self._timed_stage("extraction"):
+            for invoice_number, items in self._iter_invoices(template, scanned_pages(),
+                                                             lambda: bol_state['weight']):
+                invoice_count += 1
+                all_items.extend(items)
+                self.log(f"  Invoice {invoice_number}: {len(items)} items")
+
+        bol_weight = bol_state['weight']
+        if bol_weight:
+            for item in all_items:
+                if 'bol_gross_weight' not in item:
+                    item['bol_gross_weight'] = bol_weight
+                    if not item.get('net_weight'):
+                        item['net_weight'] = bol_weight
+
+        if digest is not None:
+            self.result_cache.put_items(digest, template, all_items)
+
+        grand_total = sum(float(item.get('total_price', 0) or 0) for item in all_items)
+        self.log(f"  Found {invoice_count} invoice(s), {len(all_items)} total items, Grand Total: ${grand_total:,.2f}")
+        self._log_stage_timings(page_text)
+
+        return all_items
+
+    def _extract_invoices(self, template, page_texts, bol_weight=None):
+        """
+        Split page texts into invoices by invoice number and extract their items.
+
+        Args:
+            template: Template selected for the document
+            page_texts: Iterable of page text strings in document order
+            bol_weight: Optional Bill of Lading gross weight applied to every item
+
+        Returns:
+            List of line item dicts for all invoices in the document
+        """
+        all_items = []
+        for _, items in self._iter_invoices(template, page_texts, lambda: bol_weight):
+            all_items.extend(items)
+        return all_items
+
+    def _iter_invoices(self, template, page_texts, get_bol_weight):
+        """
+        Split page texts into invoices and yield each invoice's items as soon as it ends.
+
+        An invoice ends when a page shows a different invoice number, so only the
+        pages of the current invoice are held in memory.
+
+        Args:
+            template: Template selected for the document
+            page_texts: Iterable of page text strings in document order
+            get_bol_weight: Callable returning the Bill of Lading gross weight to apply (or None)
+
+        Yields:
+            Tuple of (invoice_number, list of line item dicts)
+        """
+        current_invoice = None
+        current_project = None
+        page_buffer = []
+
+        for page_text in page_texts:
+            if not page_text:
+                continue
+
+            # Skip packing list and BOL pages
+            if 'packing list' in page_text.lower() and 'invoice' not in page_text.lower():
+                continue
+            if 'bill of lading' in page_text.lower():
+                continue
+
+            # Check for new invoice on this page
+            # Try multiple invoice number formats
+            inv_match = re.search(r'(?:Proforma\s+)?[Ii]nvoice\s+(?:number|n)\.?\s*:?\s*(\d+(?:/\d+)?)', page_text)
+            if not inv_match:
+                # Try Vitech format: INVOICE # HFVT25-A001
+                inv_match = re.search(r'[Ii]nvoice\s*#\s*([A-Z0-9-]+)', page_text)
+            proj_match = re.search(r'(?:\d+\.\s*)?[Pp]roject\s*(?:n\.?)?\s*:?\s*(US\d+[A-Z]\d+)', page_text, re.IGNORECASE)
+
+            new_invoice = inv_match.group(1) if inv_match else None
+            if new_invoice and current_invoice and new_invoice != current_invoice:
+                # Process accumulated pages for previous invoice
+                if page_buffer:
+                    buffer_text = "\n".join(page_buffer)
+                    _, _, items = template.extract_all(buffer_text)
+                    bol_weight = get_bol_weight()
+                    for item in items:
+                        item['invoice_number'] = current_invoice
+                        item['project_number'] = current_project
+                        if bol_weight:
+                            item['bol_gross_weight'] = bol_weight
+                        if bol_weight and ('net_weight' not in item or not item.get('net_weight')):
+                            item['net_weight'] = bol_weight
+                    yield current_invoice, items
+                    page_buffer = []
+
+            # Update current invoice/project if found
+            if inv_match:
+                current_invoice = inv_match.group(1)
+            if proj_match:
+                current_project = proj_match.group(1).upper()
+
+            # Add page to buffer
+            page_buffer.append(page_text)
+
+        # Process remaining pages in buffer
+        if page_buffer:
+            buffer_text = "\n".join(page_buffer)
+            inv_num, proj_num, items = template.extract_all(buffer_text)
+            # Use template-extracted values as fallback if regex didn't find them
+            final_invoice = current_invoice or inv_num or "UNKNOWN"
+            final_project = current_project or proj_num or "UNKNOWN"
+            bol_weight = get_bol_weight()
+            for item in items:
+                item['invoice_number'] = final_invoice
+                item['project_number'] = final_project
+                if bol_weight:
+                    item['bol_gross_weight'] = bol_weight
+                if bol_weight and ('net_weight' not in item or not item.get('net_weight')):
+                    item['net_weight'] = bol_weight
+            yield final_invoice, items
+
+    def save_to_csv(self, items, output_folder: Path, pdf_name: str = None):
+        """Save items to CSV files and add to parts database."""
+        if not items:
+            return
+
+        with self._timed_stage("db_enrichment"):
+            # Add items to parts database
+            parts_data = []
+            mid_lookups = {}  # manufacturer name -> mid_table entry, for this invoice
+            for item in items:
+                # Look up MID and country_origin from manufacturer name (using mid_table)
+                if ('mid' not in item or not item['mid']) or ('country_origin' not in item or not item['country_origin']):
+                    manufacturer_name = item.get('manufacturer_name', '')
+                    if manufacturer_name:
+                        if manufacturer_name not in mid_lookups:
+                            mid_lookups[manufacturer_name] = self.parts_db.get_mid_by_manufacturer_name(manufacturer_name)
+                        mid_entry = mid_lookups[manufacturer_name]
+                        if mid_entry:
+                            if 'mid' not in item or not item['mid']:
+                                if mid_entry.get('mid'):
+                                    item['mid'] = mid_entry.get('mid', '')
+                            # Extract country from MID code (first 2 characters)
+                            if 'country_origin' not in item or not item['country_origin']:
+                                mid_code = mid_entry.get('mid', '')
+                                if len(mid_code) >= 2:
+                                    item['country_origin'] = mid_code[:2].upper()
+
+                # Extract country from MID if available
+                if ('country_origin' not in item or not item['country_origin']) and item.get('mid'):
+                    mid = item.get('mid', '')
+                    if len(mid) >= 2:
+                        item['country_origin'] = mid[:2].upper()
+
+                part_data = item.copy()
+                part_data['source_file'] = pdf_name or 'unknown'
+                parts_data.append(part_data)
+
+            # One transaction for the whole PDF instead of a commit per line item
+            self.parts_db.add_part_occurrences_bulk(parts_data)
+
+            for item, part_data in zip(items, parts_data):
+                # Enrich item with database info
+                if 'description' not in item or not item['description']:
+                    item['description'] = part_data.get('description', '')
+                if 'hts_code' not in item or not item['hts_code']:
+                    item['hts_code'] = part_data.get('hts_code', '')
+
+                # Remove manufacturer_name from output
+                if 'manufacturer_name' in item:
+                    del item['manufacturer_name']
+
+        with self._timed_stage("csv_write"):
+            # Group by invoice number
+            by_invoice = {}
+            for item in items:
+                inv_num = item.get('invoice_number', 'UNKNOWN')
+                if inv_num not in by_invoice:
+                    by_invoice[inv_num] = []
+                by_invoice[inv_num].append(item)
+
+            # Get column mapping configuration
+            mapping = self.config.get_output_column_mapping()
+            if mapping and 'columns' in mapping:
+                # Use configured columns (in order, only enabled ones)
+                columns = []
+                column_renames = {}
+                for col_config in mapping['columns']:
+                    if col_config.get('enabled', True):
+                        internal = col_config['internal_name']
+                        display = col_config['display_name']
+                        columns.append(internal)
+                        if internal != display:
+                            column_renames[internal] = display
+            else:
+                # Default columns
+                columns = ['invoice_number', 'project_number', 'part_number', 'description', 'mid', 'country_origin', 'hts_code', 'quantity', 'total_price']
+                column_renames = {}
+                # Add any extra columns from items
+                for item in items:
+                    for key in item.keys():
+                        if key not in columns:
+                            columns.append(key)
+
+            # Check export options
+            split_by_invoice = self.config.get_export_option('split_by_invoice', False)
+            consolidate = self.config.consolidate_multi_invoice
+
+            # Helper function to write CSV with renamed columns
+            def write_csv_with_mapping(filepath, items_to_write, columns, renames):
+                # Rename columns in header
+                header = [renames.get(col, col) for col in columns]
+                with open(filepath, 'w', newline='', encoding='utf-8') as f:
+                    writer = csv.writer(f)
+                    writer.writerow(header)
+                    for item in items_to_write:
+                        row = [item.get(col, '') for col in columns]
+                        writer.writerow(row)
+
+            if split_by_invoice:
+                # Split by invoice - one file per invoice
+                for inv_num, inv_items in by_invoice.items():
+                    proj_num = inv_items[0].get('project_number', 'UNKNOWN')
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    safe_inv_num = inv_num.replace('/', '-')
+                    filename = f"{safe_inv_num}_{proj_num}_{timestamp}.csv"
+                    filepath = output_folder / filename
+
+                    write_csv_with_mapping(filepath, inv_items, columns, column_renames)
+                    self.log(f"  Saved: {filename} ({len(inv_items)} items)")
+
+            elif consolidate and len(by_invoice) > 1:
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                if pdf_name:
+                    base_name = Path(pdf_name).stem
+                else:
+                    base_name = f"consolidated_{list(by_invoice.keys())[0]}"
+                filename = f"{base_name}_{timestamp}.csv"
+                filepath = output_folder / filename
+
+                write_csv_with_mapping(filepath, items, columns, column_renames)
+
+                invoice_list = ", ".join(sorted(by_invoice.keys()))
+                self.log(f"  Saved: {filename} ({len(items)} items from {len(by_invoice)} invoices)")
+            else:
+                for inv_num, inv_items in by_invoice.items():
+                    proj_num = inv_items[0].get('project_number', 'UNKNOWN')
+                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                    safe_inv_num = inv_num.replace('/', '-')
+                    filename = f"{safe_inv_num}_{proj_num}_{timestamp}.csv"
+                    filepath = output_folder / filename
+
+                    write_csv_with_mapping(filepath, inv_items, columns, column_renames)
+                    self.log(f"  Saved: {filename} ({len(inv_items)} items)")
+
+    def move_to_processed(self, pdf_path: Path, processed_folder: Path = None):
+        """Move processed PDF to the Processed folder."""
+        if processed_folder is None:
+            processed_folder = pdf_path.parent / "Processed"
+        processed_folder.mkdir(exist_ok=True, parents=True)
+
+        dest = processed_folder / pdf_path.name
+        counter = 1
+        while dest.exists():
+            stem = pdf_path.stem
+            dest = processed_folder / f"{stem}_{counter}{pdf_path.suffix}"
+            counter += 1
+
+        pdf_path.rename(dest)
+        self.log(f"  Moved to: Processed/{dest.name}")
+
+    def move_to_failed(self, pdf_path: Path, failed_folder: Path = None, reason: str = ""):
+        """Move failed PDF to the Failed folder."""
+        if failed_folder is None:
+            failed_folder = pdf_path.parent / "Failed"
+        failed_folder.mkdir(exist_ok=True, parents=True)
+
+        dest = failed_folder / pdf_path.name
+        counter = 1
+        while dest.exists():
+            stem = pdf_path.stem
+            dest = failed_folder / f"{stem}_{counter}{pdf_path.suffix}"
+            counter += 1
+
+        pdf_path.rename(dest)
+        reason_msg = f" ({reason})" if reason else ""
+        self.log(f"  Moved to: Failed/{dest.name}{reason_msg}")
+
+    def process_folder(self, input_folder: Path, output_folder: Path):
+        """Process all PDFs in the input folder."""
+        input_folder.mkdir(exist_ok=True, parents=True)
+        output_folder.mkdir(exist_ok=True, parents=True)
+        processed_folder = input_folder / "Processed"
+        failed_folder = input_folder / "Failed"
+
+        pdf_files = list(input_folder.glob("*.pdf"))
+        if not pdf_files:
+            return 0
+
+        self.log(f"Found {len(pdf_files)} PDF(s) to process")
+        processed_count = 0
+
+        for pdf_path in pdf_files:
+            try:
+                items = self.process_pdf(pdf_path)
+                if items:
+                    self.save_to_csv(items, output_folder, pdf_name=pdf_path.name)
+                    self.move_to_processed(pdf_path, processed_folder)
+                    self.record_stage_metrics(pdf_path.name)
+                    processed_count += 1
+                else:
+                    self.move_to_failed(pdf_path, failed_folder, "No items extracted")
+            except Exception as e:
+                self.log(f"  Error processing {pdf_path.name}: {e}")
+                self.move_to_failed(pdf_path, failed_folder, f"Error: {str(e)[:50]}")
+
+        return processed_count
@@ -4,17 +4,38 @@ Section 232 Steel/Aluminum Declaration Exporter for OCRMill
 Reads processed invoice CSVs, enriches with material composition data from parts database,
 expands rows by material type, and exports Section 232-compliant Excel files.
 
+Rows are streamed to the output file (write-only Excel worksheets with shared
+named styles, or plain CSV / Parquet), so memory does not grow with row count.
+
+In incremental mode a manifest in the output folder records the export produced
+from each source CSV with its content hash and the material data of its parts, so
+unchanged inputs are skipped on the next run. Remaining files can be exported
+in parallel worker processes.
+
 Based on TariffMill's Section 232 export implementation.
 """
 
 import csv
+import hashlib
+import io
+import json
+import multiprocessing
+import os
 import sqlite3
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from datetime import datetime
-import openpyxl
-from openpyxl.styles import Font, PatternFill, Alignment
-from openpyxl.utils import get_column_letter
+import numpy as np
+
+# Parquet output is optional (requires pyarrow)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
 
 
 class Section232Exporter:
@@ -47,7 +68,27 @@ class Section232Exporter:
         'WoodRatio', 'AutoRatio', 'NonSteelRatio', 'DualDeclaration', '232_Status', 'CustomerRef'
     ]
 
-    def __init__(self, input_folder: Path, output_folder: Path, db_path: Path):
+    # Supported output formats (format -> file extension)
+    OUTPUT_FORMATS = {
+        'xlsx': '.xlsx',
+        'csv': '.csv',
+        'parquet': '.parquet',
+    }
+
+    # Fill for rows with both steel and aluminum content
+    DUAL_DECLARATION_COLOR = 'E1BEE7'
+
+    # Part numbers per parts_master lookup query (below SQLite's bound parameter limit)
+    LOOKUP_CHUNK_SIZE = 500
+
+    # Items expanded per column chunk (bounds memory for very large invoices)
+    EXPANSION_CHUNK_SIZE = 20000
+
+    # Incremental export record, kept in the output folder
+    MANIFEST_FILENAME = "232_manifest.json"
+
+    def __init__(self, input_folder: Path, output_folder: Path, db_path: Path,
+                 output_format: str = "xlsx", incremental: bool = False, workers: int = 1):
         """
         Initialize Section 232 Exporter.
 
@@ -55,45 +96,239 @@ class Section232Exporter:
             input_folder: Folder containing processed CSV files
             output_folder: Folder for Section 232 exports
             db_path: Path to parts database
+            output_format: 'xlsx' (formatted), 'csv' or 'parquet' (requires pyarrow)
+            incremental: Skip CSVs already exported with the same content and material data
+            workers: Number of processes exporting files in parallel (1 = in this process)
         """
+        if output_format not in self.OUTPUT_FORMATS:
+            raise ValueError(f"Unsupported Section 232 output format: {output_format}")
+        if output_format == 'parquet' and not HAS_PYARROW:
+            raise ValueError("Parquet output requires pyarrow (pip install pyarrow)")
+
         self.input_folder = Path(input_folder)
         self.output_folder = Path(output_folder)
         self.db_path = Path(db_path)
+        self.output_format = output_format
+        self.incremental = incremental
+        self.workers = max(1, int(workers))
         self.output_folder.mkdir(parents=True, exist_ok=True)
 
-    def process_all(self) -> int:
-        """Process all CSV files in input folder and generate Section 232 exports."""
-        csv_files = list(self.input_folder.glob("*.csv"))
+        # Files skipped as unchanged by the last process_all run
+        self.skipped_count = 0
+
+        # part_number -> material row (None = not in parts_master), kept for one process_all run
+        self._materials_cache = None
+
+    def process_all(self, on_file=None) -> int:
+        """
+        Process all CSV files in input folder and generate Section 232 exports.
+
+        Args:
+            on_file: Optional callback(csv_path, output_path, row_count) called as each
+                file is exported (output_path is None if the file produced no rows)
+
+        Returns:
+            Number of files exported (files skipped as unchanged are in skipped_count)
+        """
+        csv_files = sorted(self.input_folder.glob("*.csv"))
         processed_count = 0
+        self.skipped_count = 0
+
+        # Parts shared between invoices are looked up once per run
+        self._materials_cache = {}
+        try:
+            manifest = self._load_manifest() if self.incremental else {}
+
+            # Decide which files need exporting
+            pending = []  # (csv_file, source state or None, rows read for the state or None)
+            for csv_file in csv_files:
+                state = items = None
+                if self.incremental:
+                    try:
+                        state, items = self._source_state(csv_file)
+                    except Exception as e:
+                        print(f"Error processing {csv_file.name}: {e}")
+                        continue
+                    if self._is_exported(manifest.get(csv_file.name), state):
+                        self.skipped_count += 1
+                        continue
+                pending.append((csv_file, state, items))
+
+            for csv_file, state, output_path, row_count in self._export_files(pending):
+                processed_count += 1
+                if on_file is not None:
+                    on_file(csv_file, output_path, row_count)
+                if state is not None and output_path is not None:
+                    self._remove_previous_output(manifest.get(csv_file.name), output_path)
+                    manifest[csv_file.name] = {
+                        'sha256': state['sha256'],
+                        'materials': state['materials'],
+                        'format': self.output_format,
+                        'output': output_path.name,
+                        'rows': row_count,
+                        'exported': datetime.now().isoformat(),
+                    }
+
+            if self.incremental:
+                self._save_manifest(manifest)
+        finally:
+            self._materials_cache = None
+
+        if self.skipped_count:
+            print(f"Skipped {self.skipped_count} unchanged file(s)")
+        return processed_count
+
+    def _remove_previous_output(self, entry: Optional[Dict], output_path: Path):
+        """Delete the export a manifest entry points to, once a newer export replaces it."""
+        if not entry or not entry.get('output') or entry['output'] == output_path.name:
+            return
+        previous = self.output_folder / entry['output']
+        try:
+            previous.unlink(missing_ok=True)
+        except OSError as e:
+            print(f"Warning: Could not remove previous export {previous.name}: {e}")
+
+    def process_file(self, csv_path: Path) -> Optional[Path]:
+        """
+        Process a single CSV file and generate Section 232 export.
+
+        Returns:
+            Path of the export, or None if the CSV produced no rows
+        """
+        output_path, _ = self._export_file(csv_path)
+        return output_path
+
+    def _export_files(self, pending: List[Tuple[Path, Optional[Dict], Optional[List[Dict]]]]):
+        """
+        Export files, in worker processes when more than one worker is configured.
 
-        for csv_file in csv_files:
+        In parallel mode the CSVs are read and their materials looked up here, once
+        per run, and each worker receives the rows with the material data they need.
+
+        Yields:
+            Tuple of (csv_file, source state, output path or None, row count) per exported file
+        """
+        if self.workers <= 1 or len(pending) <= 1:
+            for csv_file, state, items in pending:
+                try:
+                    output_path, row_count = self._export_file(csv_file, items)
+                except Exception as e:
+                    print(f"Error processing {csv_file.name}: {e}")
+                    continue
+                yield csv_file, state, output_path, row_count
+            return
+
+        jobs = []  # (csv_file, state, items, materials)
+        for csv_file, state, items in pending:
             try:
-                self.process_file(csv_file)
-                processed_count += 1
+                if items is None:
+                    items = self._read_csv(csv_file)
+                materials = self._lookup_materials(self._part_numbers(items))
             except Exception as e:
                 print(f"Error processing {csv_file.name}: {e}")
+                continue
+            jobs.append((csv_file, state, items, materials))
+        if not jobs:
+            return
 
-        return processed_count
-
-    def process_file(self, csv_path: Path):
-        """Process a single CSV file and generate Section 232 export."""
+        # spawn: children start clean on every platform (no inherited connections or Qt state)
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs)),
+                                 mp_context=multiprocessing.get_context("spawn"),
+                                 initializer=_init_export_worker) as pool:
+            futures = {
+                pool.submit(_export_file_in_worker, str(self.input_folder), str(self.output_folder),
+                            str(self.db_path), self.output_format, str(csv_file),
+                            items, materials): (csv_file, state)
+                for csv_file, state, items, materials in jobs
+            }
+            for future in as_completed(futures):
+                csv_file, state = futures[future]
+                try:
+                    output_name, row_count = future.result()
+                except Exception as e:
+                    print(f"Error processing {csv_file.name}: {e}")
+                    continue
+                output_path = self.output_folder / output_name if output_name else None
+                yield csv_file, state, output_path, row_count
+
+    def _export_file(self, csv_path: Path, items: Optional[List[Dict]] = None) -> Tuple[Optional[Path], int]:
+        """Export one CSV (items: its rows, if already read); returns (output path or None, row count)."""
         # Read CSV
-        items = self._read_csv(csv_path)
+        if items is None:
+            items = self._read_csv(csv_path)
         if not items:
-            return
+            return None, 0
 
         # Enrich with material composition from database
         enriched_items = self._enrich_with_materials(items)
 
-        # Expand rows by material type
-        expanded_rows = self._expand_by_material(enriched_items)
+        # Expand rows by material type (chunks are generated while the output is written)
+        expanded_chunks = self._iter_expanded_chunks(enriched_items)
 
-        # Generate Excel export
-        output_filename = f"232_{csv_path.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        # Generate export
+        extension = self.OUTPUT_FORMATS[self.output_format]
+        output_filename = f"232_{csv_path.stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{extension}"
         output_path = self.output_folder / output_filename
-        self._export_to_excel(expanded_rows, output_path)
+        row_count = self._export_chunks(expanded_chunks, output_path)
 
-        print(f"Exported: {output_filename} ({len(expanded_rows)} rows)")
+        if not row_count:
+            return None, 0
+        print(f"Exported: {output_filename} ({row_count} rows)")
+        return output_path, row_count
+
+    # ----- Incremental export manifest -----
+
+    def _source_state(self, csv_path: Path) -> Tuple[Dict, List[Dict]]:
+        """
+        Identify the inputs of a CSV's export: its content hash and the material
+        data of the parts it contains, so parts database edits trigger a re-export.
+
+        Returns:
+            Tuple of (state, CSV rows); the rows are reused for the export
+        """
+        data = csv_path.read_bytes()
+        sha256 = hashlib.sha256(data).hexdigest()
+        items = [dict(row) for row in csv.DictReader(io.StringIO(data.decode('utf-8'), newline=''))]
+        materials = self._lookup_materials(self._part_numbers(items))
+        material_data = json.dumps(sorted(materials.items()), default=str)
+        state = {
+            'sha256': sha256,
+            'materials': hashlib.sha1(material_data.encode('utf-8')).hexdigest(),
+        }
+        return state, items
+
+    def _is_exported(self, entry: Optional[Dict], state: Dict) -> bool:
+        """True if a manifest entry is an existing export of the same inputs in this format."""
+        if not entry:
+            return False
+        return (entry.get('sha256') == state['sha256']
+                and entry.get('materials') == state['materials']
+                and entry.get('format') == self.output_format
+                and (self.output_folder / entry.get('output', '')).is_file())
+
+    def _load_manifest(self) -> Dict:
+        """Load the manifest (source CSV name -> export record); empty if missing or unreadable."""
+        manifest_path = self.output_folder / self.MANIFEST_FILENAME
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except FileNotFoundError:
+            return {}
+        except (OSError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable Section 232 manifest: {e}")
+            return {}
+        return manifest if isinstance(manifest, dict) else {}
+
+    def _save_manifest(self, manifest: Dict):
+        """Write the manifest atomically."""
+        manifest_path = self.output_folder / self.MANIFEST_FILENAME
+        tmp_path = manifest_path.with_name(f"{manifest_path.name}.{os.getpid()}.tmp")
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(manifest, f, indent=2)
+            os.replace(tmp_path, manifest_path)
+        except OSError as e:
+            print(f"Warning: Could not save Section 232 manifest: {e}")
 
     def _read_csv(self, csv_path: Path) -> List[Dict]:
         """Read CSV file and return list of dictionaries."""
@@ -104,22 +339,21 @@ class Section232Exporter:
                 items.append(dict(row))
         return items
 
+    @staticmethod
+    def _part_numbers(items: List[Dict]) -> set:
+        """Distinct non-empty part numbers of CSV rows."""
+        part_numbers = {item.get('part_number', '') or item.get('Part Number', '') for item in items}
+        part_numbers.discard('')
+        return part_numbers
+
     def _enrich_with_materials(self, items: List[Dict]) -> List[Dict]:
         """Lookup material composition from parts database (TariffMill schema)."""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        materials = self._lookup_materials(self._part_numbers(items))
 
         for item in items:
             part_number = item.get('part_number', '') or item.get('Part Number', '')
             if part_number:
-                cursor.execute("""
-                    SELECT
-                        steel_ratio, aluminum_ratio, non_steel_ratio, qty_unit
-                    FROM parts_master
-                    WHERE part_number = ?
-                """, (part_number,))
-
-                result = cursor.fetchone()
+                result = materials.get(part_number)
                 if result:
                     # TariffMill uses ratio (0-100), map to expected column names
                     item['steel_pct'] = result[0] or 0.0
@@ -139,9 +373,45 @@ class Section232Exporter:
                     item['non_steel_pct'] = 0.0
                     item['qty_unit'] = 'NO'
 
-        conn.close()
         return items
 
+    def _lookup_materials(self, part_numbers) -> Dict[str, Optional[Tuple]]:
+        """
+        Get (steel_ratio, aluminum_ratio, non_steel_ratio, qty_unit) for part numbers.
+
+        Parts not already in the run cache are fetched with chunked IN queries.
+
+        Args:
+            part_numbers: Part numbers to look up
+
+        Returns:
+            Dict mapping each part number to its row tuple, or None if not in parts_master
+        """
+        cache = self._materials_cache if self._materials_cache is not None else {}
+        missing = [pn for pn in part_numbers if pn not in cache]
+
+        if missing:
+            conn = sqlite3.connect(self.db_path)
+            try:
+                cursor = conn.cursor()
+                for start in range(0, len(missing), self.LOOKUP_CHUNK_SIZE):
+                    chunk = missing[start:start + self.LOOKUP_CHUNK_SIZE]
+                    placeholders = ",".join("?" * len(chunk))
+                    cursor.execute(f"""
+                        SELECT
+                            part_number, steel_ratio, aluminum_ratio, non_steel_ratio, qty_unit
+                        FROM parts_master
+                        WHERE part_number IN ({placeholders})
+                    """, chunk)
+                    for chunk_part in chunk:
+                        cache[chunk_part] = None
+                    for row in cursor.fetchall():
+                        cache[row[0]] = tuple(row[1:])
+            finally:
+                conn.close()
+
+        return {pn: cache[pn] for pn in part_numbers}
+
     def _expand_by_material(self, items: List[Dict]) -> List[Dict]:
         """
         Expand each item into multiple rows based on material composition.
@@ -151,8 +421,151 @@ class Section232Exporter:
         - Proportionally distribute value based on material percentage
         - Assign declaration flag based on material type
         """
-        expanded = []
+        return list(self._iter_expanded_rows(items))
+
+    def _iter_expanded_rows(self, items: Iterable[Dict]) -> Iterator[Dict]:
+        """Generate the derivative rows of _expand_by_material as dicts."""
+        for chunk in self._iter_expanded_chunks(items):
+            keys = list(chunk)
+            for values in zip(*chunk.values()):
+                yield dict(zip(keys, values))
+
+    def _iter_expanded_chunks(self, items: Iterable[Dict]) -> Iterator[Dict[str, list]]:
+        """
+        Generate derivative rows as column chunks (column name -> list of values).
+
+        Columns are EXPORT_COLUMNS followed by _content_type; empty chunks are skipped.
+        """
+        items = items if isinstance(items, list) else list(items)
+        for start in range(0, len(items), self.EXPANSION_CHUNK_SIZE):
+            chunk = self._expand_chunk(items[start:start + self.EXPANSION_CHUNK_SIZE])
+            if chunk:
+                yield chunk
+
+    def _expand_chunk(self, items: List[Dict]) -> Optional[Dict[str, list]]:
+        """
+        Expand a chunk of items with column (array) operations.
+
+        Produces exactly the rows of _iter_expanded_rows_rowwise: one row per
+        material with a ratio > 0, in item order and MATERIAL_CONFIGS order.
+
+        Returns:
+            Column name -> list of values, or None if the chunk has no derivative rows
+        """
+        if not items:
+            return None
+
+        def column(values, dtype=object):
+            return np.array(values, dtype=dtype)
+
+        # Item columns, read with the same fallbacks as the row-wise path
+        product_no = column([item.get('part_number', '') or item.get('Part Number', '') for item in items])
+        hts_code = column([item.get('hts_code', '') or item.get('HTS Code', '') for item in items])
+        mid = column([item.get('mid', '') or item.get('MID', '') for item in items])
+        country = column([item.get('country_origin', '') or item.get('Country Origin', '') for item in items])
+        customer_ref = column([item.get('project_number', '') or item.get('Project Number', '') for item in items])
+        qty_unit = [item.get('qty_unit', 'NO') for item in items]
+        value = column([float(item.get('total_price', 0) or item.get('Total Price', 0) or 0) for item in items], float)
+        weight = column([float(item.get('net_weight', 0) or item.get('Net Weight', 0) or 0) for item in items], float)
+        quantity = column([float(item.get('quantity', 0) or item.get('Quantity', 0) or 0) for item in items], float)
+
+        # Material ratio matrix: one column per MATERIAL_CONFIGS entry
+        ratio_keys = [config[1] for config in self.MATERIAL_CONFIGS]
+        ratios = column([[float(item.get(key, 0) or 0) for key in ratio_keys] for item in items], float)
+        ratios = ratios.reshape(len(items), len(ratio_keys))
+
+        # Melt: (item, material) pairs with a positive ratio, in item then material order
+        item_index, material_index = np.nonzero(ratios > 0)
+        if len(item_index) == 0:
+            return None
+        pct = ratios[item_index, material_index]
+
+        # Per-item text shared by all derivative rows of the item (ratios repeat a lot,
+        # so each distinct value is formatted once)
+        unique_ratios, ratio_codes = np.unique(ratios, return_inverse=True)
+        unique_ratio_text = self._format_fixed(unique_ratios, '%')
+        ratio_codes = ratio_codes.reshape(ratios.shape)
+        ratio_text = [unique_ratio_text[ratio_codes[item_index, i]] for i in range(len(ratio_keys))]
+        steel = ratio_keys.index('steel_pct')
+        aluminum = ratio_keys.index('aluminum_pct')
+        dual = np.where((ratios[:, steel] > 0) & (ratios[:, aluminum] > 0), '07 & 08', '').astype(object)
+        qty_text = self._format_rounded(quantity)[item_index]
+        weight_unit = np.isin(column(qty_unit), ['KG', 'G', 'T', 'kg', 'g', 't'])[item_index]
+
+        # Per-material constants
+        content_types = column([config[0] for config in self.MATERIAL_CONFIGS])
+        dec_codes = column([config[2] for config in self.MATERIAL_CONFIGS])
+        flag_map = {
+            'steel': '232_Steel',
+            'aluminum': '232_Aluminum',
+            'copper': '232_Copper',
+            'wood': '232_Wood',
+            'auto': '232_Auto',
+            'non_232': 'Non_232',
+        }
+        flags = column([flag_map.get(ct, '') for ct in content_types])
+        statuses = column([self._determine_232_status(ct, {}) for ct in content_types])
+        content_type = content_types[material_index]
+
+        # Proportional value and weight
+        proportional_value = value[item_index] * pct / 100.0
+        proportional_weight = weight[item_index] * pct / 100.0
+        weight_text = self._format_rounded(proportional_weight)
+
+        # Qty1/Qty2: weight-only units report the weight alone, all others quantity and weight
+        qty1 = np.where(weight_unit, weight_text, qty_text)
+        qty2 = np.where(weight_unit, '', weight_text)
+
+        row_country = country[item_index]
+        columns = {
+            'Product No': product_no[item_index],
+            'ValueUSD': self._format_fixed(proportional_value),
+            'HTSCode': hts_code[item_index],
+            'MID': mid[item_index],
+            'Qty1': qty1,
+            'Qty2': qty2,
+            'DecTypeCd': dec_codes[material_index],
+            'CountryofMelt': np.where(np.isin(content_type, ['steel', 'aluminum', 'copper']), row_country, ''),
+            'CountryOfCast': np.where(content_type == 'aluminum', row_country, ''),
+            'PrimCountryOfSmelt': np.where(np.isin(content_type, ['aluminum', 'copper', 'wood']), row_country, ''),
+            'DeclarationFlag': flags[material_index],
+            'SteelRatio': ratio_text[ratio_keys.index('steel_pct')],
+            'AluminumRatio': ratio_text[ratio_keys.index('aluminum_pct')],
+            'CopperRatio': ratio_text[ratio_keys.index('copper_pct')],
+            'WoodRatio': ratio_text[ratio_keys.index('wood_pct')],
+            'AutoRatio': ratio_text[ratio_keys.index('auto_pct')],
+            'NonSteelRatio': ratio_text[ratio_keys.index('non_steel_pct')],
+            'DualDeclaration': dual[item_index],
+            '232_Status': statuses[material_index],
+            'CustomerRef': customer_ref[item_index],
+            '_content_type': content_type,
+        }
+
+        return {name: np.asarray(values, dtype=object).tolist() for name, values in columns.items()}
+
+    @staticmethod
+    def _format_fixed(values, suffix: str = ''):
+        """Format floats like f"{value:.2f}" (plus an optional suffix)."""
+        template = '%.2f' + suffix.replace('%', '%%')
+        return np.array([template % value for value in np.asarray(values, dtype=float).tolist()], dtype=object)
+
+    @staticmethod
+    def _format_rounded(values):
+        """Format floats like str(int(round(value))) if value > 0, else ''."""
+        values = np.asarray(values, dtype=float)
+        positive = values > 0
+        text = np.full(len(values), '', dtype=object)
+        # np.rint rounds half to even, like round()
+        text[positive] = [str(value) for value in np.rint(values[positive]).astype(np.int64).tolist()]
+        return text
+
+    def _iter_expanded_rows_rowwise(self, items: Iterable[Dict]) -> Iterator[Dict]:
+        """
+        Generate derivative rows one item at a time.
 
+        Reference implementation of _iter_expanded_rows (used by the benchmark
+        to check that the columnar expansion produces identical rows).
+        """
         for item in items:
             # Get original values
             original_value = float(item.get('total_price', 0) or item.get('Total Price', 0) or 0)
@@ -178,14 +591,11 @@ class Section232Exporter:
             for content_type, ratio_key, dec_code, color in self.MATERIAL_CONFIGS:
                 pct = materials[ratio_key]
                 if pct > 0:
-                    new_row = self._create_derivative_row(
+                    yield self._create_derivative_row(
                         item, content_type, pct, dec_code,
                         original_value, net_weight, quantity,
                         materials, dual_declaration
                     )
-                    expanded.append(new_row)
-
-        return expanded
 
     def _create_derivative_row(self, item: Dict, content_type: str, pct: float,
                                 dec_code: str, original_value: float, net_weight: float,
@@ -277,52 +687,138 @@ class Section232Exporter:
         else:
             return ''
 
-    def _export_to_excel(self, rows: List[Dict], output_path: Path):
-        """Export rows to Excel with Section 232 formatting."""
-        if not rows:
-            return
+    def _export_chunks(self, chunks: Iterable[Dict[str, list]], output_path: Path) -> int:
+        """
+        Write derivative row chunks in the configured output format.
 
-        # Create workbook
-        wb = openpyxl.Workbook()
-        ws = wb.active
-        ws.title = "Section 232 Export"
+        Args:
+            chunks: Column chunks from _iter_expanded_chunks (may be a generator)
+            output_path: File to create
 
-        # Write headers
-        for col_idx, header in enumerate(self.EXPORT_COLUMNS, start=1):
-            cell = ws.cell(row=1, column=col_idx, value=header)
-            cell.font = Font(bold=True)
-            cell.alignment = Alignment(horizontal='center')
-
-        # Write data rows with formatting
-        for row_idx, row_data in enumerate(rows, start=2):
-            content_type = row_data.get('_content_type', '')
-
-            # Determine font color based on material type
-            color = self._get_material_color(content_type)
-            font = Font(color=color)
-
-            # Determine fill color for dual declarations
-            fill = None
-            if row_data.get('DualDeclaration'):
-                fill = PatternFill(start_color='E1BEE7', end_color='E1BEE7', fill_type='solid')
-
-            for col_idx, header in enumerate(self.EXPORT_COLUMNS, start=1):
-                value = row_data.get(header, '')
-                cell = ws.cell(row=row_idx, column=col_idx, value=value)
-                cell.font = font
-                if fill:
-                    cell.fill = fill
+        Returns:
+            Number of rows written (no file is created when there are none)
+        """
+        chunks = iter(chunks)
+        first_chunk = next(chunks, None)
+        if first_chunk is None:
+            return 0
+        chunks = self._chain_first(first_chunk, chunks)
+
+        if self.output_format == 'csv':
+            return self._export_to_csv(chunks, output_path)
+        if self.output_format == 'parquet':
+            return self._export_to_parquet(chunks, output_path)
+        return self._export_to_excel(chunks, output_path)
+
+    def _export_to_excel(self, chunks: Iterable[Dict[str, list]], output_path: Path) -> int:
+        """Export rows to Excel with Section 232 formatting."""
+        # openpyxl is only imported for Excel output (CSV and Parquet exports don't need it)
+        import openpyxl
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.utils import get_column_letter
+
+        # Write-only workbook: rows are serialized as they are appended
+        wb = openpyxl.Workbook(write_only=True)
+        ws = wb.create_sheet("Section 232 Export")
+        styles = self._register_row_styles(wb)
 
         # Auto-size columns
         for col_idx in range(1, len(self.EXPORT_COLUMNS) + 1):
             ws.column_dimensions[get_column_letter(col_idx)].width = 15
 
         # Set page setup for landscape
-        ws.page_setup.orientation = ws.ORIENTATION_LANDSCAPE
+        ws.page_setup.orientation = 'landscape'
         ws.page_setup.fitToWidth = 1
 
+        # Write headers
+        header_cells = []
+        for header in self.EXPORT_COLUMNS:
+            cell = WriteOnlyCell(ws, value=header)
+            cell.style = styles['header']
+            header_cells.append(cell)
+        ws.append(header_cells)
+
+        # Write data rows, styled by material type and dual declaration
+        row_count = 0
+        for chunk in chunks:
+            rows = zip(chunk['_content_type'], chunk['DualDeclaration'],
+                       zip(*(chunk[header] for header in self.EXPORT_COLUMNS)))
+            for content_type, dual_declaration, values in rows:
+                style = styles[(content_type, bool(dual_declaration))]
+                cells = []
+                for value in values:
+                    cell = WriteOnlyCell(ws, value=value)
+                    cell.style = style
+                    cells.append(cell)
+                ws.append(cells)
+                row_count += 1
+
         # Save workbook
         wb.save(output_path)
+        return row_count
+
+    def _register_row_styles(self, wb) -> Dict:
+        """
+        Add one named style per material type (plain and dual-declaration fill) to a workbook.
+
+        Returns:
+            Dict mapping 'header' and (content_type, is_dual) to style names
+        """
+        from openpyxl.styles import Font, PatternFill, Alignment, NamedStyle
+
+        styles = {}
+
+        header_style = NamedStyle(name="232 Header")
+        header_style.font = Font(bold=True)
+        header_style.alignment = Alignment(horizontal='center')
+        wb.add_named_style(header_style)
+        styles['header'] = header_style.name
+
+        content_types = [config[0] for config in self.MATERIAL_CONFIGS] + ['']
+        for content_type in content_types:
+            for is_dual in (False, True):
+                name = f"232 {content_type or 'other'}{' dual' if is_dual else ''}"
+                style = NamedStyle(name=name)
+                style.font = Font(color=self._get_material_color(content_type))
+                if is_dual:
+                    style.fill = PatternFill(start_color=self.DUAL_DECLARATION_COLOR,
+                                             end_color=self.DUAL_DECLARATION_COLOR, fill_type='solid')
+                wb.add_named_style(style)
+                styles[(content_type, is_dual)] = name
+
+        return styles
+
+    def _export_to_csv(self, chunks: Iterable[Dict[str, list]], output_path: Path) -> int:
+        """Export rows to an unformatted CSV file."""
+        row_count = 0
+        with open(output_path, 'w', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            writer.writerow(self.EXPORT_COLUMNS)
+            for chunk in chunks:
+                rows = list(zip(*(chunk[header] for header in self.EXPORT_COLUMNS)))
+                writer.writerows(rows)
+                row_count += len(rows)
+        return row_count
+
+    def _export_to_parquet(self, chunks: Iterable[Dict[str, list]], output_path: Path) -> int:
+        """Export rows to a Parquet file (all columns as strings), one row group per chunk."""
+        schema = pa.schema([(column, pa.string()) for column in self.EXPORT_COLUMNS])
+        row_count = 0
+        with pq.ParquetWriter(str(output_path), schema) as writer:
+            for chunk in chunks:
+                columns = {
+                    column: [str(value) for value in chunk[column]]
+                    for column in self.EXPORT_COLUMNS
+                }
+                writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+                row_count += len(chunk['_content_type'])
+        return row_count
+
+    @staticmethod
+    def _chain_first(first, rest: Iterator) -> Iterator:
+        """Yield an element taken off an iterator to check for emptiness, then the rest."""
+        yield first
+        yield from rest
 
     def _get_material_color(self, content_type: str) -> str:
         """Get RGB color code for material type."""
@@ -337,20 +833,55 @@ class Section232Exporter:
         return color_map.get(content_type, '000000')
 
 
+def _init_export_worker():
+    """Send a worker process's status output to stderr; a caller's stdout may carry data."""
+    sys.stdout = sys.stderr
+
+
+def _export_file_in_worker(input_folder: str, output_folder: str, db_path: str, output_format: str,
+                           csv_path: str, items: List[Dict],
+                           materials: Dict[str, Optional[Tuple]]) -> Tuple[Optional[str], int]:
+    """
+    Export one CSV in a worker process.
+
+    Args:
+        items: Rows of the CSV, read by the parent
+        materials: Material rows of the CSV's parts, looked up by the parent
+
+    Returns:
+        Tuple of (output file name or None, row count)
+    """
+    exporter = Section232Exporter(Path(input_folder), Path(output_folder), Path(db_path),
+                                  output_format=output_format)
+    exporter._materials_cache = materials
+    output_path, row_count = exporter._export_file(Path(csv_path), items)
+    return (output_path.name if output_path else None), row_count
+
+
 def main():
     """Command-line interface for Section 232 exporter."""
     import sys
     from pathlib import Path
 
-    if len(sys.argv) < 4:
-        print("Usage: python section232_exporter.py <input_folder> <output_folder> <db_path>")
-        sys.exit(1)
+    args = [arg for arg in sys.argv[1:] if not arg.startswith('--')]
+    options = [arg for arg in sys.argv[1:] if arg.startswith('--')]
 
-    input_folder = Path(sys.argv[1])
-    output_folder = Path(sys.argv[2])
-    db_path = Path(sys.argv[3])
+    if len(args) < 3:
+        print("Usage: python section232_exporter.py <input_folder> <output_folder> <db_path> "
+              "[--incremental] [--workers=N]")
+        sys.exit(1)
 
-    exporter = Section232Exporter(input_folder, output_folder, db_path)
+    input_folder = Path(args[0])
+    output_folder = Path(args[1])
+    db_path = Path(args[2])
+    incremental = '--incremental' in options
+    workers = 1
+    for option in options:
+        if option.startswith('--workers='):
+            workers = int(option.split('=', 1)[1])
+
+    exporter = Section232Exporter(input_folder, output_folder, db_path,
+                                  incremental=incremental, workers=workers)
     count = exporter.process_all()
     print(f"\nSection 232 export complete: {count} files processed")
 
@@ -2,6 +2,10 @@
 OCRMill Statistics Tracker
 
 Tracks usage events and provides processing statistics.
+
+Dashboard queries read the usage_daily_rollup table, which a trigger keeps
+current as events are inserted, so they cost one small GROUP BY regardless
+of how many raw events are stored. Periods therefore cover whole days.
 """
 
 import json
@@ -126,6 +130,11 @@ class StatisticsTracker:
             user_name
         )
 
+    @staticmethod
+    def _cutoff_day(days: int) -> str:
+        """First day (YYYY-MM-DD) included in a period of the given length."""
+        return (datetime.now() - timedelta(days=days)).date().isoformat()
+
     def get_event_counts(self, days: int = 30) -> Dict[str, int]:
         """Get counts by event type for the specified period."""
         return self.db.get_event_counts(days=days)
@@ -169,85 +178,74 @@ class StatisticsTracker:
 
     def get_template_usage(self, days: int = 30) -> Dict[str, int]:
         """Get template usage counts for the period."""
-        events = self.get_usage_statistics(
-            event_type=EventTypes.TEMPLATE_USED,
-            days=days
-        )
-
-        template_counts = {}
-        for event in events:
-            try:
-                data = json.loads(event.get('event_data', '{}'))
-                template = data.get('template_name', 'Unknown')
-                template_counts[template] = template_counts.get(template, 0) + 1
-            except Exception:
-                pass
+        self.db.flush_events()
+        cursor = self.db.conn.execute("""
+            SELECT
+                CASE WHEN template_name = '' THEN 'Unknown' ELSE template_name END as template,
+                SUM(event_count) as uses
+            FROM usage_daily_rollup
+            WHERE event_type = ? AND day >= ?
+            GROUP BY template
+        """, (EventTypes.TEMPLATE_USED, self._cutoff_day(days)))
 
-        return template_counts
+        return {row['template']: row['uses'] for row in cursor.fetchall()}
 
     def get_user_statistics(self, days: int = 30) -> Dict[str, Dict]:
         """Get per-user statistics for the period."""
-        events = self.get_usage_statistics(days=days)
-
-        user_stats = {}
-        for event in events:
-            user = event.get('user_name') or 'Unknown'
-            if user not in user_stats:
-                user_stats[user] = {
-                    'event_count': 0,
-                    'pdfs_processed': 0,
-                    'exports': 0,
-                    'last_activity': None
-                }
-
-            user_stats[user]['event_count'] += 1
-
-            event_type = event.get('event_type')
-            if event_type == EventTypes.PDF_PROCESSED:
-                user_stats[user]['pdfs_processed'] += 1
-            elif event_type == EventTypes.EXPORT_COMPLETED:
-                user_stats[user]['exports'] += 1
-
-            # Track last activity
-            timestamp = event.get('timestamp')
-            if timestamp:
-                if (user_stats[user]['last_activity'] is None or
-                    timestamp > user_stats[user]['last_activity']):
-                    user_stats[user]['last_activity'] = timestamp
-
-        return user_stats
+        self.db.flush_events()
+        cursor = self.db.conn.execute("""
+            SELECT
+                CASE WHEN user_name = '' THEN 'Unknown' ELSE user_name END as user,
+                SUM(event_count) as event_count,
+                SUM(CASE WHEN event_type = ? THEN event_count ELSE 0 END) as pdfs_processed,
+                SUM(CASE WHEN event_type = ? THEN event_count ELSE 0 END) as exports,
+                MAX(last_timestamp) as last_activity
+            FROM usage_daily_rollup
+            WHERE day >= ?
+            GROUP BY user
+        """, (EventTypes.PDF_PROCESSED, EventTypes.EXPORT_COMPLETED, self._cutoff_day(days)))
+
+        return {
+            row['user']: {
+                'event_count': row['event_count'],
+                'pdfs_processed': row['pdfs_processed'],
+                'exports': row['exports'],
+                'last_activity': row['last_activity']
+            }
+            for row in cursor.fetchall()
+        }
 
     def get_daily_activity(self, days: int = 30) -> List[Dict]:
         """Get daily activity counts for the period."""
-        cutoff_date = (datetime.now() - timedelta(days=days)).isoformat()
-
+        self.db.flush_events()
         cursor = self.db.conn.execute("""
             SELECT
-                DATE(timestamp) as activity_date,
-                COUNT(*) as event_count,
-                COUNT(CASE WHEN event_type = ? THEN 1 END) as pdfs_processed,
-                COUNT(CASE WHEN event_type = ? THEN 1 END) as exports
-            FROM usage_statistics
-            WHERE timestamp >= ?
-            GROUP BY DATE(timestamp)
+                day as activity_date,
+                SUM(event_count) as event_count,
+                SUM(CASE WHEN event_type = ? THEN event_count ELSE 0 END) as pdfs_processed,
+                SUM(CASE WHEN event_type = ? THEN event_count ELSE 0 END) as exports
+            FROM usage_daily_rollup
+            WHERE day >= ?
+            GROUP BY day
             ORDER BY activity_date DESC
-        """, (EventTypes.PDF_PROCESSED, EventTypes.EXPORT_COMPLETED, cutoff_date))
+        """, (EventTypes.PDF_PROCESSED, EventTypes.EXPORT_COMPLETED, self._cutoff_day(days)))
 
         return [dict(row) for row in cursor.fetchall()]
 
     def get_all_time_totals(self) -> Dict:
-        """Get all-time statistics totals."""
+        """Get all-time statistics totals (includes events already pruned by cleanup)."""
+        self.db.flush_events()
         cursor = self.db.conn.execute("""
             SELECT
-                COUNT(*) as total_events,
-                COUNT(CASE WHEN event_type = ? THEN 1 END) as total_pdfs,
-                COUNT(CASE WHEN event_type = ? THEN 1 END) as total_exports,
-                COUNT(CASE WHEN event_type = ? THEN 1 END) as total_cbp_exports,
-                COUNT(CASE WHEN event_type = ? THEN 1 END) as hts_matches,
-                COUNT(DISTINCT user_name) as unique_users,
-                MIN(timestamp) as first_event,
-                MAX(timestamp) as last_event
-            FROM usage_statistics
+                SUM(event_count) as total_events,
+                SUM(CASE WHEN event_type = ? THEN event_count ELSE 0 END) as total_pdfs,
+                SUM(CASE WHEN event_type = ? THEN event_count ELSE 0 END) as total_exports,
+                SUM(CASE WHEN event_type = ? THEN event_count ELSE 0 END) as total_cbp_exports,
+                SUM(CASE WHEN event_type = ? THEN event_count ELSE 0 END) as hts_matches,
+                COUNT(DISTINCT NULLIF(user_name, '')) as unique_users,
+                MIN(first_timestamp) as first_event,
+                MAX(last_timestamp) as last_event
+            FROM usage_daily_rollup
         """, (EventTypes.PDF_PROCESSED, EventTypes.EXPORT_COMPLETED,
               EventTypes.CBP_EXPORT, EventTypes.HTS_MATCH_FOUND))
 
@@ -264,8 +262,33 @@ class StatisticsTracker:
             'tracking_since': row['first_event']
         }
 
+    def get_stage_timings(self, days: int = 30) -> List[Dict]:
+        """Get p50/p95 duration of each processing stage for the period."""
+        return self.db.get_stage_percentiles(days=days)
+
+    def get_template_timings(self, days: int = 30) -> Dict[str, Dict]:
+        """
+        Get per-template timings for the period.
+
+        Returns:
+            Dict of template name -> {'score': row, 'extraction': row}, where each
+            row has samples, p50_ms and p95_ms (or is None if there are no samples)
+        """
+        timings = {}
+        for row in self.db.get_stage_percentiles(days=days, by_template=True):
+            if row['stage'] == 'template_score':
+                key = 'score'
+            elif row['stage'] == 'extraction':
+                key = 'extraction'
+            else:
+                continue
+            name = row['template_name'] or 'Unknown'
+            timings.setdefault(name, {'score': None, 'extraction': None})[key] = row
+        return timings
+
     def get_recent_activity(self, limit: int = 20) -> List[Dict]:
         """Get the most recent activity events."""
+        self.db.flush_events()
         cursor = self.db.conn.execute("""
             SELECT event_type, event_data, user_name, timestamp
             FROM usage_statistics
@@ -285,13 +308,22 @@ class StatisticsTracker:
         return events
 
     def cleanup_old_events(self, days_to_keep: int = 365) -> int:
-        """Remove events older than specified days. Returns count deleted."""
+        """
+        Remove raw events older than specified days. Returns count deleted.
+
+        Daily rollups are not touched, so dashboard totals keep the full history.
+        Stage timing samples older than the cutoff are removed as well.
+        """
         cutoff_date = (datetime.now() - timedelta(days=days_to_keep)).isoformat()
 
         cursor = self.db.conn.execute(
             "DELETE FROM usage_statistics WHERE timestamp < ?",
             (cutoff_date,)
         )
+        self.db.conn.execute(
+            "DELETE FROM stage_metrics WHERE recorded_at < ?",
+            (cutoff_date,)
+        )
         self.db.conn.commit()
 
         count = cursor.rowcount
@@ -5,6 +5,11 @@ Dynamically discovers and loads templates from this directory.
 
 Template Priority: Local templates take priority over shared templates.
 Shared templates are used as fallback if a template is not found locally.
+
+Discovery keeps a manifest of template files (size, mtime, SHA-256, class name
+and class metadata) in cache/template_manifest.json. Only new or changed files
+are executed on startup and refresh; the rest are imported the first time a
+template is actually scored.
 """
 
 import os
@@ -12,13 +17,15 @@ import importlib
 import importlib.util
 import sys
 import json
+import hashlib
+import threading
+from collections.abc import MutableMapping
 from pathlib import Path
+from typing import Optional
 
+from config_manager import APP_PATH
 from .base_template import BaseTemplate
 
-# Registry of all available templates (populated dynamically)
-TEMPLATE_REGISTRY = {}
-
 # Track template sources (template_name -> 'local' or 'shared')
 TEMPLATE_SOURCES = {}
 
@@ -28,6 +35,23 @@ EXCLUDED_FILES = {'__init__.py', 'base_template.py', 'sample_template.py'}
 # Shared templates folder path (loaded from settings)
 _shared_templates_folder = None
 
+# Callbacks run after refresh_templates() (e.g. to drop cached extraction results)
+_refresh_listeners = []
+
+# Manifest of template source files, so unchanged templates are not re-executed
+MANIFEST_FILE = APP_PATH / "cache" / "template_manifest.json"
+MANIFEST_VERSION = 1
+
+# Class attributes stored in the manifest and served without importing the template
+MANIFEST_ATTRIBUTES = ('name', 'description', 'client', 'version', 'enabled',
+                       'extra_columns', 'fingerprint_keywords', 'max_confidence_score')
+
+# Manifest contents, loaded on first discovery (see _load_manifest)
+_manifest = None
+
+# Serializes lazy template imports (templates are used from worker threads)
+_load_lock = threading.RLock()
+
 
 def set_shared_templates_folder(folder_path: str):
     """Set the shared templates folder path."""
@@ -54,29 +78,213 @@ def get_shared_templates_folder() -> str:
     return _shared_templates_folder or ''
 
 
-def _load_template_from_file(file_path: Path, module_name: str) -> bool:
+class _TemplateEntry:
+    """A discovered template: where it came from, its class metadata and (once imported) its class."""
+
+    def __init__(self, module_name: str, file_path, class_name: str, metadata: dict, template_class=None):
+        self.module_name = module_name
+        self.file_path = file_path
+        self.class_name = class_name
+        self.metadata = metadata
+        self.template_class = template_class
+
+    @classmethod
+    def from_class(cls, module_name: str, template_class, file_path=None) -> '_TemplateEntry':
+        """Entry for an already imported template class."""
+        return cls(module_name, file_path, template_class.__name__,
+                   _class_metadata(template_class), template_class)
+
+    def load_class(self):
+        """The template class, importing its module on first use."""
+        with _load_lock:
+            if self.template_class is None:
+                module = _import_template_module(self.file_path, self.module_name, reuse=True)
+                template_class = getattr(module, self.class_name, None)
+                if not (isinstance(template_class, type) and issubclass(template_class, BaseTemplate)):
+                    raise ImportError(f"{self.file_path} no longer defines {self.class_name}")
+                self.template_class = template_class
+            return self.template_class
+
+
+class _TemplateRegistry(MutableMapping):
     """
-    Load a single template from a file path.
-    Returns True if successfully loaded and registered.
+    Template name -> template class.
+
+    Backed by manifest entries, so a template's module is only imported when
+    its class is first looked up.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def __getitem__(self, name: str):
+        return self._entries[name].load_class()
+
+    def __setitem__(self, name: str, template_class):
+        self._entries[name] = _TemplateEntry.from_class(name, template_class)
+
+    def __delitem__(self, name: str):
+        del self._entries[name]
+
+    def __contains__(self, name) -> bool:
+        return name in self._entries
+
+    def __iter__(self):
+        return iter(self._entries)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        self._entries.clear()
+
+    def entries(self) -> dict:
+        """Template name -> _TemplateEntry, in discovery order."""
+        return dict(self._entries)
+
+
+class LazyTemplate:
+    """
+    Stand-in for a template instance that creates the instance on first use.
+
+    Class metadata (name, version, enabled, fingerprint_keywords,
+    max_confidence_score, ...) is answered from the manifest, so templates
+    that are disabled or ruled out by their fingerprint keywords are never
+    imported or instantiated. Any other attribute creates the instance.
+    """
+
+    def __init__(self, entry: _TemplateEntry):
+        self._entry = entry
+        self._instance = None
+
+    @property
+    def instance(self) -> BaseTemplate:
+        """The real template instance."""
+        if self._instance is None:
+            self._instance = self._entry.load_class()()
+        return self._instance
+
+    def matches_fingerprint(self, text_lower: str) -> bool:
+        """BaseTemplate.matches_fingerprint(), without instantiating the template if possible."""
+        if self._instance is not None or not self._entry.metadata.get('default_fingerprint', False):
+            return self.instance.matches_fingerprint(text_lower)
+        keywords = self._entry.metadata.get('fingerprint_keywords') or []
+        if not keywords:
+            return True
+        return any(keyword in text_lower for keyword in keywords)
+
+    def __getattr__(self, attr):
+        entry = self.__dict__.get('_entry')
+        if entry is None:
+            raise AttributeError(attr)
+        if self.__dict__.get('_instance') is None and attr in MANIFEST_ATTRIBUTES and attr in entry.metadata:
+            return entry.metadata[attr]
+        return getattr(self.instance, attr)
+
+    def __repr__(self):
+        return f"<LazyTemplate {self._entry.module_name} ({self._entry.class_name})>"
+
+
+# Registry of all available templates (populated dynamically)
+TEMPLATE_REGISTRY = _TemplateRegistry()
+
+
+def _class_metadata(template_class) -> dict:
+    """Manifest metadata for a template class (class attributes only, JSON-serializable)."""
+    metadata = {}
+    for attr in MANIFEST_ATTRIBUTES:
+        value = getattr(template_class, attr, None)
+        if isinstance(value, (list, tuple, set)):
+            value = [str(v) for v in value]
+        elif value is not None and not isinstance(value, (str, bool, int, float)):
+            continue
+        metadata[attr] = value
+    metadata['default_fingerprint'] = template_class.matches_fingerprint is BaseTemplate.matches_fingerprint
+    return metadata
+
+
+def _file_sha256(file_path: Path) -> str:
+    """SHA-256 hex digest of a file's contents."""
+    return hashlib.sha256(file_path.read_bytes()).hexdigest()
+
+
+def _load_manifest() -> dict:
+    """
+    The template manifest: source file path -> size, mtime, SHA-256, class name and metadata.
+
+    Loaded from MANIFEST_FILE once per process. Records are discarded wholesale
+    if base_template.py changed, since class metadata may come from its defaults.
+    """
+    global _manifest
+    if _manifest is not None:
+        return _manifest
+
+    base_digest = _file_sha256(Path(__file__).parent / 'base_template.py')
+    _manifest = {'version': MANIFEST_VERSION, 'base_sha256': base_digest, 'files': {}}
+    try:
+        with open(MANIFEST_FILE, 'r', encoding='utf-8') as f:
+            stored = json.load(f)
+        if (stored.get('version') == MANIFEST_VERSION and stored.get('base_sha256') == base_digest
+                and isinstance(stored.get('files'), dict)):
+            _manifest['files'] = stored['files']
+    except (OSError, ValueError):
+        pass
+    return _manifest
+
+
+def _save_manifest():
+    """Write the template manifest (atomically), ignoring unwritable locations."""
+    try:
+        MANIFEST_FILE.parent.mkdir(parents=True, exist_ok=True)
+        # Per-process name: extraction pool processes may save the manifest concurrently
+        tmp_path = MANIFEST_FILE.with_name(f"{MANIFEST_FILE.name}.{os.getpid()}.tmp")
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(_manifest, f, indent=1)
+        os.replace(tmp_path, MANIFEST_FILE)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Warning: Could not save template manifest: {e}")
+
+
+def _import_template_module(file_path: Path, module_name: str, reuse: bool = False):
+    """
+    Execute a template file as templates.<module_name> and return the module.
+
+    Args:
+        file_path: Template source file
+        module_name: Module name within the templates package
+        reuse: Return the module already in sys.modules if it was loaded from file_path
     """
     full_module_name = f"templates.{module_name}"
 
+    existing = sys.modules.get(full_module_name)
+    if reuse and existing is not None and getattr(existing, '__file__', None) == str(file_path):
+        return existing
+
+    # Remove from cache if already loaded (force reload)
+    if full_module_name in sys.modules:
+        del sys.modules[full_module_name]
+
+    spec = importlib.util.spec_from_file_location(full_module_name, file_path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot load {file_path}")
+
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[full_module_name] = module
     try:
-        # Remove from cache if already loaded (force reload)
-        if full_module_name in sys.modules:
-            del sys.modules[full_module_name]
-
-        # Load the module fresh
-        spec = importlib.util.spec_from_file_location(
-            full_module_name,
-            file_path
-        )
-        if spec is None or spec.loader is None:
-            return False
-
-        module = importlib.util.module_from_spec(spec)
-        sys.modules[full_module_name] = module
         spec.loader.exec_module(module)
+    except BaseException:
+        del sys.modules[full_module_name]
+        raise
+    return module
+
+
+def _load_template_from_file(file_path: Path, module_name: str) -> Optional[_TemplateEntry]:
+    """
+    Load a single template from a file path.
+    Returns its entry if the file defines a template class, otherwise None.
+    """
+    try:
+        module = _import_template_module(file_path, module_name)
 
         # Find template class (class that inherits from BaseTemplate)
         for attr_name in dir(module):
@@ -84,19 +292,71 @@ def _load_template_from_file(file_path: Path, module_name: str) -> bool:
             if (isinstance(attr, type) and
                 issubclass(attr, BaseTemplate) and
                 attr is not BaseTemplate):
-                # Register the template
-                TEMPLATE_REGISTRY[module_name] = attr
-                return True
+                return _TemplateEntry.from_class(module_name, attr, file_path)
 
     except Exception as e:
         print(f"Warning: Failed to load template {module_name}: {e}")
 
-    return False
+    return None
+
+
+def _scan_template(file_path: Path, module_name: str, previous: dict) -> Optional[_TemplateEntry]:
+    """
+    Get the entry for a template file, executing it only if it changed.
+
+    A file whose size and mtime match its manifest record is not read at all;
+    if only the mtime changed (e.g. the file was copied or touched), its hash
+    decides. Unchanged templates keep a class that is already imported.
+
+    Args:
+        file_path: Template source file
+        module_name: Module name within the templates package
+        previous: Entries from the last discovery (module name -> _TemplateEntry)
+
+    Returns:
+        The template's entry, or None if it has no template class or fails to load
+    """
+    files = _manifest['files']
+    key = str(file_path)
+    try:
+        stat = file_path.stat()
+        record = files.get(key)
+        unchanged = (record is not None and record.get('module_name') == module_name
+                     and record.get('size') == stat.st_size and record.get('mtime_ns') == stat.st_mtime_ns)
+        digest = None
+        if not unchanged and record is not None and record.get('module_name') == module_name:
+            digest = _file_sha256(file_path)
+            if record.get('sha256') == digest:
+                record['size'], record['mtime_ns'] = stat.st_size, stat.st_mtime_ns
+                unchanged = True
+    except OSError as e:
+        print(f"Warning: Failed to load template {module_name}: {e}")
+        return None
+
+    if unchanged:
+        old = previous.get(module_name)
+        if old is not None and old.file_path == file_path and old.class_name == record['class_name']:
+            return old
+        return _TemplateEntry(module_name, file_path, record['class_name'], record['metadata'])
+
+    entry = _load_template_from_file(file_path, module_name)
+    if entry is None:
+        files.pop(key, None)
+        return None
+    files[key] = {
+        'module_name': module_name,
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'sha256': digest or _file_sha256(file_path),
+        'class_name': entry.class_name,
+        'metadata': entry.metadata,
+    }
+    return entry
 
 
 def _discover_templates():
     """
-    Dynamically discover and load all template classes.
+    Discover all template classes, using the manifest to skip unchanged files.
 
     Priority order (local templates take precedence):
     1. Local templates folder - these take priority for development
@@ -106,17 +366,19 @@ def _discover_templates():
     - Be .py files in the templates directory
     - Contain a class that inherits from BaseTemplate
     - Not be in EXCLUDED_FILES
+
+    Only new or changed template files are executed; the others are
+    registered from their manifest record and imported on first use.
     """
-    global TEMPLATE_REGISTRY, TEMPLATE_SOURCES
+    _load_manifest()
+    previous = TEMPLATE_REGISTRY.entries()
     TEMPLATE_REGISTRY.clear()
     TEMPLATE_SOURCES.clear()
+    files_before = json.dumps(_manifest['files'], sort_keys=True)
 
     local_templates_dir = Path(__file__).parent
     shared_folder = get_shared_templates_folder()
 
-    # Track which templates have been loaded (to avoid duplicates)
-    loaded_templates = set()
-
     # FIRST: Load local templates (they take priority)
     for file_path in local_templates_dir.glob('*.py'):
         if file_path.name in EXCLUDED_FILES:
@@ -127,8 +389,9 @@ def _discover_templates():
             continue
 
         module_name = file_path.stem
-        if _load_template_from_file(file_path, module_name):
-            loaded_templates.add(module_name)
+        entry = _scan_template(file_path, module_name, previous)
+        if entry is not None:
+            TEMPLATE_REGISTRY._entries[module_name] = entry
             TEMPLATE_SOURCES[module_name] = 'local'
 
     # SECOND: Load shared templates (only if not already loaded locally)
@@ -146,14 +409,23 @@ def _discover_templates():
                 module_name = file_path.stem
 
                 # Skip if already loaded from local folder
-                if module_name in loaded_templates:
+                if module_name in TEMPLATE_REGISTRY:
                     continue
 
-                if _load_template_from_file(file_path, module_name):
-                    loaded_templates.add(module_name)
+                entry = _scan_template(file_path, module_name, previous)
+                if entry is not None:
+                    TEMPLATE_REGISTRY._entries[module_name] = entry
                     TEMPLATE_SOURCES[module_name] = 'shared'
                     print(f"Loaded shared template (fallback): {module_name}")
 
+    # Forget files that were deleted (or belong to a shared folder no longer in use)
+    scanned = {str(entry.file_path) for entry in TEMPLATE_REGISTRY.entries().values()}
+    for key in [key for key in _manifest['files'] if key not in scanned]:
+        del _manifest['files'][key]
+
+    if json.dumps(_manifest['files'], sort_keys=True) != files_before:
+        _save_manifest()
+
 
 def sync_templates_to_shared() -> dict:
     """
@@ -244,6 +516,17 @@ def refresh_templates():
     Call this to pick up new templates or remove deleted ones.
     """
     _discover_templates()
+    for callback in list(_refresh_listeners):
+        try:
+            callback()
+        except Exception as e:
+            print(f"Warning: Template refresh listener failed: {e}")
+
+
+def add_refresh_listener(callback):
+    """Register a callback to run after refresh_templates()."""
+    if callback not in _refresh_listeners:
+        _refresh_listeners.append(callback)
 
 
 def get_template(name: str) -> BaseTemplate:
@@ -256,10 +539,15 @@ def get_template(name: str) -> BaseTemplate:
 
 
 def get_all_templates() -> dict:
-    """Get all available templates."""
+    """
+    Get all available templates.
+
+    Values are LazyTemplate stand-ins: each template is imported and
+    instantiated the first time something other than its metadata is used.
+    """
     if not TEMPLATE_REGISTRY:
         _discover_templates()
-    return {name: cls() for name, cls in TEMPLATE_REGISTRY.items()}
+    return {name: LazyTemplate(entry) for name, entry in TEMPLATE_REGISTRY.entries().items()}
 
 
 def register_template(name: str, template_class):
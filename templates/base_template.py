@@ -30,6 +30,21 @@ class BaseTemplate(ABC):
     
     # CSV columns this template produces (in addition to standard columns)
     extra_columns: List[str] = []
+
+    # Template selection prefilter (see ProcessorEngine.get_best_template):
+    # lowercase substrings of which at least one must appear in the lowercased
+    # text for can_process() to succeed. Leave empty if there is no such keyword.
+    fingerprint_keywords: List[str] = []
+
+    # Highest value get_confidence_score() can return. Templates whose maximum
+    # cannot beat the best score found so far are not scored at all.
+    max_confidence_score: float = 1.0
+
+    # Whether extracted line items may be served from the extraction cache.
+    # Set to False if extraction reads data that can change without the PDF or
+    # template changing (e.g. part mapping tables in a database); page text is
+    # still cached.
+    cache_items: bool = True
     
     # Standard columns all templates must produce
     STANDARD_COLUMNS = [
@@ -126,6 +141,20 @@ class BaseTemplate(ABC):
         """
         return 'packing list' in text.lower()
     
+    def matches_fingerprint(self, text_lower: str) -> bool:
+        """
+        Cheap prefilter run before get_confidence_score().
+
+        Args:
+            text_lower: Full text extracted from the PDF, lowercased
+
+        Returns:
+            bool: False only if this template certainly cannot process the text
+        """
+        if not self.fingerprint_keywords:
+            return True
+        return any(keyword in text_lower for keyword in self.fingerprint_keywords)
+
     def get_confidence_score(self, text: str) -> float:
         """
         Return a confidence score for how well this template matches.
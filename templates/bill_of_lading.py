@@ -26,6 +26,10 @@ class BillOfLadingTemplate(BaseTemplate):
     # BOL doesn't produce line items - it provides metadata
     extra_columns = []
 
+    # Template selection prefilter
+    # Never selected as the primary template (see get_confidence_score)
+    max_confidence_score = 0.0
+
     def can_process(self, text: str) -> bool:
         """
         Check if this document is a Bill of Lading.
@@ -36,6 +36,10 @@ class CoexpoIcatSaTemplate(BaseTemplate):
         "vidales larrañaga"
     ]
 
+    # Template selection prefilter
+    fingerprint_keywords = SUPPLIER_KEYWORDS
+    max_confidence_score = 0.98
+
     def can_process(self, text: str) -> bool:
         """Check if this is a ICAT S.A. DE C.V. invoice."""
         text_lower = text.lower()
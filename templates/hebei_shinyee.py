@@ -30,6 +30,10 @@ class HebeiShinyeeTemplate(BaseTemplate):
         "commercial invoice"
     ]
 
+    # Template selection prefilter
+    fingerprint_keywords = SUPPLIER_KEYWORDS
+    max_confidence_score = 0.8
+
     def can_process(self, text: str) -> bool:
         """Check if this is a Hebei Shinyee Trade Co invoice."""
         text_lower = text.lower()
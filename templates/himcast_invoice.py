@@ -22,6 +22,10 @@ class HimcastInvoiceTemplate(BaseTemplate):
 
     extra_columns = ['country']
 
+    # Template selection prefilter
+    fingerprint_keywords = ['himgiri castings']
+    max_confidence_score = 1.0
+
     def can_process(self, text: str) -> bool:
         """Check if this template can process the invoice."""
         text_lower = text.lower()
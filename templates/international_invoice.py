@@ -30,6 +30,10 @@ class InternationalInvoiceTemplate(BaseTemplate):
 
     extra_columns = ['unit_price', 'description', 'hs_code', 'country_of_origin', 'net_weight']
 
+    # Template selection prefilter
+    fingerprint_keywords = ['commercial invoice', 'export invoice', 'proforma invoice']
+    max_confidence_score = 0.75
+
     def can_process(self, text: str) -> bool:
         """Check if this is an international commercial invoice."""
         text_lower = text.lower()
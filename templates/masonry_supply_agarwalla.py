@@ -236,6 +236,13 @@ class MasonrySupplyAgarwallaTemplate(BaseTemplate):
 
     extra_columns = ['po_date', 'hs_code', 'country_origin', 'unit_price']
 
+    # Template selection prefilter
+    fingerprint_keywords = ['masonry supply']
+    max_confidence_score = 1.0
+
+    # Items depend on the msi_sigma_parts and parts_master tables
+    cache_items = False
+
     def can_process(self, text: str) -> bool:
         """Check if this template can process the given invoice."""
         text_lower = text.lower()
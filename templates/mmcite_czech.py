@@ -33,6 +33,10 @@ class MMCiteCzechTemplate(BaseTemplate):
         'net_weight',
         'bol_gross_weight'
     ]
+
+    # Template selection prefilter
+    fingerprint_keywords = ['mmcité']
+    max_confidence_score = 1.0
     
     def can_process(self, text: str) -> bool:
         """Check if this is a mmcité Czech invoice."""
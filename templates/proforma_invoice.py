@@ -29,6 +29,10 @@ class ProformaInvoiceTemplate(BaseTemplate):
 
     extra_columns = ['unit_price', 'description', 'hs_code']
 
+    # Template selection prefilter
+    fingerprint_keywords = ['proforma', 'pro forma', 'pro-forma']
+    max_confidence_score = 0.8
+
     def can_process(self, text: str) -> bool:
         """Check if this is a proforma invoice."""
         text_lower = text.lower()
@@ -48,6 +48,10 @@ class SampleTemplate(BaseTemplate):
         # 'tax_rate',
         # 'custom_field'
     ]
+
+    # Template selection prefilter
+    fingerprint_keywords = ['sample company']
+    max_confidence_score = 1.0
     
     def can_process(self, text: str) -> bool:
         """
@@ -38,6 +38,13 @@ class SeksariaFoundriesTemplate(BaseTemplate):
         'sfl/'
     ]
 
+    # Template selection prefilter
+    fingerprint_keywords = SUPPLIER_KEYWORDS
+    max_confidence_score = 0.95
+
+    # Items depend on the msi_sigma_parts mapping table
+    cache_items = False
+
     def __init__(self):
         super().__init__()
         self.msi_sigma_mappings = {}  # msi_part -> sigma_part
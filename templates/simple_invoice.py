@@ -28,6 +28,10 @@ class SimpleInvoiceTemplate(BaseTemplate):
 
     extra_columns = ['description']
 
+    # Template selection prefilter
+    fingerprint_keywords = ['invoice', 'bill']
+    max_confidence_score = 0.55
+
     def can_process(self, text: str) -> bool:
         """Check if this is a simple invoice format."""
         text_lower = text.lower()
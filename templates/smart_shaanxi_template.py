@@ -40,6 +40,10 @@ class SmartShaanxiTemplateTemplate(BaseTemplate):
         'shaanxi province',
     ]
 
+    # Template selection prefilter
+    fingerprint_keywords = SUPPLIER_KEYWORDS
+    max_confidence_score = 1.0
+
     def __init__(self):
         super().__init__()
         self._last_result = None
@@ -59,6 +59,10 @@ class SmartUniversalTemplate(BaseTemplate):
 
     extra_columns = ['unit_price', 'description', 'confidence']
 
+    # Template selection prefilter
+    # Fallback for any invoice: no fingerprint keywords
+    max_confidence_score = 0.6
+
     # Known company patterns that indicate a commercial invoice
     INVOICE_INDICATORS = [
         r'\binvoice\b',
@@ -30,6 +30,10 @@ class StandardInvoiceTemplate(BaseTemplate):
 
     extra_columns = ['unit_price', 'description']
 
+    # Template selection prefilter
+    fingerprint_keywords = ['invoice']
+    max_confidence_score = 0.7
+
     def can_process(self, text: str) -> bool:
         """Check if this is a standard commercial invoice."""
         text_lower = text.lower()
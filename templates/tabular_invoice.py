@@ -28,6 +28,10 @@ class TabularInvoiceTemplate(BaseTemplate):
 
     extra_columns = ['unit_price', 'description', 'uom']
 
+    # Template selection prefilter
+    fingerprint_keywords = ['invoice']
+    max_confidence_score = 0.65
+
     # Expected table headers (case-insensitive matching)
     EXPECTED_HEADERS = [
         'item', 'part', 'code', 'sku', 'product',
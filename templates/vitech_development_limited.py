@@ -25,6 +25,10 @@ class VitechDevelopmentLimitedTemplate(BaseTemplate):
 
     extra_columns = ['po_number', 'packages', 'hs_code', 'country_origin', 'net_weight', 'gross_weight', 'dimensions', 'unit_price']
 
+    # Template selection prefilter
+    fingerprint_keywords = ['vitech development limited', 'hfvt25-']
+    max_confidence_score = 1.0
+
     def can_process(self, text: str) -> bool:
         """Check if this template can process the given invoice."""
         text_lower = text.lower()
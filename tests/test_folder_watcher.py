@@ -0,0 +1,52 @@
+"""
+Tests for FolderWatcher settling of files that never look complete.
+"""
+
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from folder_watcher import FolderWatcher
+
+
+def wait_for(watcher: FolderWatcher, timeout: float = 5.0):
+    """Collect reported files until the watcher has nothing pending or the timeout passes."""
+    reported = []
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        reported.extend(watcher.wait_for_files(timeout=0.1))
+        if reported and not watcher.has_pending():
+            break
+    return reported
+
+
+def test_empty_pdf_is_reported_and_not_pending(tmp_path):
+    pdf = tmp_path / "empty.pdf"
+    pdf.write_bytes(b"")
+    watcher = FolderWatcher(tmp_path, rescan_interval=1, settle_seconds=0.05, use_events=False)
+
+    assert wait_for(watcher) == [pdf]
+    assert not watcher.has_pending()
+
+
+def test_unreadable_pdf_is_reported_and_not_pending(tmp_path, monkeypatch):
+    pdf = tmp_path / "locked.pdf"
+    pdf.write_bytes(b"%PDF-1.4\n%%EOF\n")
+    monkeypatch.setattr(FolderWatcher, "_is_readable", staticmethod(lambda path: False))
+    watcher = FolderWatcher(tmp_path, rescan_interval=1, settle_seconds=0.05, use_events=False)
+
+    assert wait_for(watcher) == [pdf]
+    assert not watcher.has_pending()
+
+
+def test_complete_pdf_is_reported_after_settling(tmp_path):
+    pdf = tmp_path / "invoice.pdf"
+    pdf.write_bytes(b"%PDF-1.4\n%%EOF\n")
+    watcher = FolderWatcher(tmp_path, rescan_interval=1, settle_seconds=0.05, use_events=False)
+
+    start = time.monotonic()
+    assert wait_for(watcher) == [pdf]
+    assert time.monotonic() - start < 0.5
+    assert not watcher.has_pending()
@@ -0,0 +1,75 @@
+"""
+Tests for the ocrmill_cli JSON-lines progress stream.
+"""
+
+import csv
+import json
+import sqlite3
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO_ROOT = Path(__file__).parent.parent
+
+
+def write_processed_csvs(folder: Path, count: int):
+    """Write small processed-invoice CSVs as produced by ProcessorEngine.save_to_csv."""
+    folder.mkdir()
+    fields = ['invoice_number', 'project_number', 'part_number', 'description', 'quantity', 'total_price',
+              'net_weight']
+    for n in range(count):
+        with open(folder / f"INV{n}_PRJ{n}.csv", 'w', newline='', encoding='utf-8') as f:
+            writer = csv.DictWriter(f, fieldnames=fields)
+            writer.writeheader()
+            for part in ('STEEL-1', 'MIXED-2', 'UNKNOWN-3'):
+                writer.writerow({'invoice_number': f"INV{n}", 'project_number': f"PRJ{n}", 'part_number': part,
+                                 'description': part, 'quantity': '2', 'total_price': '100.00',
+                                 'net_weight': '10.0'})
+
+
+def write_parts_database(db_path: Path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE parts_master (part_number TEXT PRIMARY KEY, steel_ratio REAL, "
+                 "aluminum_ratio REAL, non_steel_ratio REAL, qty_unit TEXT)")
+    conn.executemany("INSERT INTO parts_master VALUES (?, ?, ?, ?, ?)",
+                     [('STEEL-1', 100, 0, 0, 'KG'), ('MIXED-2', 40, 30, 30, 'NO')])
+    conn.commit()
+    conn.close()
+
+
+def test_parallel_export_writes_only_json_to_stdout(tmp_path):
+    pytest.importorskip("numpy")
+    write_processed_csvs(tmp_path / "processed", 4)
+    write_parts_database(tmp_path / "parts.db")
+
+    result = subprocess.run(
+        [sys.executable, str(REPO_ROOT / "ocrmill_cli.py"), 'export-232',
+         '--config', str(tmp_path / "config.json"), '--database', str(tmp_path / "parts.db"),
+         '--input', str(tmp_path / "processed"), '--output', str(tmp_path / "export"),
+         '--format', 'csv', '--workers', '2'],
+        capture_output=True, text=True, timeout=120, cwd=tmp_path)
+
+    assert result.returncode == 0, result.stderr
+    events = [json.loads(line) for line in result.stdout.splitlines()]
+    assert [e['event'] for e in events if e['event'] != 'file'] == ['start', 'done']
+    assert sum(1 for e in events if e['event'] == 'file' and e['rows']) == 4
+    assert events[-1]['exported'] == 4
+
+
+def test_serial_process_reports_total_up_front(tmp_path):
+    pytest.importorskip("pdfplumber")
+    pdfs = sorted((REPO_ROOT / "input" / "Failed").glob("*.pdf"))[:3]
+    if len(pdfs) < 3:
+        pytest.skip("sample PDFs not available")
+    (tmp_path / "config.json").write_text(json.dumps({'extraction_cache_enabled': False}))
+
+    result = subprocess.run(
+        [sys.executable, str(REPO_ROOT / "ocrmill_cli.py"), 'process', *map(str, pdfs),
+         '--config', str(tmp_path / "config.json"), '--database', str(tmp_path / "parts.db"),
+         '--output', str(tmp_path / "output"), '--workers', '1', '--no-move', '--quiet'],
+        capture_output=True, text=True, timeout=300, cwd=tmp_path)
+
+    files = [event for event in map(json.loads, result.stdout.splitlines()) if event['event'] == 'file']
+    assert [(event['done'], event['total']) for event in files] == [(1, 3), (2, 3), (3, 3)]
@@ -0,0 +1,43 @@
+"""
+Tests for the processing workers' handling of a crashed extraction pool.
+"""
+
+import sys
+from concurrent.futures import Future
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+pytest.importorskip("PyQt6")
+
+from core.workers import ProcessingQueueWorker
+
+
+def broken_future() -> Future:
+    future = Future()
+    future.set_exception(BrokenProcessPool("A child process terminated abruptly"))
+    return future
+
+
+def test_broken_pool_releases_lost_jobs(tmp_path):
+    engine = SimpleNamespace(log=lambda message: None, log_callback=None)
+    worker = ProcessingQueueWorker(engine, workers=2, config_file=tmp_path / "config.json")
+    pdfs = [tmp_path / "a.pdf", tmp_path / "b.pdf"]
+    assert worker.submit(pdfs, tmp_path / "out") == 2
+    worker._take_jobs(0)
+    worker._backlog = []
+    worker._pending = {broken_future(): pdf for pdf in pdfs}
+
+    progress = []
+    worker.progress.connect(lambda done, total: progress.append((done, total)))
+    worker._collect_results()
+
+    assert not worker._pending
+    assert not worker.is_busy()
+    assert progress[-1] == (2, 2)
+    # The files can be submitted again once the pool is rebuilt
+    assert worker.submit(pdfs, tmp_path / "out") == 2
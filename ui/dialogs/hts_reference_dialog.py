@@ -11,10 +11,11 @@ from PyQt6.QtWidgets import (
     QPushButton, QLineEdit, QLabel, QMessageBox, QFileDialog,
     QAbstractItemView, QGroupBox, QGridLayout, QFrame
 )
-from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from parts_database import PartsDatabase
+from fts_support import ensure_fts_index, quote_phrase, prefix_query
 from core.theme_manager import get_theme_manager
 
 # Path to the HTS database (copied from TariffMill)
@@ -22,7 +23,14 @@ HTS_DB_PATH = Path(__file__).parent.parent.parent / "Resources" / "hts.db"
 
 
 class HTSTableModel(QAbstractTableModel):
-    """Table model for HTS codes data."""
+    """
+    Table model for HTS codes data.
+
+    Rows are fetched in pages of PAGE_SIZE as the view scrolls. Searches use
+    FTS5 indexes created in hts.db on first use (a trigram index for substring
+    matches, a word index for ranking) and fall back to LIKE scans when the
+    database is read-only or FTS5 is unavailable.
+    """
 
     COLUMNS = [
         ("full_code", "HTS Code", 120),
@@ -31,63 +39,127 @@ class HTSTableModel(QAbstractTableModel):
         ("unit_of_quantity", "Unit", 80),
     ]
 
+    PAGE_SIZE = 500
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self._data = []
         self._hts_conn = None
+        self._trigram = False
+        self._words = False
+        self._query = None  # (sql, params) of the current result set, without LIMIT/OFFSET
+        self._match_count = 0
         self._connect_hts_db()
 
     def _connect_hts_db(self):
-        """Connect to the HTS database."""
+        """Connect to the HTS database and make sure its search indexes exist."""
         try:
             if HTS_DB_PATH.exists():
                 self._hts_conn = sqlite3.connect(str(HTS_DB_PATH))
         except Exception:
             self._hts_conn = None
+        if self._hts_conn is not None:
+            self._trigram = ensure_fts_index(self._hts_conn, 'hts_codes', 'hts_codes_trigram',
+                                             ('full_code', 'description'), tokenize='trigram')
+            self._words = ensure_fts_index(self._hts_conn, 'hts_codes', 'hts_codes_words',
+                                           ('full_code', 'description'), tokenize='unicode61')
 
     def refresh(self, search_term: str = ""):
         """Refresh data from HTS database."""
         self.beginResetModel()
+        self._data = []
+        self._query = None
+        self._match_count = 0
         try:
             if self._hts_conn is None:
                 self._connect_hts_db()
 
             if self._hts_conn is None:
-                self._data = []
                 self.endResetModel()
                 return
 
-            cursor = self._hts_conn.cursor()
+            columns = "hts_codes.full_code, hts_codes.description, hts_codes.general_rate, hts_codes.unit_of_quantity"
             if search_term:
-                # Search by code or description
-                cursor.execute("""
-                    SELECT full_code, description, general_rate, unit_of_quantity
-                    FROM hts_codes
-                    WHERE full_code LIKE ? OR description LIKE ?
-                    ORDER BY full_code
-                    LIMIT 500
-                """, (f'%{search_term}%', f'%{search_term}%'))
+                # Search by code or description; trigram candidates are confirmed by LIKE
+                conditions = []
+                params = []
+                if self._trigram and len(search_term) >= 3 and not any(c in search_term for c in '%_'):
+                    conditions.append("hts_codes.rowid IN "
+                                      "(SELECT rowid FROM hts_codes_trigram WHERE hts_codes_trigram MATCH ?)")
+                    params.append(quote_phrase(search_term))
+                conditions.append("(full_code LIKE ? OR description LIKE ?)")
+                params.extend([f'%{search_term}%', f'%{search_term}%'])
+                where_sql = "WHERE " + " AND ".join(conditions)
+
+                cursor = self._hts_conn.cursor()
+                cursor.execute(f"SELECT COUNT(*) FROM hts_codes {where_sql}", params)
+                self._match_count = cursor.fetchone()[0]
+
+                # Best matches first: exact code, code prefix, best word matches
+                join_sql = ""
+                join_params = []
+                score_sql = ""
+                words = prefix_query(search_term) if self._words else ""
+                if words:
+                    join_sql = ("LEFT JOIN (SELECT rowid AS word_rowid, bm25(hts_codes_words, 5.0, 1.0) AS score "
+                                "FROM hts_codes_words WHERE hts_codes_words MATCH ?) AS words "
+                                "ON words.word_rowid = hts_codes.rowid")
+                    join_params = [words]
+                    score_sql = "COALESCE(words.score, 0), "
+                self._query = (
+                    f"SELECT {columns} FROM hts_codes {join_sql} {where_sql} "
+                    f"ORDER BY (full_code = ?) DESC, (full_code LIKE ?) DESC, {score_sql}full_code",
+                    join_params + params + [search_term, f'{search_term}%']
+                )
             else:
-                cursor.execute("""
-                    SELECT full_code, description, general_rate, unit_of_quantity
-                    FROM hts_codes
-                    ORDER BY full_code
-                    LIMIT 500
-                """)
-
-            self._data = [
-                {
-                    'full_code': row[0] or '',
-                    'description': row[1] or '',
-                    'general_rate': row[2] or '',
-                    'unit_of_quantity': row[3] or ''
-                }
-                for row in cursor.fetchall()
-            ]
+                self._match_count = self.get_total_count()
+                self._query = (f"SELECT {columns} FROM hts_codes ORDER BY full_code", [])
+
+            self._data = self._fetch_page(0)
         except Exception:
             self._data = []
+            self._query = None
         self.endResetModel()
 
+    def _fetch_page(self, offset: int) -> list:
+        """Fetch one page of the current result set."""
+        sql, params = self._query
+        cursor = self._hts_conn.cursor()
+        cursor.execute(f"{sql} LIMIT ? OFFSET ?", params + [self.PAGE_SIZE, offset])
+        return [
+            {
+                'full_code': row[0] or '',
+                'description': row[1] or '',
+                'general_rate': row[2] or '',
+                'unit_of_quantity': row[3] or ''
+            }
+            for row in cursor.fetchall()
+        ]
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._query is None:
+            return False
+        return len(self._data) < self._match_count
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._query is None:
+            return
+        try:
+            rows = self._fetch_page(len(self._data))
+        except Exception:
+            rows = []
+        if not rows:
+            self._match_count = len(self._data)
+            return
+        self.beginInsertRows(QModelIndex(), len(self._data), len(self._data) + len(rows) - 1)
+        self._data.extend(rows)
+        self.endInsertRows()
+
+    @property
+    def match_count(self) -> int:
+        """Number of codes matching the current search (all codes without a search)."""
+        return self._match_count
+
     def rowCount(self, parent=QModelIndex()):
         return len(self._data)
 
@@ -140,6 +212,12 @@ class HTSReferenceDialog(QDialog):
         self.selected_hts = None
         self.theme_manager = get_theme_manager()
 
+        # Search as you type, once typing pauses
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(300)
+        self._search_timer.timeout.connect(self._search)
+
         self.setObjectName("HTSReferenceDialog")
         self.setWindowTitle("HTS Reference")
         self.setMinimumSize(1000, 700)
@@ -168,6 +246,7 @@ class HTSReferenceDialog(QDialog):
         self.search_edit = QLineEdit()
         self.search_edit.setPlaceholderText("Enter HTS code or keywords...")
         self.search_edit.returnPressed.connect(self._search)
+        self.search_edit.textChanged.connect(self._search_timer.start)
         info_layout.addWidget(self.search_edit, 0, 1)
 
         search_btn = QPushButton("Search")
@@ -235,12 +314,12 @@ class HTSReferenceDialog(QDialog):
     def _refresh_data(self, search_term: str = ""):
         """Refresh HTS data."""
         self.model.refresh(search_term)
-        count = self.model.rowCount()
+        count = self.model.match_count
         total = self.model.get_total_count()
-        if count >= 500:
-            self.count_label.setText(f"Showing first 500 of {total:,} codes (search to filter)")
+        if search_term:
+            self.count_label.setText(f"{count:,} matching codes (of {total:,} total)")
         else:
-            self.count_label.setText(f"{count:,} codes (of {total:,} total)")
+            self.count_label.setText(f"{total:,} codes")
 
     def _search(self):
         """Search HTS codes."""
@@ -249,6 +328,7 @@ class HTSReferenceDialog(QDialog):
     def _clear_search(self):
         """Clear search and refresh."""
         self.search_edit.clear()
+        self._search_timer.stop()
         self._refresh_data()
 
     def _select_hts(self):
@@ -14,14 +14,30 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel,
     QPushButton, QLineEdit, QTableWidget, QTableWidgetItem,
     QHeaderView, QComboBox, QMessageBox, QFileDialog,
-    QAbstractItemView
+    QAbstractItemView, QStyledItemDelegate
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from parts_database import PartsDatabase
 
 
+class RelatedPartiesDelegate(QStyledItemDelegate):
+    """Y/N combo box editor for the Related Parties column, created only while editing."""
+
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        combo.addItems(['N', 'Y'])
+        return combo
+
+    def setEditorData(self, editor, index):
+        value = index.data(Qt.ItemDataRole.EditRole)
+        editor.setCurrentText(value if value in ('Y', 'N') else 'N')
+
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.ItemDataRole.EditRole)
+
+
 class MIDManagementDialog(QDialog):
     """
     MID Management dialog matching TariffMill's format.
@@ -37,6 +53,13 @@ class MIDManagementDialog(QDialog):
         super().__init__(parent)
         self.db = db
         self.import_file_path = None
+        self._dirty = False  # Table has edits not yet saved to the database
+
+        # Filter as you type, once typing pauses
+        self._filter_timer = QTimer(self)
+        self._filter_timer.setSingleShot(True)
+        self._filter_timer.setInterval(250)
+        self._filter_timer.timeout.connect(self._filter_table)
 
         self.setWindowTitle("MID Management")
         self.setMinimumSize(900, 600)
@@ -94,6 +117,7 @@ class MIDManagementDialog(QDialog):
         self.customer_filter.setPlaceholderText("Filter...")
         self.customer_filter.setMaximumWidth(150)
         self.customer_filter.returnPressed.connect(self._filter_table)
+        self.customer_filter.textChanged.connect(self._filter_timer.start)
         filter_layout.addWidget(self.customer_filter)
 
         filter_layout.addWidget(QLabel("MID:"))
@@ -101,12 +125,14 @@ class MIDManagementDialog(QDialog):
         self.mid_filter.setPlaceholderText("Search...")
         self.mid_filter.setMaximumWidth(180)
         self.mid_filter.returnPressed.connect(self._filter_table)
+        self.mid_filter.textChanged.connect(self._filter_timer.start)
         filter_layout.addWidget(self.mid_filter)
 
         filter_layout.addWidget(QLabel("Manufacturer:"))
         self.manufacturer_filter = QLineEdit()
         self.manufacturer_filter.setPlaceholderText("Search...")
         self.manufacturer_filter.returnPressed.connect(self._filter_table)
+        self.manufacturer_filter.textChanged.connect(self._filter_timer.start)
         filter_layout.addWidget(self.manufacturer_filter)
 
         search_btn = QPushButton("Search")
@@ -132,6 +158,8 @@ class MIDManagementDialog(QDialog):
         self.table.horizontalHeader().setSectionResizeMode(3, QHeaderView.ResizeMode.ResizeToContents)
         self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.table.setAlternatingRowColors(True)
+        self.table.setItemDelegateForColumn(3, RelatedPartiesDelegate(self.table))
+        self.table.itemChanged.connect(self._mark_dirty)
         table_layout.addWidget(self.table)
 
         # Table action buttons
@@ -251,15 +279,24 @@ class MIDManagementDialog(QDialog):
         """Load MID data from database into table."""
         try:
             mids = self.db.get_all_mids()
-            self.table.setRowCount(0)
-
-            for entry in mids:
-                self._add_table_row(
-                    entry.get('manufacturer_name', ''),
-                    entry.get('mid', ''),
-                    entry.get('customer_id', ''),
-                    entry.get('related_parties', 'N')
-                )
+            self.table.blockSignals(True)
+            self.table.setUpdatesEnabled(False)
+            try:
+                self.table.setRowCount(0)
+                self.table.setRowCount(len(mids))
+                for row_idx, entry in enumerate(mids):
+                    self._set_table_row(
+                        row_idx,
+                        entry.get('manufacturer_name', ''),
+                        entry.get('mid', ''),
+                        entry.get('customer_id', ''),
+                        entry.get('related_parties', 'N')
+                    )
+            finally:
+                self.table.setUpdatesEnabled(True)
+                self.table.blockSignals(False)
+            self._dirty = False
+            self._filter_table()
         except Exception as e:
             QMessageBox.warning(self, "Load Error", f"Failed to load MID data:\n{e}")
 
@@ -268,16 +305,21 @@ class MIDManagementDialog(QDialog):
         """Add a row to the table with the given data."""
         row_idx = self.table.rowCount()
         self.table.insertRow(row_idx)
-
-        self.table.setItem(row_idx, 0, QTableWidgetItem(manufacturer_name))
-        self.table.setItem(row_idx, 1, QTableWidgetItem(mid))
-        self.table.setItem(row_idx, 2, QTableWidgetItem(customer_id))
-
-        # Related parties as combo box
-        combo = QComboBox()
-        combo.addItems(['N', 'Y'])
-        combo.setCurrentText(related_parties if related_parties in ('Y', 'N') else 'N')
-        self.table.setCellWidget(row_idx, 3, combo)
+        self._set_table_row(row_idx, manufacturer_name, mid, customer_id, related_parties)
+
+    def _set_table_row(self, row_idx: int, manufacturer_name: str, mid: str,
+                       customer_id: str, related_parties: str):
+        """Fill one table row (Related Parties is edited through RelatedPartiesDelegate)."""
+        self.table.setItem(row_idx, 0, QTableWidgetItem(manufacturer_name or ''))
+        self.table.setItem(row_idx, 1, QTableWidgetItem(mid or ''))
+        self.table.setItem(row_idx, 2, QTableWidgetItem(customer_id or ''))
+        related_item = QTableWidgetItem(related_parties if related_parties in ('Y', 'N') else 'N')
+        related_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.table.setItem(row_idx, 3, related_item)
+
+    def _mark_dirty(self, *args):
+        """Remember that the table differs from the database until saved."""
+        self._dirty = True
 
     def _browse_import_file(self):
         """Browse for MID import file."""
@@ -336,6 +378,7 @@ class MIDManagementDialog(QDialog):
     def _add_row(self):
         """Add a new empty row to the table."""
         self._add_table_row()
+        self._mark_dirty()
         row_idx = self.table.rowCount() - 1
         self.table.setCurrentCell(row_idx, 0)
         self.table.editItem(self.table.item(row_idx, 0))
@@ -355,6 +398,7 @@ class MIDManagementDialog(QDialog):
         if reply == QMessageBox.StandardButton.Yes:
             for row in sorted(selected_rows, reverse=True):
                 self.table.removeRow(row)
+            self._mark_dirty()
 
     def _clear_all(self):
         """Clear all MIDs from the table."""
@@ -369,6 +413,7 @@ class MIDManagementDialog(QDialog):
         )
         if reply == QMessageBox.StandardButton.Yes:
             self.table.setRowCount(0)
+            self._mark_dirty()
 
     def _save_changes(self):
         """Save table data to database."""
@@ -378,7 +423,7 @@ class MIDManagementDialog(QDialog):
                 manufacturer_item = self.table.item(row, 0)
                 mid_item = self.table.item(row, 1)
                 customer_item = self.table.item(row, 2)
-                combo = self.table.cellWidget(row, 3)
+                related_item = self.table.item(row, 3)
 
                 mid = mid_item.text().strip() if mid_item else ""
                 if not mid:
@@ -388,10 +433,11 @@ class MIDManagementDialog(QDialog):
                     'manufacturer_name': manufacturer_item.text().strip() if manufacturer_item else "",
                     'mid': mid,
                     'customer_id': customer_item.text().strip() if customer_item else "",
-                    'related_parties': combo.currentText() if combo else 'N'
+                    'related_parties': related_item.text() if related_item else 'N'
                 })
 
             saved = self.db.save_mids_batch(mids)
+            self._dirty = False
             QMessageBox.information(self, "Saved", f"Saved {saved} MID records to database.")
 
         except Exception as e:
@@ -420,25 +466,40 @@ class MIDManagementDialog(QDialog):
         mid_filter = self.mid_filter.text().strip().upper()
         manufacturer_filter = self.manufacturer_filter.text().strip().upper()
 
-        for row in range(self.table.rowCount()):
-            manufacturer_item = self.table.item(row, 0)
-            mid_item = self.table.item(row, 1)
-            customer_item = self.table.item(row, 2)
-
-            manufacturer = manufacturer_item.text().upper() if manufacturer_item else ''
-            mid = mid_item.text().upper() if mid_item else ''
-            customer_id = customer_item.text().upper() if customer_item else ''
-
-            # Determine if row should be visible (all filters must match)
-            show_row = True
-            if customer_filter and customer_filter not in customer_id:
-                show_row = False
-            if mid_filter and mid_filter not in mid:
-                show_row = False
-            if manufacturer_filter and manufacturer_filter not in manufacturer:
-                show_row = False
-
-            self.table.setRowHidden(row, not show_row)
+        # Saved data is searched in SQL; unsaved edits are filtered in the table itself
+        matching_mids = None
+        if not self._dirty and (customer_filter or mid_filter or manufacturer_filter):
+            matching_mids = {entry['mid'] for entry in self.db.search_mids(
+                customer_filter, mid_filter, manufacturer_filter)}
+
+        self.table.setUpdatesEnabled(False)
+        try:
+            for row in range(self.table.rowCount()):
+                mid_item = self.table.item(row, 1)
+                mid = mid_item.text() if mid_item else ''
+
+                if not (customer_filter or mid_filter or manufacturer_filter):
+                    show_row = True
+                elif matching_mids is not None:
+                    show_row = mid in matching_mids
+                else:
+                    manufacturer_item = self.table.item(row, 0)
+                    customer_item = self.table.item(row, 2)
+                    manufacturer = manufacturer_item.text().upper() if manufacturer_item else ''
+                    customer_id = customer_item.text().upper() if customer_item else ''
+
+                    # Determine if row should be visible (all filters must match)
+                    show_row = True
+                    if customer_filter and customer_filter not in customer_id:
+                        show_row = False
+                    if mid_filter and mid_filter not in mid.upper():
+                        show_row = False
+                    if manufacturer_filter and manufacturer_filter not in manufacturer:
+                        show_row = False
+
+                self.table.setRowHidden(row, not show_row)
+        finally:
+            self.table.setUpdatesEnabled(True)
 
     def _clear_filters(self):
         """Clear all filter fields and show all rows."""
@@ -19,6 +19,7 @@ from PyQt6.QtGui import QFont
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from config_manager import ConfigManager
+from extraction_pool import default_worker_count
 from core.theme_manager import get_theme_manager, AVAILABLE_THEMES
 
 
@@ -666,6 +667,25 @@ class SettingsDialog(QDialog):
         self.poll_spinbox.valueChanged.connect(self._mark_changed)
         monitor_layout.addRow("Poll Interval:", self.poll_spinbox)
 
+        self.folder_events_check = QCheckBox("Process new PDFs as soon as they arrive")
+        self.folder_events_check.setToolTip(
+            "Uses file system notifications when available (requires the watchdog package).\n"
+            "Disable for network shares where notifications are unreliable; the folder\n"
+            "is then rescanned every poll interval."
+        )
+        self.folder_events_check.stateChanged.connect(self._mark_changed)
+        monitor_layout.addRow("", self.folder_events_check)
+
+        self.workers_spinbox = QSpinBox()
+        self.workers_spinbox.setRange(0, 32)
+        self.workers_spinbox.setSpecialValueText(f"Auto ({default_worker_count()})")
+        self.workers_spinbox.setToolTip(
+            "Number of PDFs extracted in parallel while monitoring.\n"
+            "Auto uses one less than the number of CPU cores; 1 processes files one at a time."
+        )
+        self.workers_spinbox.valueChanged.connect(self._mark_changed)
+        monitor_layout.addRow("Parallel Workers:", self.workers_spinbox)
+
         self.auto_start_check = QCheckBox("Start monitoring on application launch")
         self.auto_start_check.stateChanged.connect(self._mark_changed)
         monitor_layout.addRow("", self.auto_start_check)
@@ -713,6 +733,28 @@ class SettingsDialog(QDialog):
 
         layout.addWidget(invoice_group)
 
+        # Extraction cache
+        cache_group = QGroupBox("Extraction Cache")
+        cache_layout = QFormLayout(cache_group)
+
+        self.extraction_cache_check = QCheckBox("Reuse results when the same PDF is processed again")
+        self.extraction_cache_check.stateChanged.connect(self._mark_changed)
+        cache_layout.addRow("", self.extraction_cache_check)
+
+        cache_size_layout = QHBoxLayout()
+        self.extraction_cache_spinbox = QSpinBox()
+        self.extraction_cache_spinbox.setRange(10, 10000)
+        self.extraction_cache_spinbox.setSuffix(" MB")
+        self.extraction_cache_spinbox.valueChanged.connect(self._mark_changed)
+        cache_size_layout.addWidget(self.extraction_cache_spinbox)
+        clear_cache_btn = QPushButton("Clear Cache")
+        clear_cache_btn.clicked.connect(self._clear_extraction_cache)
+        cache_size_layout.addWidget(clear_cache_btn)
+        cache_size_layout.addStretch()
+        cache_layout.addRow("Maximum Size:", cache_size_layout)
+
+        layout.addWidget(cache_group)
+
         # CBP Export group
         cbp_group = QGroupBox("CBP Export Folders")
         cbp_layout = QFormLayout(cbp_group)
@@ -741,6 +783,13 @@ class SettingsDialog(QDialog):
         self.auto_cbp_check.stateChanged.connect(self._mark_changed)
         cbp_layout.addRow("", self.auto_cbp_check)
 
+        self.section232_format_combo = QComboBox()
+        self.section232_format_combo.addItem("Excel (.xlsx, formatted)", "xlsx")
+        self.section232_format_combo.addItem("CSV (.csv, fastest)", "csv")
+        self.section232_format_combo.addItem("Parquet (.parquet, requires pyarrow)", "parquet")
+        self.section232_format_combo.currentIndexChanged.connect(self._mark_changed)
+        cbp_layout.addRow("Section 232 Format:", self.section232_format_combo)
+
         layout.addWidget(cbp_group)
 
         layout.addStretch()
@@ -1612,6 +1661,10 @@ class SettingsDialog(QDialog):
         self.input_folder_edit.setText(str(self.config.input_folder))
         self.output_folder_edit.setText(str(self.config.output_folder))
         self.poll_spinbox.setValue(self.config.poll_interval)
+        self.folder_events_check.setChecked(self.config.use_folder_events)
+        self.workers_spinbox.setValue(self.config.processing_workers)
+        self.extraction_cache_check.setChecked(self.config.extraction_cache_enabled)
+        self.extraction_cache_spinbox.setValue(self.config.extraction_cache_mb)
         self.auto_start_check.setChecked(self.config.auto_start)
 
         # Appearance - load saved theme
@@ -1625,6 +1678,8 @@ class SettingsDialog(QDialog):
         self.cbp_input_edit.setText(str(self.config.cbp_input_folder))
         self.cbp_output_edit.setText(str(self.config.cbp_output_folder))
         self.auto_cbp_check.setChecked(self.config.auto_cbp_export)
+        index = self.section232_format_combo.findData(self.config.section232_output_format)
+        self.section232_format_combo.setCurrentIndex(max(0, index))
 
         # Templates
         self.shared_folder_edit.setText(self.config.shared_templates_folder)
@@ -1661,6 +1716,10 @@ class SettingsDialog(QDialog):
         self.config.input_folder = self.input_folder_edit.text()
         self.config.output_folder = self.output_folder_edit.text()
         self.config.poll_interval = self.poll_spinbox.value()
+        self.config.use_folder_events = self.folder_events_check.isChecked()
+        self.config.processing_workers = self.workers_spinbox.value()
+        self.config.extraction_cache_enabled = self.extraction_cache_check.isChecked()
+        self.config.extraction_cache_mb = self.extraction_cache_spinbox.value()
         self.config.auto_start = self.auto_start_check.isChecked()
 
         # Theme
@@ -1672,6 +1731,7 @@ class SettingsDialog(QDialog):
         self.config.cbp_input_folder = self.cbp_input_edit.text()
         self.config.cbp_output_folder = self.cbp_output_edit.text()
         self.config.auto_cbp_export = self.auto_cbp_check.isChecked()
+        self.config.section232_output_format = self.section232_format_combo.currentData()
 
         # Templates
         self.config.shared_templates_folder = self.shared_folder_edit.text()
@@ -1964,6 +2024,12 @@ class SettingsDialog(QDialog):
             self.cbp_output_edit.setText(folder)
             self._mark_changed()
 
+    def _clear_extraction_cache(self):
+        """Delete all cached page text and extraction results."""
+        from extraction_cache import ExtractionCache, DEFAULT_CACHE_DIR
+        ExtractionCache(DEFAULT_CACHE_DIR).clear()
+        QMessageBox.information(self, "Cache Cleared", "The extraction cache has been cleared.")
+
     def _select_all_columns(self):
         for check in self.column_checks.values():
             check.setChecked(True)
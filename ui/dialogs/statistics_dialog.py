@@ -25,6 +25,19 @@ from stats_tracking.stats_tracker import StatisticsTracker, EventTypes
 class StatisticsDialog(QDialog):
     """Dialog for viewing usage statistics."""
 
+    # Display names for the processing stages recorded by ProcessorEngine
+    STAGE_LABELS = {
+        'cache_lookup': "Cache Lookup",
+        'open': "Open PDF",
+        'text_extraction': "Text Extraction",
+        'bol_scan': "BOL Scan",
+        'template_scoring': "Template Selection",
+        'template_score': "Template Score (each)",
+        'extraction': "Line Item Extraction",
+        'db_enrichment': "Database Enrichment",
+        'csv_write': "CSV Write",
+    }
+
     def __init__(self, db: PartsDatabase, parent=None):
         super().__init__(parent)
         self.db = db
@@ -78,6 +91,10 @@ class StatisticsDialog(QDialog):
         processing_tab = self._create_processing_tab()
         self.tabs.addTab(processing_tab, "Processing")
 
+        # Performance Tab
+        performance_tab = self._create_performance_tab()
+        self.tabs.addTab(performance_tab, "Performance")
+
         # Activity Tab
         activity_tab = self._create_activity_tab()
         self.tabs.addTab(activity_tab, "Recent Activity")
@@ -210,6 +227,58 @@ class StatisticsDialog(QDialog):
 
         return widget
 
+    def _create_performance_tab(self) -> QWidget:
+        """Create the processing performance tab (stage and template timings)."""
+        widget = QWidget()
+        layout = QVBoxLayout(widget)
+
+        # Stage timings
+        stage_group = QGroupBox("Processing Stages")
+        stage_layout = QVBoxLayout(stage_group)
+
+        self.stage_timing_table = QTableWidget()
+        self.stage_timing_table.setColumnCount(4)
+        self.stage_timing_table.setHorizontalHeaderLabels([
+            "Stage", "Samples", "p50 (ms)", "p95 (ms)"
+        ])
+        self.stage_timing_table.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.ResizeMode.Stretch
+        )
+        self.stage_timing_table.setSelectionBehavior(
+            QTableWidget.SelectionBehavior.SelectRows
+        )
+        self.stage_timing_table.setEditTriggers(
+            QTableWidget.EditTrigger.NoEditTriggers
+        )
+
+        stage_layout.addWidget(self.stage_timing_table)
+        layout.addWidget(stage_group)
+
+        # Template timings
+        template_group = QGroupBox("Templates")
+        template_layout = QVBoxLayout(template_group)
+
+        self.template_timing_table = QTableWidget()
+        self.template_timing_table.setColumnCount(7)
+        self.template_timing_table.setHorizontalHeaderLabels([
+            "Template", "Scored", "Score p50 (ms)", "Score p95 (ms)",
+            "Files", "Extraction p50 (ms)", "Extraction p95 (ms)"
+        ])
+        self.template_timing_table.horizontalHeader().setSectionResizeMode(
+            0, QHeaderView.ResizeMode.Stretch
+        )
+        self.template_timing_table.setSelectionBehavior(
+            QTableWidget.SelectionBehavior.SelectRows
+        )
+        self.template_timing_table.setEditTriggers(
+            QTableWidget.EditTrigger.NoEditTriggers
+        )
+
+        template_layout.addWidget(self.template_timing_table)
+        layout.addWidget(template_group)
+
+        return widget
+
     def _create_activity_tab(self) -> QWidget:
         """Create the recent activity tab."""
         widget = QWidget()
@@ -290,9 +359,37 @@ class StatisticsDialog(QDialog):
                 last_activity = last_activity[:19].replace('T', ' ')
             self.user_table.setItem(row, 3, QTableWidgetItem(last_activity))
 
+        # Stage and template timings
+        self._load_performance(days)
+
         # Recent activity
         self._load_recent_activity()
 
+    def _load_performance(self, days: int):
+        """Load stage and template timing percentiles for the period."""
+        def ms(value) -> str:
+            return "-" if value is None else f"{value:,.1f}"
+
+        stages = self.stats_tracker.get_stage_timings(days=days)
+        self.stage_timing_table.setRowCount(len(stages))
+        for row, data in enumerate(stages):
+            self.stage_timing_table.setItem(row, 0, QTableWidgetItem(
+                self.STAGE_LABELS.get(data['stage'], data['stage'])
+            ))
+            self.stage_timing_table.setItem(row, 1, QTableWidgetItem(str(data['samples'])))
+            self.stage_timing_table.setItem(row, 2, QTableWidgetItem(ms(data['p50_ms'])))
+            self.stage_timing_table.setItem(row, 3, QTableWidgetItem(ms(data['p95_ms'])))
+
+        templates = self.stats_tracker.get_template_timings(days=days)
+        self.template_timing_table.setRowCount(len(templates))
+        for row, (template, data) in enumerate(sorted(templates.items())):
+            self.template_timing_table.setItem(row, 0, QTableWidgetItem(template))
+            for column, key in ((1, 'score'), (4, 'extraction')):
+                timing = data[key] or {}
+                self.template_timing_table.setItem(row, column, QTableWidgetItem(str(timing.get('samples', 0))))
+                self.template_timing_table.setItem(row, column + 1, QTableWidgetItem(ms(timing.get('p50_ms'))))
+                self.template_timing_table.setItem(row, column + 2, QTableWidgetItem(ms(timing.get('p95_ms'))))
+
     def _load_recent_activity(self):
         """Load recent activity events."""
         events = self.stats_tracker.get_recent_activity(limit=20)
@@ -21,6 +21,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 from config_manager import ConfigManager
 from parts_database import PartsDatabase
 from updater import UpdateChecker
+from extraction_pool import resolve_worker_count
 
 from ui.tabs.invoice_tab import InvoiceProcessingTab
 from ui.tabs.parts_tab import PartsDatabaseTab
@@ -379,7 +380,10 @@ class OCRMillMainWindow(QMainWindow):
             engine=self.invoice_tab.engine,
             input_folder=Path(self.config.input_folder),
             output_folder=Path(self.config.output_folder),
-            poll_interval=self.config.poll_interval
+            poll_interval=self.config.poll_interval,
+            workers=resolve_worker_count(self.config.processing_workers),
+            config_file=self.config.config_file,
+            use_events=self.config.use_folder_events
         )
 
         # Connect worker signals
@@ -387,6 +391,7 @@ class OCRMillMainWindow(QMainWindow):
         self.processing_worker.files_processed.connect(self._on_files_processed)
         self.processing_worker.file_failed.connect(self._on_file_failed)
         self.processing_worker.status_changed.connect(self._on_status_changed)
+        self.processing_worker.progress.connect(self._on_processing_progress)
         self.processing_worker.finished.connect(self._on_worker_finished)
 
         self.processing_worker.start()
@@ -455,6 +460,14 @@ class OCRMillMainWindow(QMainWindow):
         """Handle status change from worker."""
         self.processing_status.setText(f"Monitoring: {status}")
 
+    @pyqtSlot(int, int)
+    def _on_processing_progress(self, current: int, total: int):
+        """Handle per-file progress from worker."""
+        if current < total:
+            self.processing_status.setText(f"Monitoring: Processing {current}/{total}")
+        else:
+            self.processing_status.setText("Monitoring: Running")
+
     @pyqtSlot()
     def _on_worker_finished(self):
         """Handle worker thread finished."""
@@ -730,7 +743,10 @@ class OCRMillMainWindow(QMainWindow):
         )
         if file_path:
             try:
-                # Close current database
+                # Close current database (after background parts queries finish)
+                self.parts_tab.parts_model.wait_for_queries()
+                self.parts_tab.wait_for_import()
+                self.invoice_tab.stop_processing_queue()
                 self.db.close()
 
                 # Update config
@@ -742,6 +758,7 @@ class OCRMillMainWindow(QMainWindow):
                 # Update tabs
                 self.invoice_tab.db = self.db
                 self.parts_tab.db = self.db
+                self.parts_tab.parts_model.db = self.db
 
                 self.parts_data_changed.emit()
                 self._update_db_status()
@@ -1195,6 +1212,9 @@ class OCRMillMainWindow(QMainWindow):
 
         # Close database
         try:
+            self.parts_tab.parts_model.wait_for_queries()
+            self.parts_tab.wait_for_import()
+            self.invoice_tab.stop_processing_queue()
             self.db.close()
         except Exception:
             pass
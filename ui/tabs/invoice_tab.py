@@ -4,8 +4,9 @@ TariffMill-style layout with left sidebar controls and results preview.
 """
 
 import sys
-import re
 import csv
+import io
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from PyQt6.QtWidgets import (
@@ -13,20 +14,17 @@ from PyQt6.QtWidgets import (
     QPushButton, QLineEdit, QSpinBox, QCheckBox, QTabWidget,
     QListWidget, QListWidgetItem, QFileDialog, QMessageBox,
     QFrame, QGridLayout, QSplitter, QRadioButton, QButtonGroup,
-    QTableWidget, QTableWidgetItem, QHeaderView, QAbstractItemView,
+    QTableView, QHeaderView, QAbstractItemView,
     QScrollArea, QApplication, QComboBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QTimer
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QTimer, QAbstractTableModel, QModelIndex
 from PyQt6.QtGui import QColor
 
-import pdfplumber
-
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from config_manager import ConfigManager
 from parts_database import PartsDatabase
-from templates import get_all_templates, TEMPLATE_REGISTRY
-from templates.bill_of_lading import BillOfLadingTemplate
+from processor_engine import ProcessorEngine
 from ui.widgets.log_viewer import LogViewerWidget, CompactLogViewer
 
 
@@ -162,358 +160,294 @@ class DropListWidget(QListWidget):
             self._drop_in_progress = False
 
 
-class ProcessorEngine:
-    """Core processing engine using templates."""
-
-    def __init__(self, config: ConfigManager, db: PartsDatabase, log_callback=None):
-        self.config = config
-        self.log_callback = log_callback or print
-        self.templates = {}
-        self.parts_db = db
-        self._load_templates()
-
-    def _load_templates(self):
-        """Load all available templates."""
-        self.templates = get_all_templates()
-
-    def log(self, message: str):
-        """Log a message."""
-        self.log_callback(message)
-
-    def get_best_template(self, text: str):
-        """Find the best template for the given text."""
-        best_template = None
-        best_score = 0.0
-
-        self.log(f"  Evaluating {len(self.templates)} templates...")
-
-        for name, template in self.templates.items():
-            if not self.config.get_template_enabled(name):
-                self.log(f"    - {name}: Disabled in config")
-                continue
-            if not template.enabled:
-                self.log(f"    - {name}: Disabled in template")
-                continue
-
-            score = template.get_confidence_score(text)
-            self.log(f"    - {name}: Confidence score {score:.2f}")
-
-            if score > best_score:
-                best_score = score
-                best_template = template
-
-        if best_template:
-            self.log(f"  Selected template: {best_template.name} (score: {best_score:.2f})")
-        else:
-            self.log(f"  No matching template found")
-
-        return best_template
-
-    def process_pdf(self, pdf_path: Path):
-        """Process a single PDF file, handling multiple invoices per PDF."""
-        self.log(f"Processing: {pdf_path.name}")
+class ResultsTableModel(QAbstractTableModel):
+    """
+    Extracted line items shown in the Processing Results preview.
 
-        try:
-            with pdfplumber.open(pdf_path) as pdf:
-                # First pass: extract all text to detect template
-                full_text = ""
-                for page in pdf.pages:
-                    text = page.extract_text()
-                    if text:
-                        full_text += text + "\n"
-
-                if not full_text.strip():
-                    self.log(f"  No text extracted from {pdf_path.name}")
-                    return []
-
-                # Scan for Bill of Lading and extract gross weight
-                bol_weight = None
-                bol_template = BillOfLadingTemplate()
-
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text and bol_template.can_process(page_text):
-                        self.log(f"  Found Bill of Lading on a page")
-                        bol_weight = bol_template.extract_gross_weight(page_text)
-                        if bol_weight:
-                            self.log(f"  Extracted BOL gross weight: {bol_weight} kg")
-                            break
-
-                # Find the best template
-                template = self.get_best_template(full_text)
-                if not template:
-                    self.log(f"  No matching template for {pdf_path.name}")
-                    return []
-
-                self.log(f"  Using template: {template.name}")
-
-                # Check if packing list only
-                if template.is_packing_list(full_text):
-                    self.log(f"  Skipping packing list: {pdf_path.name}")
-                    return []
-
-                # Second pass: process page-by-page to handle multiple invoices
-                all_items = []
-                current_invoice = None
-                current_project = None
-                page_buffer = []
-
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if not page_text:
-                        continue
-
-                    # Skip packing list and BOL pages
-                    if 'packing list' in page_text.lower() and 'invoice' not in page_text.lower():
-                        continue
-                    if 'bill of lading' in page_text.lower():
-                        continue
-
-                    # Check for new invoice on this page
-                    # Try multiple invoice number formats
-                    inv_match = re.search(r'(?:Proforma\s+)?[Ii]nvoice\s+(?:number|n)\.?\s*:?\s*(\d+(?:/\d+)?)', page_text)
-                    if not inv_match:
-                        # Try Vitech format: INVOICE # HFVT25-A001
-                        inv_match = re.search(r'[Ii]nvoice\s*#\s*([A-Z0-9-]+)', page_text)
-                    proj_match = re.search(r'(?:\d+\.\s*)?[Pp]roject\s*(?:n\.?)?\s*:?\s*(US\d+[A-Z]\d+)', page_text, re.IGNORECASE)
-
-                    new_invoice = inv_match.group(1) if inv_match else None
-                    if new_invoice and current_invoice and new_invoice != current_invoice:
-                        # Process accumulated pages for previous invoice
-                        if page_buffer:
-                            buffer_text = "\n".join(page_buffer)
-                            _, _, items = template.extract_all(buffer_text)
-                            for item in items:
-                                item['invoice_number'] = current_invoice
-                                item['project_number'] = current_project
-                                if bol_weight:
-                                    item['bol_gross_weight'] = bol_weight
-                                if bol_weight and ('net_weight' not in item or not item.get('net_weight')):
-                                    item['net_weight'] = bol_weight
-                            all_items.extend(items)
-                            page_buffer = []
-
-                    # Update current invoice/project if found
-                    if inv_match:
-                        current_invoice = inv_match.group(1)
-                    if proj_match:
-                        current_project = proj_match.group(1).upper()
-
-                    # Add page to buffer
-                    page_buffer.append(page_text)
-
-                # Process remaining pages in buffer
-                if page_buffer:
-                    buffer_text = "\n".join(page_buffer)
-                    inv_num, proj_num, items = template.extract_all(buffer_text)
-                    # Use template-extracted values as fallback if regex didn't find them
-                    final_invoice = current_invoice or inv_num or "UNKNOWN"
-                    final_project = current_project or proj_num or "UNKNOWN"
-                    for item in items:
-                        item['invoice_number'] = final_invoice
-                        item['project_number'] = final_project
-                        if bol_weight:
-                            item['bol_gross_weight'] = bol_weight
-                        if bol_weight and ('net_weight' not in item or not item.get('net_weight')):
-                            item['net_weight'] = bol_weight
-                    all_items.extend(items)
-
-                # Count unique invoices
-                unique_invoices = set(item.get('invoice_number', 'UNKNOWN') for item in all_items)
-                grand_total = sum(float(item.get('total_price', 0) or 0) for item in all_items)
-                self.log(f"  Found {len(unique_invoices)} invoice(s), {len(all_items)} total items, Grand Total: ${grand_total:,.2f}")
-
-                return all_items
+    Items are kept as the dicts the engine produced and a cell is only
+    formatted when the view displays it. append_items() adds the items of one
+    processed file - and any columns they introduce - without touching the
+    rows already shown.
+    """
 
-        except Exception as e:
-            self.log(f"  Error processing {pdf_path.name}: {e}")
-            return []
+    # Common fields first; other keys follow alphabetically
+    PREFERRED_ORDER = [
+        'part_number', 'description', 'quantity', 'unit_price', 'total_price',
+        'invoice_number', 'project_number', 'hts_code', 'country_origin', 'mid',
+        'manufacturer_name', 'net_weight', 'gross_weight'
+    ]
+
+    DISPLAY_NAMES = {
+        'part_number': 'Part Number',
+        'description': 'Description',
+        'quantity': 'Quantity',
+        'unit_price': 'Unit Price',
+        'total_price': 'Total',
+        'invoice_number': 'Invoice #',
+        'project_number': 'Project #',
+        'hts_code': 'HTS Code',
+        'country_origin': 'Country',
+        'mid': 'MID',
+        'manufacturer_name': 'Manufacturer',
+        'net_weight': 'Net Weight',
+        'gross_weight': 'Gross Weight',
+        'bol_gross_weight': 'BOL Weight'
+    }
+
+    # Columns shown before anything has been extracted
+    DEFAULT_COLUMNS = ['part_number', 'description', 'quantity', 'unit_price', 'total_price',
+                       'invoice_number', 'project_number']
 
-    def save_to_csv(self, items, output_folder: Path, pdf_name: str = None):
-        """Save items to CSV files and add to parts database."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._items = []
+        self._columns = list(self.DEFAULT_COLUMNS)
+        self._keys = set()  # Union of the keys of all items
+        self._total_value = 0.0
+
+    @property
+    def columns(self) -> list:
+        """Item keys in column order."""
+        return list(self._columns)
+
+    @property
+    def total_value(self) -> float:
+        """Sum of total_price over all items."""
+        return self._total_value
+
+    def items(self) -> list:
+        """All items, in display order."""
+        return list(self._items)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._items)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        key = self._columns[index.column()]
+        return self._format_value(key, self._items[index.row()].get(key, ''))
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            key = self._columns[section]
+            return self.DISPLAY_NAMES.get(key, key.replace('_', ' ').title())
+        return str(section + 1)
+
+    def set_items(self, items: list):
+        """Replace all items."""
+        self.beginResetModel()
+        self._items = list(items)
+        self._keys = set().union(*self._items) if self._items else set()
+        self._columns = self._order_columns(self._keys) if self._items else list(self.DEFAULT_COLUMNS)
+        self._total_value = self._sum_total(self._items)
+        self.endResetModel()
+
+    def append_items(self, items: list):
+        """Add items after the existing rows, inserting columns for new keys in order."""
         if not items:
             return
+        if not self._items:
+            self.set_items(items)
+            return
 
-        # Add items to parts database
-        for item in items:
-            # Look up MID and country_origin from manufacturer name (using mid_table)
-            if ('mid' not in item or not item['mid']) or ('country_origin' not in item or not item['country_origin']):
-                manufacturer_name = item.get('manufacturer_name', '')
-                if manufacturer_name:
-                    mid_entry = self.parts_db.get_mid_by_manufacturer_name(manufacturer_name)
-                    if mid_entry:
-                        if 'mid' not in item or not item['mid']:
-                            if mid_entry.get('mid'):
-                                item['mid'] = mid_entry.get('mid', '')
-                        # Extract country from MID code (first 2 characters)
-                        if 'country_origin' not in item or not item['country_origin']:
-                            mid_code = mid_entry.get('mid', '')
-                            if len(mid_code) >= 2:
-                                item['country_origin'] = mid_code[:2].upper()
-
-            # Extract country from MID if available
-            if ('country_origin' not in item or not item['country_origin']) and item.get('mid'):
-                mid = item.get('mid', '')
-                if len(mid) >= 2:
-                    item['country_origin'] = mid[:2].upper()
-
-            part_data = item.copy()
-            part_data['source_file'] = pdf_name or 'unknown'
-            self.parts_db.add_part_occurrence(part_data)
-
-            # Enrich item with database info
-            if 'description' not in item or not item['description']:
-                item['description'] = part_data.get('description', '')
-            if 'hts_code' not in item or not item['hts_code']:
-                item['hts_code'] = part_data.get('hts_code', '')
-
-            # Remove manufacturer_name from output
-            if 'manufacturer_name' in item:
-                del item['manufacturer_name']
-
-        # Group by invoice number
-        by_invoice = {}
-        for item in items:
-            inv_num = item.get('invoice_number', 'UNKNOWN')
-            if inv_num not in by_invoice:
-                by_invoice[inv_num] = []
-            by_invoice[inv_num].append(item)
-
-        # Get column mapping configuration
-        mapping = self.config.get_output_column_mapping()
-        if mapping and 'columns' in mapping:
-            # Use configured columns (in order, only enabled ones)
-            columns = []
-            column_renames = {}
-            for col_config in mapping['columns']:
-                if col_config.get('enabled', True):
-                    internal = col_config['internal_name']
-                    display = col_config['display_name']
-                    columns.append(internal)
-                    if internal != display:
-                        column_renames[internal] = display
-        else:
-            # Default columns
-            columns = ['invoice_number', 'project_number', 'part_number', 'description', 'mid', 'country_origin', 'hts_code', 'quantity', 'total_price']
-            column_renames = {}
-            # Add any extra columns from items
-            for item in items:
-                for key in item.keys():
-                    if key not in columns:
-                        columns.append(key)
-
-        # Check export options
-        split_by_invoice = self.config.get_export_option('split_by_invoice', False)
-        consolidate = self.config.consolidate_multi_invoice
-
-        # Helper function to write CSV with renamed columns
-        def write_csv_with_mapping(filepath, items_to_write, columns, renames):
-            # Rename columns in header
-            header = [renames.get(col, col) for col in columns]
-            with open(filepath, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.writer(f)
-                writer.writerow(header)
-                for item in items_to_write:
-                    row = [item.get(col, '') for col in columns]
-                    writer.writerow(row)
-
-        if split_by_invoice:
-            # Split by invoice - one file per invoice
-            for inv_num, inv_items in by_invoice.items():
-                proj_num = inv_items[0].get('project_number', 'UNKNOWN')
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                safe_inv_num = inv_num.replace('/', '-')
-                filename = f"{safe_inv_num}_{proj_num}_{timestamp}.csv"
-                filepath = output_folder / filename
-
-                write_csv_with_mapping(filepath, inv_items, columns, column_renames)
-                self.log(f"  Saved: {filename} ({len(inv_items)} items)")
-
-        elif consolidate and len(by_invoice) > 1:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            if pdf_name:
-                base_name = Path(pdf_name).stem
-            else:
-                base_name = f"consolidated_{list(by_invoice.keys())[0]}"
-            filename = f"{base_name}_{timestamp}.csv"
-            filepath = output_folder / filename
-
-            write_csv_with_mapping(filepath, items, columns, column_renames)
+        new_keys = set().union(*items) - self._keys
+        if new_keys:
+            self._keys |= new_keys
+            # Inserted in ascending final position, so each index is valid when used
+            for position, key in enumerate(self._order_columns(self._keys)):
+                if key in new_keys:
+                    self.beginInsertColumns(QModelIndex(), position, position)
+                    self._columns.insert(position, key)
+                    self.endInsertColumns()
+
+        first = len(self._items)
+        self.beginInsertRows(QModelIndex(), first, first + len(items) - 1)
+        self._items.extend(items)
+        self._total_value += self._sum_total(items)
+        self.endInsertRows()
+
+    def clear(self):
+        """Remove all items (the columns stay until new items arrive)."""
+        self.beginResetModel()
+        self._items = []
+        self._keys = set()
+        self._total_value = 0.0
+        self.endResetModel()
+
+    def _order_columns(self, keys: set) -> list:
+        """Preferred columns first, then the remaining keys alphabetically."""
+        columns = [key for key in self.PREFERRED_ORDER if key in keys]
+        columns.extend(sorted(keys - set(self.PREFERRED_ORDER)))
+        return columns
+
+    @staticmethod
+    def _sum_total(items: list) -> float:
+        """Sum of total_price over items."""
+        return sum(float(item.get('total_price', 0) or 0) for item in items)
+
+    @staticmethod
+    def _format_value(key: str, value) -> str:
+        """Display text for a cell (prices as dollars, other floats with separators)."""
+        if value is None:
+            return ''
+        if isinstance(value, float):
+            if 'price' in key.lower() or 'total' in key.lower():
+                return f"${value:,.2f}"
+            return f"{value:,.2f}"
+        return str(value)
+
+
+class CsvPreviewModel(QAbstractTableModel):
+    """
+    Read-only view of a CSV file for the Exported Files preview.
 
-            invoice_list = ", ".join(sorted(by_invoice.keys()))
-            self.log(f"  Saved: {filename} ({len(items)} items from {len(by_invoice)} invoices)")
-        else:
-            for inv_num, inv_items in by_invoice.items():
-                proj_num = inv_items[0].get('project_number', 'UNKNOWN')
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                safe_inv_num = inv_num.replace('/', '-')
-                filename = f"{safe_inv_num}_{proj_num}_{timestamp}.csv"
-                filepath = output_folder / filename
-
-                write_csv_with_mapping(filepath, inv_items, columns, column_renames)
-                self.log(f"  Saved: {filename} ({len(inv_items)} items)")
-
-    def move_to_processed(self, pdf_path: Path, processed_folder: Path = None):
-        """Move processed PDF to the Processed folder."""
-        if processed_folder is None:
-            processed_folder = pdf_path.parent / "Processed"
-        processed_folder.mkdir(exist_ok=True, parents=True)
-
-        dest = processed_folder / pdf_path.name
-        counter = 1
-        while dest.exists():
-            stem = pdf_path.stem
-            dest = processed_folder / f"{stem}_{counter}{pdf_path.suffix}"
-            counter += 1
-
-        pdf_path.rename(dest)
-        self.log(f"  Moved to: Processed/{dest.name}")
-
-    def move_to_failed(self, pdf_path: Path, failed_folder: Path = None, reason: str = ""):
-        """Move failed PDF to the Failed folder."""
-        if failed_folder is None:
-            failed_folder = pdf_path.parent / "Failed"
-        failed_folder.mkdir(exist_ok=True, parents=True)
-
-        dest = failed_folder / pdf_path.name
-        counter = 1
-        while dest.exists():
-            stem = pdf_path.stem
-            dest = failed_folder / f"{stem}_{counter}{pdf_path.suffix}"
-            counter += 1
-
-        pdf_path.rename(dest)
-        reason_msg = f" ({reason})" if reason else ""
-        self.log(f"  Moved to: Failed/{dest.name}{reason_msg}")
-
-    def process_folder(self, input_folder: Path, output_folder: Path):
-        """Process all PDFs in the input folder."""
-        input_folder.mkdir(exist_ok=True, parents=True)
-        output_folder.mkdir(exist_ok=True, parents=True)
-        processed_folder = input_folder / "Processed"
-        failed_folder = input_folder / "Failed"
-
-        pdf_files = list(input_folder.glob("*.pdf"))
-        if not pdf_files:
-            return 0
+    Loading only scans the file for record boundaries, remembering the byte
+    offset of every CHUNK_SIZE-th record. Rows are decoded a chunk at a time
+    when the view displays them, and the most recently used chunks are cached,
+    so large consolidated CSVs open quickly and use little memory.
+    """
 
-        self.log(f"Found {len(pdf_files)} PDF(s) to process")
-        processed_count = 0
+    CHUNK_SIZE = 500
+    CACHED_CHUNKS = 8
 
-        for pdf_path in pdf_files:
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._path = None
+        self._headers = []
+        self._row_count = 0
+        self._chunk_offsets = []  # Byte offset of rows 0, CHUNK_SIZE, 2 * CHUNK_SIZE, ...
+        self._chunks = OrderedDict()  # chunk number -> decoded rows (LRU)
+        self._placeholder = ""
+
+    @property
+    def headers(self) -> list:
+        """Column names from the CSV header row."""
+        return list(self._headers)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._row_count
+
+    def columnCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._headers) if self._headers else 1
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        row = self._row(index.row())
+        column = index.column()
+        return row[column] if column < len(row) else ''
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == Qt.Orientation.Horizontal:
+            if not self._headers:
+                return self._placeholder
+            return self._headers[section].replace('_', ' ').title()
+        return str(section + 1)
+
+    def set_placeholder(self, text: str):
+        """Show no file, with text as the only column header."""
+        self.beginResetModel()
+        self._reset()
+        self._placeholder = text
+        self.endResetModel()
+
+    def load(self, csv_path: Path) -> int:
+        """
+        Index a CSV file for display.
+
+        Args:
+            csv_path: CSV file with a header row
+
+        Returns:
+            Number of data rows (0 if the file has no header or no rows)
+        """
+        self.beginResetModel()
+        self._reset()
+        try:
+            with open(csv_path, 'rb') as f:
+                header = self._read_records(f, 1)
+                self._headers = header[0] if header else []
+                if self._headers:
+                    self._path = Path(csv_path)
+                    self._index_rows(f)
+        finally:
+            if not self._row_count:
+                self._reset()
+            self.endResetModel()
+        return self._row_count
+
+    def _reset(self):
+        """Forget the current file."""
+        self._path = None
+        self._headers = []
+        self._row_count = 0
+        self._chunk_offsets = []
+        self._chunks.clear()
+
+    def _index_rows(self, f):
+        """Count the data rows after the header, remembering where each chunk starts."""
+        position = f.tell()
+        record_start = position
+        in_quotes = False
+        for line in f:
+            if not in_quotes:
+                record_start = position
+            position += len(line)
+            # A newline inside a quoted field does not end the record
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            if in_quotes or not line.strip(b'\r\n'):
+                continue
+            if self._row_count % self.CHUNK_SIZE == 0:
+                self._chunk_offsets.append(record_start)
+            self._row_count += 1
+
+    def _row(self, row: int) -> list:
+        """The decoded cells of a data row."""
+        number = row // self.CHUNK_SIZE
+        chunk = self._chunks.get(number)
+        if chunk is None:
             try:
-                items = self.process_pdf(pdf_path)
-                if items:
-                    self.save_to_csv(items, output_folder, pdf_name=pdf_path.name)
-                    self.move_to_processed(pdf_path, processed_folder)
-                    processed_count += 1
-                else:
-                    self.move_to_failed(pdf_path, failed_folder, "No items extracted")
-            except Exception as e:
-                self.log(f"  Error processing {pdf_path.name}: {e}")
-                self.move_to_failed(pdf_path, failed_folder, f"Error: {str(e)[:50]}")
-
-        return processed_count
+                with open(self._path, 'rb') as f:
+                    f.seek(self._chunk_offsets[number])
+                    chunk = self._read_records(f, self.CHUNK_SIZE)
+            except OSError:
+                chunk = []
+            self._chunks[number] = chunk
+            while len(self._chunks) > self.CACHED_CHUNKS:
+                self._chunks.popitem(last=False)
+        else:
+            self._chunks.move_to_end(number)
+        offset = row % self.CHUNK_SIZE
+        return chunk[offset] if offset < len(chunk) else []
+
+    @staticmethod
+    def _read_records(f, count: int) -> list:
+        """Read and parse up to count non-blank CSV records from a binary file."""
+        lines = []
+        records = 0
+        in_quotes = False
+        for line in f:
+            lines.append(line)
+            if line.count(b'"') % 2:
+                in_quotes = not in_quotes
+            if in_quotes or not line.strip(b'\r\n'):
+                continue
+            records += 1
+            if records >= count:
+                break
+        text = b''.join(lines).decode('utf-8-sig', errors='replace')
+        return [row for row in csv.reader(io.StringIO(text, newline='')) if row]
 
 
 class InvoiceProcessingTab(QWidget):
@@ -540,9 +474,11 @@ class InvoiceProcessingTab(QWidget):
         self.db = db
         self.engine = ProcessorEngine(config, db, log_callback=self._log)
         self._is_processing = False
-        self._last_results = []  # Store last processed results for preview
         self._first_show = True  # Track first show for initialization
         self._last_drop_time = 0  # Debounce for file drops
+        self._queue_worker = None  # ProcessingQueueWorker for Process Now and dropped files
+        self._queue_stale = False  # Config changed: recreate the queue worker once it is idle
+        self._new_results_batch = True  # Next extracted items replace the results table
 
         self._setup_ui()
         self._connect_signals()
@@ -685,6 +621,13 @@ class InvoiceProcessingTab(QWidget):
         self.process_now_btn.clicked.connect(self.process_now)
         actions_layout.addWidget(self.process_now_btn)
 
+        # Cancel queued Process Now / dropped files
+        self.cancel_processing_btn = QPushButton("Cancel Processing")
+        self.cancel_processing_btn.setToolTip("Skip queued files (the file in progress is finished)")
+        self.cancel_processing_btn.setEnabled(False)
+        self.cancel_processing_btn.clicked.connect(self.cancel_processing)
+        actions_layout.addWidget(self.cancel_processing_btn)
+
         # Section 232 Export button
         self.section232_btn = QPushButton("Section 232 Export")
         self.section232_btn.setToolTip("Generate Section 232 Steel/Aluminum Declaration export from processed CSVs")
@@ -823,12 +766,16 @@ class InvoiceProcessingTab(QWidget):
         layout.addWidget(header)
 
         # Results table - dynamic columns based on extracted data
-        self.results_table = QTableWidget()
+        self.results_model = ResultsTableModel(self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.results_model)
         self.results_table.setAlternatingRowColors(True)
         self.results_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.results_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.results_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.results_table.horizontalHeader().setStretchLastSection(True)
+        self.results_table.horizontalHeader().setResizeContentsPrecision(200)
+        self.results_table.verticalHeader().setDefaultSectionSize(22)
 
         # Initialize with default columns
         self._init_results_columns()
@@ -867,18 +814,20 @@ class InvoiceProcessingTab(QWidget):
         header.setStyleSheet("font-weight: bold; color: #666;")
         layout.addWidget(header)
 
-        # Table to preview exported CSV content
-        self.exported_file_table = QTableWidget()
+        # Table to preview exported CSV content (rows are decoded as they are shown)
+        self.exported_file_model = CsvPreviewModel(self)
+        self.exported_file_table = QTableView()
+        self.exported_file_table.setModel(self.exported_file_model)
         self.exported_file_table.setAlternatingRowColors(True)
         self.exported_file_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.exported_file_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.exported_file_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
         self.exported_file_table.horizontalHeader().setStretchLastSection(True)
+        self.exported_file_table.horizontalHeader().setResizeContentsPrecision(0)  # Visible rows only
+        self.exported_file_table.verticalHeader().setDefaultSectionSize(22)
 
         # Initialize with placeholder
-        self.exported_file_table.setColumnCount(1)
-        self.exported_file_table.setHorizontalHeaderLabels(["Select a CSV file from Output Files to preview"])
-        self.exported_file_table.setRowCount(0)
+        self.exported_file_model.set_placeholder("Select a CSV file from Output Files to preview")
 
         layout.addWidget(self.exported_file_table)
 
@@ -901,14 +850,7 @@ class InvoiceProcessingTab(QWidget):
 
     def _init_results_columns(self):
         """Initialize results table with default columns."""
-        # Default columns - will be updated dynamically based on extracted data
-        default_columns = [
-            "Part Number", "Description", "Quantity", "Unit Price", "Total",
-            "Invoice #", "Project #"
-        ]
-        self.results_table.setColumnCount(len(default_columns))
-        self.results_table.setHorizontalHeaderLabels(default_columns)
-
+        # Default columns (ResultsTableModel.DEFAULT_COLUMNS) - updated dynamically based on extracted data
         # Set all columns to ResizeToContents initially for proper header display
         header = self.results_table.horizontalHeader()
         header.setMinimumSectionSize(60)  # Ensure minimum readable width
@@ -953,7 +895,7 @@ class InvoiceProcessingTab(QWidget):
             # Re-apply column widths after widget is fully initialized
             column_widths = [110, 180, 70, 85, 85, 75, 90]
             for i, width in enumerate(column_widths):
-                if i < self.results_table.columnCount():
+                if i < self.results_model.columnCount():
                     self.results_table.setColumnWidth(i, width)
 
             # Force header and table update
@@ -962,7 +904,7 @@ class InvoiceProcessingTab(QWidget):
                 header.updateGeometry()
 
                 # Ensure Description column stretches
-                if self.results_table.columnCount() > 1:
+                if self.results_model.columnCount() > 1:
                     header.setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
 
             self.results_table.updateGeometry()
@@ -975,7 +917,7 @@ class InvoiceProcessingTab(QWidget):
             pass  # Fail silently if initialization fails
 
     def _update_results_table(self, items: list):
-        """Update the results table with extracted items (dynamic columns)."""
+        """Replace the results table contents with extracted items (dynamic columns)."""
         import traceback
 
         try:
@@ -984,100 +926,57 @@ class InvoiceProcessingTab(QWidget):
                 return
 
             self._log(f"Updating results table with {len(items)} items...")
-            self._last_results = items
 
             # Switch to Processing Results tab to show the user the results
             if hasattr(self, 'preview_tabs'):
                 self.preview_tabs.setCurrentIndex(0)  # Processing Results is tab 0
 
-            # Determine all unique keys across all items
-            all_keys = set()
-            for item in items:
-                all_keys.update(item.keys())
-
-            # Define preferred column order (common fields first)
-            preferred_order = [
-                'part_number', 'description', 'quantity', 'unit_price', 'total_price',
-                'invoice_number', 'project_number', 'hts_code', 'country_origin', 'mid',
-                'manufacturer_name', 'net_weight', 'gross_weight'
-            ]
-
-            # Build column list: preferred first, then remaining alphabetically
-            columns = []
-            for key in preferred_order:
-                if key in all_keys:
-                    columns.append(key)
-                    all_keys.discard(key)
-            columns.extend(sorted(all_keys))
-
-            # Set up table columns
-            display_names = {
-                'part_number': 'Part Number',
-                'description': 'Description',
-                'quantity': 'Quantity',
-                'unit_price': 'Unit Price',
-                'total_price': 'Total',
-                'invoice_number': 'Invoice #',
-                'project_number': 'Project #',
-                'hts_code': 'HTS Code',
-                'country_origin': 'Country',
-                'mid': 'MID',
-                'manufacturer_name': 'Manufacturer',
-                'net_weight': 'Net Weight',
-                'gross_weight': 'Gross Weight',
-                'bol_gross_weight': 'BOL Weight'
-            }
-
-            self.results_table.setColumnCount(len(columns))
-            headers = [display_names.get(col, col.replace('_', ' ').title()) for col in columns]
-            self.results_table.setHorizontalHeaderLabels(headers)
-
-            # Populate rows
-            self.results_table.setRowCount(len(items))
-            for row_idx, item in enumerate(items):
-                for col_idx, key in enumerate(columns):
-                    value = item.get(key, '')
-                    if value is None:
-                        value = ''
-                    elif isinstance(value, float):
-                        if 'price' in key.lower() or 'total' in key.lower():
-                            value = f"${value:,.2f}"
-                        else:
-                            value = f"{value:,.2f}"
-                    else:
-                        value = str(value)
-
-                    cell = QTableWidgetItem(value)
-                    self.results_table.setItem(row_idx, col_idx, cell)
-
-            # Update status
-            total_value = sum(float(item.get('total_price', 0) or 0) for item in items)
-            self.results_status.setText(f"{len(items)} items extracted | Total: ${total_value:,.2f}")
+            self.results_model.set_items(items)
+            self._update_results_status()
 
             # Resize columns to content
             self.results_table.resizeColumnsToContents()
 
-            # Store column mapping for export
-            self._result_columns = columns
-
             # Force header repaint to fix rendering issues on Windows
             QTimer.singleShot(0, self._force_header_repaint)
 
-            self._log(f"Results table updated: {self.results_table.rowCount()} rows, {self.results_table.columnCount()} columns")
+            self._log(f"Results table updated: {self.results_model.rowCount()} rows, "
+                      f"{self.results_model.columnCount()} columns")
         except Exception as e:
             error_msg = traceback.format_exc()
             self._log(f"ERROR updating results table: {e}")
             self._write_crash_log("Error in _update_results_table", error_msg)
 
+    def _append_results(self, items: list):
+        """Add one file's extracted items to the results table as they arrive."""
+        if not items:
+            return
+        if not self.results_model.rowCount():
+            self._update_results_table(items)
+            return
+        columns_before = self.results_model.columnCount()
+        self.results_model.append_items(items)
+        if self.results_model.columnCount() != columns_before:
+            self.results_table.resizeColumnsToContents()
+        self._update_results_status()
+
+    def _update_results_status(self):
+        """Show the item count and total value of the results table."""
+        count = self.results_model.rowCount()
+        if not count:
+            self.results_status.setText("No results yet")
+            return
+        self.results_status.setText(f"{count} items extracted | Total: ${self.results_model.total_value:,.2f}")
+
     def _clear_results(self):
         """Clear the results preview table."""
-        self.results_table.setRowCount(0)
-        self._last_results = []
+        self.results_model.clear()
         self.results_status.setText("No results yet")
 
     def _export_results(self):
         """Export current results to CSV."""
-        if not self._last_results:
+        items = self.results_model.items()
+        if not items:
             QMessageBox.information(self, "No Results", "No results to export.")
             return
 
@@ -1087,14 +986,9 @@ class InvoiceProcessingTab(QWidget):
         if file_path:
             try:
                 with open(file_path, 'w', newline='', encoding='utf-8') as f:
-                    if hasattr(self, '_result_columns'):
-                        writer = csv.DictWriter(f, fieldnames=self._result_columns, extrasaction='ignore')
-                        writer.writeheader()
-                        writer.writerows(self._last_results)
-                    else:
-                        writer = csv.DictWriter(f, fieldnames=self._last_results[0].keys())
-                        writer.writeheader()
-                        writer.writerows(self._last_results)
+                    writer = csv.DictWriter(f, fieldnames=self.results_model.columns, extrasaction='ignore')
+                    writer.writeheader()
+                    writer.writerows(items)
 
                 QMessageBox.information(self, "Export Complete", f"Results exported to:\n{file_path}")
             except Exception as e:
@@ -1131,6 +1025,7 @@ class InvoiceProcessingTab(QWidget):
         self._load_config()
         self._refresh_mapping_profiles()
         self.engine = ProcessorEngine(self.config, self.db, log_callback=self._log)
+        self._queue_stale = True
 
     # ----- Settings handlers -----
 
@@ -1240,46 +1135,103 @@ class InvoiceProcessingTab(QWidget):
 
     @pyqtSlot()
     def process_now(self):
-        """Process files immediately and show results in preview table."""
+        """Queue every PDF in the input folder for background processing."""
         input_folder = Path(self.config.input_folder)
         output_folder = Path(self.config.output_folder)
 
         self._log("Processing files now...")
 
-        # Collect all items for results preview
-        all_items = []
-        pdf_files = list(input_folder.glob("*.pdf"))
-
+        pdf_files = sorted(input_folder.glob("*.pdf"))
         if not pdf_files:
             self._log("No files to process")
             self._refresh_input_files()
             self._refresh_output_files()
             return
 
-        for pdf_path in pdf_files:
-            try:
-                items = self.engine.process_pdf(pdf_path)
-                if items:
-                    all_items.extend(items)
-                    self.engine.save_to_csv(items, output_folder, pdf_name=pdf_path.name)
-                    self.engine.move_to_processed(pdf_path)
-                else:
-                    self.engine.move_to_failed(pdf_path, reason="No items extracted")
-                    self.file_failed.emit(pdf_path.name)
-            except Exception as e:
-                self._log(f"Error processing {pdf_path.name}: {e}")
-                self.engine.move_to_failed(pdf_path, reason=str(e)[:50])
-                self.file_failed.emit(pdf_path.name)
+        self._submit_files(pdf_files, output_folder, move_files=True)
+
+    # ----- Background processing queue -----
+
+    def _processing_queue(self):
+        """The processing queue worker, created (or recreated after a config change) when needed."""
+        from core.workers import ProcessingQueueWorker
+        from extraction_pool import resolve_worker_count
 
-        count = len([p for p in pdf_files if not p.exists()])  # Files that were moved
-        if count > 0:
-            self.files_processed.emit(count)
-            self._log(f"Processed {count} file(s)")
+        if self._queue_worker is not None and self._queue_stale and not self._queue_worker.is_busy():
+            self.stop_processing_queue()
 
-            # Update results preview table
-            if all_items:
-                self._update_results_table(all_items)
+        if self._queue_worker is None:
+            self._queue_stale = False
+            worker = ProcessingQueueWorker(
+                ProcessorEngine(self.config, self.db),
+                workers=resolve_worker_count(self.config.processing_workers),
+                config_file=self.config.config_file
+            )
+            worker.log_message.connect(self.append_log)
+            worker.file_failed.connect(self.file_failed)
+            worker.files_processed.connect(self.files_processed)
+            worker.file_finished.connect(self._on_queue_file_finished)
+            worker.progress.connect(self._on_queue_progress)
+            worker.batch_finished.connect(self._on_queue_batch_finished)
+            worker.start()
+            self._queue_worker = worker
+        return self._queue_worker
+
+    def _submit_files(self, pdf_paths: list, output_folder: Path, move_files: bool,
+                      record_history: bool = False):
+        """Queue PDFs for background processing; results appear as each file finishes."""
+        worker = self._processing_queue()
+        if not worker.is_busy():
+            self._new_results_batch = True
+        count = worker.submit(pdf_paths, output_folder, move_files=move_files,
+                              record_history=record_history)
+        if count:
+            self._log(f"Queued {count} file(s) for processing")
+            self.results_status.setText("Processing queued files...")
+            self.cancel_processing_btn.setEnabled(True)
+        else:
+            self._log("Files are already queued for processing")
 
+    @pyqtSlot()
+    def cancel_processing(self):
+        """Skip files queued for background processing."""
+        if self._queue_worker is not None and self._queue_worker.is_busy():
+            self._queue_worker.cancel()
+            self.cancel_processing_btn.setEnabled(False)
+
+    def stop_processing_queue(self):
+        """Stop the processing queue worker (after the file in progress) and wait for it."""
+        if self._queue_worker is None:
+            return
+        self._queue_worker.request_stop()
+        self._queue_worker.wait()
+        self._queue_worker.deleteLater()
+        self._queue_worker = None
+
+    @pyqtSlot(str, bool, list)
+    def _on_queue_file_finished(self, filename: str, success: bool, items: list):
+        """Show each processed file's items as soon as it is done."""
+        if not items:
+            return
+        if self._new_results_batch:
+            self._new_results_batch = False
+            self._update_results_table(items)
+        else:
+            self._append_results(items)
+
+    @pyqtSlot(int, int)
+    def _on_queue_progress(self, current: int, total: int):
+        """Show per-file progress of the processing queue."""
+        if current < total:
+            self.results_status.setText(f"Processing {current + 1} of {total}...")
+
+    @pyqtSlot(int, int)
+    def _on_queue_batch_finished(self, processed: int, cancelled: int):
+        """Refresh the file lists once the processing queue has run empty."""
+        self.cancel_processing_btn.setEnabled(False)
+        self._update_results_status()
+        if cancelled:
+            self._log(f"Processing cancelled: {processed} file(s) processed, {cancelled} skipped")
         self._refresh_input_files()
         self._refresh_output_files()
 
@@ -1306,6 +1258,7 @@ class InvoiceProcessingTab(QWidget):
         """Run Section 232 Steel/Aluminum Declaration export process."""
         try:
             from section232_exporter import Section232Exporter
+            from extraction_pool import resolve_worker_count
 
             # Use output/Processed as input for Section 232 export
             input_folder = Path(self.config.output_folder) / "Processed"
@@ -1322,16 +1275,22 @@ class InvoiceProcessingTab(QWidget):
                 return
 
             self._log("Running Section 232 export...")
-            exporter = Section232Exporter(input_folder, output_folder, db_path)
+            # Only files that changed since the last export are re-exported
+            exporter = Section232Exporter(input_folder, output_folder, db_path,
+                                          output_format=self.config.section232_output_format,
+                                          incremental=True,
+                                          workers=resolve_worker_count(self.config.processing_workers))
             count = exporter.process_all()
-            self._log(f"Section 232 export complete: {count} files processed")
+            skipped = exporter.skipped_count
+            self._log(f"Section 232 export complete: {count} files processed, {skipped} unchanged skipped")
             self._log(f"Output: {output_folder}")
 
             # Show success message
             QMessageBox.information(
                 self,
                 "Export Complete",
-                f"Section 232 export complete!\n\n{count} file(s) processed\nOutput: {output_folder}"
+                f"Section 232 export complete!\n\n{count} file(s) processed\n"
+                f"{skipped} unchanged file(s) skipped\nOutput: {output_folder}"
             )
         except ImportError as e:
             self._log(f"Section 232 exporter module error: {e}")
@@ -1414,85 +1373,13 @@ class InvoiceProcessingTab(QWidget):
             self._process_pdf_files(files)
 
     def _process_pdf_files(self, file_paths: list):
-        """Process PDF files directly and show results in preview table."""
+        """Queue PDF files (left in place) for background processing; results fill the preview table."""
         import traceback
-        import time
 
         try:
-            output_folder = Path(self.config.output_folder)
-            output_folder.mkdir(exist_ok=True, parents=True)
-
-            all_items = []
-            processed_count = 0
-
-            for file_path in file_paths:
-                pdf_path = Path(file_path)
-                # Note: engine.process_pdf already logs "Processing: {filename}"
-                start_time = time.time()
-                template_used = None
-
-                try:
-                    items = self.engine.process_pdf(pdf_path)
-                    processing_time_ms = int((time.time() - start_time) * 1000)
-
-                    # Get template name if available
-                    if hasattr(self.engine, 'last_template_used'):
-                        template_used = self.engine.last_template_used
-
-                    if items:
-                        all_items.extend(items)
-                        self.engine.save_to_csv(items, output_folder, pdf_name=pdf_path.name)
-                        processed_count += 1
-                        self._log(f"  Extracted {len(items)} items")
-
-                        # Record success in processing history
-                        self.db.record_processing_history(
-                            file_name=pdf_path.name,
-                            template_used=template_used,
-                            items_extracted=len(items),
-                            status='SUCCESS',
-                            processing_time_ms=processing_time_ms
-                        )
-                    else:
-                        self._log(f"  No items extracted from {pdf_path.name}")
-                        self.file_failed.emit(pdf_path.name)
-
-                        # Record partial/no-extract in processing history
-                        self.db.record_processing_history(
-                            file_name=pdf_path.name,
-                            template_used=template_used,
-                            items_extracted=0,
-                            status='PARTIAL',
-                            processing_time_ms=processing_time_ms,
-                            error_message='No items extracted'
-                        )
-                except Exception as e:
-                    processing_time_ms = int((time.time() - start_time) * 1000)
-                    self._log(f"  Error: {e}")
-                    # Log to crash file for diagnostics
-                    error_msg = traceback.format_exc()
-                    self._write_crash_log(f"Error processing {pdf_path.name}", error_msg)
-                    self.file_failed.emit(pdf_path.name)
-
-                    # Record failure in processing history
-                    self.parts_db.record_processing_history(
-                        file_name=pdf_path.name,
-                        template_used=template_used,
-                        items_extracted=0,
-                        status='FAILED',
-                        processing_time_ms=processing_time_ms,
-                        error_message=str(e)[:500]  # Limit error message length
-                    )
-
-            if processed_count > 0:
-                self.files_processed.emit(processed_count)
-                self._log(f"Processed {processed_count} file(s), {len(all_items)} total items")
-
-                # Update results preview table
-                if all_items:
-                    self._update_results_table(all_items)
-
-            self._refresh_output_files()
+            pdf_paths = [Path(file_path) for file_path in file_paths]
+            self._submit_files(pdf_paths, Path(self.config.output_folder), move_files=False,
+                               record_history=True)
         except Exception as e:
             error_msg = traceback.format_exc()
             self._log(f"ERROR in _process_pdf_files: {e}")
@@ -1529,23 +1416,14 @@ class InvoiceProcessingTab(QWidget):
             return
 
         try:
-            import csv
-            items = []
-            headers = []
-            with open(csv_path, 'r', encoding='utf-8') as f:
-                reader = csv.DictReader(f)
-                headers = reader.fieldnames or []
-                for row in reader:
-                    items.append(dict(row))
-
-            if items and headers:
-                self._update_exported_file_table(items, headers, csv_path.name)
-                self._log(f"Loaded {len(items)} items from {csv_path.name}")
+            row_count = self.exported_file_model.load(csv_path)
+            if row_count:
+                self.exported_file_table.resizeColumnsToContents()
+                self.exported_file_status.setText(f"{csv_path.name}: {row_count} rows")
+                self._log(f"Loaded {row_count} items from {csv_path.name}")
             else:
                 self._log(f"No data found in {csv_path.name}")
-                self.exported_file_table.setRowCount(0)
-                self.exported_file_table.setColumnCount(1)
-                self.exported_file_table.setHorizontalHeaderLabels(["No data in file"])
+                self.exported_file_model.set_placeholder("No data in file")
                 self.exported_file_status.setText("No items to display")
         except Exception as e:
             self._log(f"Error loading CSV: {e}")
@@ -1563,7 +1441,7 @@ class InvoiceProcessingTab(QWidget):
             self.preview_tabs.setCurrentIndex(1)
 
     def _process_selected_file(self):
-        """Process the selected input file and show results in preview table."""
+        """Queue the selected input file for processing; results appear in the preview table."""
         current = self.input_files_list.currentItem()
         if not current:
             return
@@ -1574,54 +1452,7 @@ class InvoiceProcessingTab(QWidget):
 
         if pdf_path.exists():
             self._log(f"Processing selected file: {pdf_path.name}")
-            try:
-                items = self.engine.process_pdf(pdf_path)
-                if items:
-                    self.engine.save_to_csv(items, output_folder, pdf_name=pdf_path.name)
-                    self.engine.move_to_processed(pdf_path)
-                    self.files_processed.emit(1)
-                    # Update results preview table
-                    self._update_results_table(items)
-                else:
-                    self.engine.move_to_failed(pdf_path, reason="No items extracted")
-                    self.file_failed.emit(pdf_path.name)
-            except Exception as e:
-                self._log(f"Error: {e}")
-                self.engine.move_to_failed(pdf_path, reason=str(e)[:50])
-                self.file_failed.emit(pdf_path.name)
-
-            self._refresh_input_files()
-            self._refresh_output_files()
-
-    # ----- Exported File Preview -----
-
-    def _update_exported_file_table(self, items: list, headers: list, filename: str):
-        """Update the exported file preview table with CSV data."""
-        try:
-            # Set up columns
-            self.exported_file_table.setColumnCount(len(headers))
-
-            # Create display-friendly headers
-            display_headers = [h.replace('_', ' ').title() for h in headers]
-            self.exported_file_table.setHorizontalHeaderLabels(display_headers)
-
-            # Populate rows
-            self.exported_file_table.setRowCount(len(items))
-            for row_idx, item in enumerate(items):
-                for col_idx, header in enumerate(headers):
-                    value = item.get(header, '')
-                    if value is None:
-                        value = ''
-                    cell = QTableWidgetItem(str(value))
-                    self.exported_file_table.setItem(row_idx, col_idx, cell)
-
-            # Update status
-            self.exported_file_status.setText(f"{filename}: {len(items)} rows")
-
-            # Resize columns to content
-            self.exported_file_table.resizeColumnsToContents()
-        except Exception as e:
-            self._log(f"Error updating exported file table: {e}")
+            self._submit_files([pdf_path], output_folder, move_files=True)
 
     # ----- Logging -----
 
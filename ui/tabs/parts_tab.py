@@ -13,7 +13,7 @@ from PyQt6.QtWidgets import (
     QAbstractItemView, QFrame, QScrollArea, QSizePolicy,
     QProgressDialog, QDialog, QComboBox, QDialogButtonBox
 )
-from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QAbstractTableModel, QModelIndex, QMimeData
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QAbstractTableModel, QModelIndex, QMimeData, QTimer
 from PyQt6.QtGui import QAction, QDrag, QCursor, QPixmap
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
@@ -283,7 +283,21 @@ class AddFieldDropTarget(QLabel):
 
 
 class PartsTableModel(QAbstractTableModel):
-    """Table model for parts data."""
+    """
+    Table model for parts data.
+
+    Rows are loaded from the database a page at a time as the view scrolls
+    (canFetchMore/fetchMore). Filtering, sorting and counting run in SQL; the
+    count and first page of a new query are loaded on a worker thread.
+
+    Signals:
+        query_finished: Emitted with the total number of matching parts once a query has loaded
+    """
+
+    query_finished = pyqtSignal(int)
+
+    # Rows loaded per database query
+    PAGE_SIZE = 500
 
     COLUMNS = [
         ("part_number", "Part Number", 140),
@@ -309,6 +323,18 @@ class PartsTableModel(QAbstractTableModel):
         self._data = []
         self._visible_columns = self._get_visible_columns()
 
+        # Current query
+        self._filter_type = "all"
+        self._search_term = ""
+        self._sort_column = None  # None = default order of the query
+        self._sort_descending = False
+        self._total = 0
+
+        # Queries still running on worker threads; results of superseded ones are ignored
+        self._generation = 0
+        self._loading = False
+        self._workers = set()
+
     def _get_visible_columns(self):
         """Get list of visible column indices based on config."""
         visible = []
@@ -324,21 +350,105 @@ class PartsTableModel(QAbstractTableModel):
         self.endResetModel()
 
     def refresh(self, filter_type: str = "all", search_term: str = ""):
-        """Refresh data from database."""
+        """
+        Reload data from the database in the background.
+
+        Rows are replaced when the query finishes (query_finished is emitted).
+        """
+        from core.workers import PartsQueryWorker
+
+        self._filter_type = filter_type
+        self._search_term = search_term
+        self._generation += 1
+        self._loading = True
+
+        worker = PartsQueryWorker(self.db, self._generation, filter_type, search_term,
+                                  self._sort_column, self._sort_descending, self.PAGE_SIZE)
+        worker.query_done.connect(self._on_query_finished)
+        worker.error.connect(self._on_query_error)
+        # Keep the worker until its thread has exited, so wait_for_queries() covers it
+        worker.finished.connect(lambda: self._release_worker(worker))
+        self._workers.add(worker)
+        worker.start()
+
+    def _release_worker(self, worker):
+        """Forget a query worker whose thread has finished."""
+        self._workers.discard(worker)
+        worker.deleteLater()
+
+    def wait_for_queries(self, timeout_ms: int = 5000):
+        """Wait for running queries to finish (e.g. before the database is closed)."""
+        for worker in list(self._workers):
+            worker.wait(timeout_ms)
+
+    def is_loading(self) -> bool:
+        """True while a query started by refresh() has not finished."""
+        return self._loading
+
+    def total_count(self) -> int:
+        """Number of parts matching the current query (loaded or not)."""
+        return self._total
+
+    @pyqtSlot(int, int, list)
+    def _on_query_finished(self, generation: int, total: int, rows: list):
+        """Replace the rows with the first page of a finished query."""
+        if generation != self._generation:
+            return
         self.beginResetModel()
+        self._data = rows
+        self._total = total
+        self._loading = False
+        self.endResetModel()
+        self.query_finished.emit(total)
 
-        if search_term:
-            self._data = self.db.search_parts(search_term)
-        else:
-            self._data = self.db.get_all_parts()
+    @pyqtSlot(int, str)
+    def _on_query_error(self, generation: int, message: str):
+        if generation != self._generation:
+            return
+        print(f"Warning: Parts query failed: {message}")
+        self.beginResetModel()
+        self._data = []
+        self._total = 0
+        self._loading = False
+        self.endResetModel()
+        self.query_finished.emit(0)
 
-        # Apply filter
-        if filter_type == "with_hts":
-            self._data = [p for p in self._data if p.get('hts_code')]
-        elif filter_type == "no_hts":
-            self._data = [p for p in self._data if not p.get('hts_code')]
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._loading:
+            return False
+        return len(self._data) < self._total
 
-        self.endResetModel()
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._loading:
+            return
+        try:
+            rows = self.db.get_parts_page(self._filter_type, self._search_term,
+                                          self._sort_column, self._sort_descending,
+                                          limit=self.PAGE_SIZE, offset=len(self._data))
+        except Exception as e:
+            print(f"Warning: Could not load more parts: {e}")
+            return
+        if not rows:
+            # Rows were deleted since the count; stop fetching
+            self._total = len(self._data)
+            return
+        start = len(self._data)
+        self.beginInsertRows(QModelIndex(), start, start + len(rows) - 1)
+        self._data.extend(rows)
+        self.endInsertRows()
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        """Sort by a visible column in SQL and reload from the first page."""
+        if 0 <= column < len(self._visible_columns):
+            sort_column = self.COLUMNS[self._visible_columns[column]][0]
+        else:
+            sort_column = None
+        descending = order == Qt.SortOrder.DescendingOrder
+        if (sort_column, descending) == (self._sort_column, self._sort_descending):
+            return
+        self._sort_column = sort_column
+        self._sort_descending = descending
+        self.refresh(self._filter_type, self._search_term)
 
     def rowCount(self, parent=QModelIndex()):
         return len(self._data)
@@ -410,6 +520,14 @@ class PartsDatabaseTab(QWidget):
 
         self._current_filter = "all"
         self._current_search = ""
+        self._import_worker = None  # PartsImportWorker while a mapped import runs
+        self._import_progress = None
+
+        # Search as you type, once typing pauses
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(300)
+        self._search_timer.timeout.connect(self._on_search_text_idle)
 
         self._setup_ui()
         self._connect_signals()
@@ -501,6 +619,8 @@ class PartsDatabaseTab(QWidget):
         self.parts_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.parts_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
         self.parts_table.setAlternatingRowColors(True)
+        # No sort indicator until a header is clicked: keep the query's default order
+        self.parts_table.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
         self.parts_table.setSortingEnabled(True)
         self.parts_table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.parts_table.customContextMenuRequested.connect(self._show_context_menu)
@@ -766,6 +886,8 @@ class PartsDatabaseTab(QWidget):
     def _connect_signals(self):
         """Connect internal signals."""
         self.filter_group.buttonClicked.connect(self._on_filter_changed)
+        self.search_edit.textChanged.connect(self._search_timer.start)
+        self.parts_model.query_finished.connect(self._update_counts)
 
     # ----- Data operations -----
 
@@ -785,12 +907,15 @@ class PartsDatabaseTab(QWidget):
             self.parts_table.setColumnWidth(i, width)
 
     def _apply_filter(self):
-        """Apply current filter and search."""
+        """Apply current filter and search (the model loads in the background)."""
         self.parts_model.refresh(self._current_filter, self._current_search)
 
     def _update_counts(self):
         """Update the parts count label."""
-        count = self.parts_model.rowCount()
+        if self.parts_model.is_loading():
+            self.parts_count_label.setText("Loading parts...")
+            return
+        count = self.parts_model.total_count()
         self.parts_count_label.setText(f"{count} parts")
 
     def _on_filter_changed(self):
@@ -807,13 +932,20 @@ class PartsDatabaseTab(QWidget):
 
     def _on_search(self):
         """Handle search."""
+        self._search_timer.stop()
         self._current_search = self.search_edit.text().strip()
         self._apply_filter()
         self._update_counts()
 
+    def _on_search_text_idle(self):
+        """Run the search once typing has paused, if the search text changed."""
+        if self.search_edit.text().strip() != self._current_search:
+            self._on_search()
+
     def _clear_search(self):
         """Clear search and reset."""
         self.search_edit.clear()
+        self._search_timer.stop()
         self._current_search = ""
         self._apply_filter()
         self._update_counts()
@@ -1111,188 +1243,68 @@ class PartsDatabaseTab(QWidget):
             )
             return
 
-        try:
-            import pandas as pd
-
-            # Show progress dialog
-            progress = QProgressDialog("Loading file...", "Cancel", 0, 100, self)
-            progress.setWindowTitle("Parts Import Progress")
-            progress.setMinimumDuration(0)
-            progress.show()
-
-            # Load the full file
-            progress.setLabelText("Reading file...")
-            if self.import_csv_path.lower().endswith(('.xlsx', '.xls')):
-                df = pd.read_excel(self.import_csv_path, dtype=str, keep_default_na=False)
-            else:
-                df = pd.read_csv(self.import_csv_path, dtype=str, keep_default_na=False)
-
-            df = df.fillna("").rename(columns=str.strip)
-
-            # Reverse mapping: CSV column -> field key
-            col_map = {v: k for k, v in mapping.items()}
-            df = df.rename(columns=col_map)
-
-            total_rows = len(df)
-            if total_rows == 0:
-                progress.close()
-                QMessageBox.warning(self, "Empty File", "The file contains no data rows.")
-                return
-
-            progress.setMaximum(total_rows)
-            progress.setLabelText(f"Processing {total_rows} rows...")
-
-            # Helper function to parse percentage values
-            def parse_percentage(value_str):
-                try:
-                    if value_str:
-                        pct = float(value_str)
-                        # Convert ratio (0-1) to percentage if needed
-                        if 0 < pct <= 1.0:
-                            pct *= 100.0
-                        return max(0.0, pct)
-                    return None
-                except (ValueError, TypeError):
-                    return None
-
-            updated = 0
-            inserted = 0
-            skipped = 0
-
-            # Get database cursor directly
-            from datetime import datetime
-            cursor = self.db.conn.cursor()
-
-            for idx, row in df.iterrows():
-                if progress.wasCanceled():
-                    break
-
-                progress.setValue(idx + 1)
-
-                part_number = str(row.get('part_number', '')).strip()
-                if not part_number:
-                    skipped += 1
-                    continue
-
-                hts_code = str(row.get('hts_code', '')).strip() or None
-                description = str(row.get('description', '')).strip() or None
-                country_origin = str(row.get('country_origin', '')).strip().upper()[:2] or None
-                mid = str(row.get('mid', '')).strip() or None
-                client_code = str(row.get('client_code', '')).strip() or None
-                qty_unit = str(row.get('qty_unit', '')).strip() or 'NO'
-
-                # Parse percentage fields (TariffMill schema)
-                steel_ratio = parse_percentage(str(row.get('steel_ratio', '')).strip())
-                aluminum_ratio = parse_percentage(str(row.get('aluminum_ratio', '')).strip())
-                non_steel_ratio = parse_percentage(str(row.get('non_steel_ratio', '')).strip())
-
-                sec301 = str(row.get('sec301_exclusion_tariff', '')).strip() or None
-
-                try:
-                    # Check if part exists (TariffMill schema: parts_master table)
-                    cursor.execute("SELECT part_number FROM parts_master WHERE part_number = ?", (part_number,))
-                    exists = cursor.fetchone() is not None
-
-                    if exists:
-                        # Update existing part - only update non-null values
-                        updates = []
-                        params = []
-
-                        if hts_code:
-                            updates.append("hts_code = ?")
-                            params.append(hts_code)
-                        if description:
-                            updates.append("description = ?")
-                            params.append(description)
-                        if country_origin:
-                            updates.append("country_origin = ?")
-                            params.append(country_origin)
-                        if mid:
-                            updates.append("mid = ?")
-                            params.append(mid)
-                        if client_code:
-                            updates.append("client_code = ?")
-                            params.append(client_code)
-                        if qty_unit and qty_unit != 'NO':
-                            updates.append("qty_unit = ?")
-                            params.append(qty_unit)
-                        if steel_ratio is not None:
-                            updates.append("steel_ratio = ?")
-                            params.append(steel_ratio)
-                        if aluminum_ratio is not None:
-                            updates.append("aluminum_ratio = ?")
-                            params.append(aluminum_ratio)
-                        if non_steel_ratio is not None:
-                            updates.append("non_steel_ratio = ?")
-                            params.append(non_steel_ratio)
-                        if sec301:
-                            updates.append("sec301_exclusion_tariff = ?")
-                            params.append(sec301)
-
-                        # Handle custom fields
-                        for field_name in self.custom_fields.keys():
-                            if field_name in mapping:
-                                value = str(row.get(field_name, '')).strip()
-                                if value:
-                                    updates.append(f"{field_name} = ?")
-                                    params.append(value)
-
-                        updates.append("last_updated = ?")
-                        params.append(datetime.now().isoformat())
-
-                        if updates:
-                            params.append(part_number)
-                            cursor.execute(f"UPDATE parts_master SET {', '.join(updates)} WHERE part_number = ?", params)
-                            updated += 1
-                    else:
-                        # Insert new part - build dynamic column list for custom fields (TariffMill schema)
-                        base_columns = [
-                            'part_number', 'description', 'hts_code', 'country_origin', 'mid', 'client_code',
-                            'steel_ratio', 'aluminum_ratio', 'non_steel_ratio',
-                            'qty_unit', 'sec301_exclusion_tariff', 'last_updated'
-                        ]
-                        base_values = [
-                            part_number, description, hts_code, country_origin, mid, client_code,
-                            steel_ratio or 0, aluminum_ratio or 0, non_steel_ratio or 0,
-                            qty_unit, sec301, datetime.now().isoformat()
-                        ]
-
-                        # Add custom fields
-                        for field_name in self.custom_fields.keys():
-                            if field_name in mapping:
-                                value = str(row.get(field_name, '')).strip() or None
-                                base_columns.append(field_name)
-                                base_values.append(value)
-
-                        placeholders = ', '.join(['?' for _ in base_columns])
-                        columns_str = ', '.join(base_columns)
-
-                        cursor.execute(f"""
-                            INSERT INTO parts_master ({columns_str}) VALUES ({placeholders})
-                        """, base_values)
-                        inserted += 1
-                except Exception:
-                    skipped += 1
+        if self._import_worker is not None and self._import_worker.isRunning():
+            QMessageBox.information(self, "Import Running", "A parts import is already running.")
+            return
 
-            # Commit all changes
-            self.db.conn.commit()
-            progress.close()
+        from core.workers import PartsImportWorker
+
+        # Show progress dialog (coarse: reading, staging chunks, merge)
+        self._import_progress = QProgressDialog("Reading file...", "Cancel", 0, 0, self)
+        self._import_progress.setWindowTitle("Parts Import Progress")
+        self._import_progress.setMinimumDuration(0)
+        self._import_progress.setAutoClose(False)
+        self._import_progress.setAutoReset(False)
+
+        custom_fields = [name for name in self.custom_fields.keys() if name in mapping]
+        self._import_worker = PartsImportWorker(self.db, self.import_csv_path, mapping, custom_fields)
+        self._import_worker.status_changed.connect(self._import_progress.setLabelText)
+        self._import_worker.progress.connect(self._on_import_progress)
+        self._import_worker.finished.connect(self._on_import_finished)
+        self._import_progress.canceled.connect(self._import_worker.cancel)
+        self._import_progress.show()
+        self.import_status_label.setText("Importing parts...")
+        self._import_worker.start()
+
+    def _on_import_progress(self, current: int, total: int):
+        """Update the import progress dialog."""
+        if self._import_progress is not None:
+            self._import_progress.setMaximum(total)
+            self._import_progress.setValue(current)
+            if current >= total - 1:
+                self._import_progress.setLabelText("Merging into parts database...")
+
+    def _on_import_finished(self, success: bool, message: str, inserted: int, updated: int, skipped: int):
+        """Show the import summary and refresh the parts view."""
+        if self._import_progress is not None:
+            self._import_progress.close()
+            self._import_progress = None
+
+        if not success:
+            self.import_status_label.setText(message)
+            if message == "The file contains no data rows.":
+                QMessageBox.warning(self, "Empty File", message)
+            elif not message.startswith("Import cancelled"):
+                QMessageBox.critical(self, "Import Error", f"Failed to import:\n{message}")
+            return
 
-            # Show summary
-            QMessageBox.information(
-                self, "Import Complete",
-                f"Import completed!\n\n"
-                f"Total rows: {total_rows}\n"
-                f"New parts inserted: {inserted}\n"
-                f"Existing parts updated: {updated}\n"
-                f"Skipped (no part number or errors): {skipped}"
-            )
+        # Show summary
+        QMessageBox.information(
+            self, "Import Complete",
+            f"Import completed!\n\n"
+            f"{message}\n"
+            f"New parts inserted: {inserted:,}\n"
+            f"Existing parts updated: {updated:,}\n"
+            f"Skipped (no part number): {skipped:,}"
+        )
 
-            self.refresh_data()
-            self.data_changed.emit()
+        self.refresh_data()
+        self.data_changed.emit()
 
-            self.import_status_label.setText(f"Import complete: {inserted} inserted, {updated} updated")
+        self.import_status_label.setText(f"Import complete: {inserted} inserted, {updated} updated")
 
-        except Exception as e:
-            QMessageBox.critical(self, "Import Error", f"Failed to import:\n{e}")
+    def wait_for_import(self):
+        """Block until a running parts import has finished (before closing the database)."""
+        if self._import_worker is not None:
+            self._import_worker.wait()
 